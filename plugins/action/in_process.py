@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Network to Code (@networktocode) <info@networktocode.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Nautobot Action Plugin to run the CRUD modules in the Ansible process."""
+
+from __future__ import absolute_import, division, print_function
+
+import contextlib
+import importlib
+import inspect
+import io
+import json
+import os
+import traceback
+
+from ansible.module_utils import basic
+from ansible.module_utils.common.text.converters import to_text
+from ansible.plugins.action.normal import ActionModule as NormalActionModule
+from ansible.utils.display import Display
+from ansible.vars.clean import remove_internal_keys
+from ansible_collections.networktocode.nautobot.plugins.module_utils.utils import is_truthy
+
+try:
+    from ansible.module_utils.common.json import Direction, get_module_encoder
+except ImportError:
+    # ansible-core < 2.19 passes plain JSON to modules
+    get_module_encoder = None
+
+__metaclass__ = type
+
+COLLECTION_NAME = "networktocode.nautobot"
+
+
+def encode_module_args(module_args):
+    """Encode module_args the way the controller sends them to a module.
+
+    Returns:
+        tuple(bytes, str): The encoded arguments and the serialization profile to decode them with
+    """
+    payload = {"ANSIBLE_MODULE_ARGS": module_args}
+    if get_module_encoder is None:
+        return json.dumps(payload).encode("utf-8"), None
+
+    profile = "legacy"
+    encoder = get_module_encoder(profile, Direction.CONTROLLER_TO_MODULE)
+    return json.dumps(payload, cls=encoder).encode("utf-8"), profile
+
+
+@contextlib.contextmanager
+def patch_module_args(module_args):
+    """Expose module_args to the AnsibleModule created within this context."""
+    args, profile = encode_module_args(module_args)
+    saved = {name: getattr(basic, name) for name in ("_ANSIBLE_ARGS", "_ANSIBLE_PROFILE") if hasattr(basic, name)}
+    basic._ANSIBLE_ARGS = args
+    if "_ANSIBLE_PROFILE" in saved:
+        basic._ANSIBLE_PROFILE = profile
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(basic, name, value)
+
+
+@contextlib.contextmanager
+def patch_environment(environment):
+    """Set the environment variables of the task within this context, like the module process would see them."""
+    saved = {name: os.environ.get(name) for name in environment}
+    os.environ.update({name: to_text(value) for name, value in environment.items()})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_module_in_process(module_name, module_args, environment=None):
+    """Run the main() of a module of this collection in the current process.
+
+    Args:
+        module_name (str): Fully qualified name of the module, ex. networktocode.nautobot.device
+        module_args (dict): Arguments of the module, including the internal _ansible_ ones
+        environment (dict): Environment variables set by the `environment` keyword of the task
+
+    Returns:
+        dict: stdout, stderr and rc of the module, as if it was run in its own process
+    """
+    name = module_name.rsplit(".", 1)[-1]
+    module = importlib.import_module("ansible_collections.networktocode.nautobot.plugins.modules.%s" % name)
+
+    stdout, stderr, rc = io.StringIO(), "", 0
+    with patch_module_args(module_args), patch_environment(environment or {}), contextlib.redirect_stdout(stdout):
+        try:
+            module.main()
+        except SystemExit as exit_exc:
+            rc = exit_exc.code or 0
+        except Exception:  # pylint: disable=broad-except
+            # Same outcome as a module crashing in its own interpreter
+            stderr, rc = traceback.format_exc(), 1
+
+    return {"stdout": stdout.getvalue(), "stderr": stderr, "rc": rc}
+
+
+class ActionModule(NormalActionModule):
+    """Ansible Action Module running the Nautobot CRUD modules in the Ansible process.
+
+    Modules are normally shipped to the target and executed in a new interpreter for every task.
+    When the task runs on the controller through a local connection and the `nautobot_in_process`
+    variable or the NAUTOBOT_IN_PROCESS environment variable is true, the module is imported and
+    run by the worker running the task instead, skipping the module packaging, the transfer and
+    the interpreter startup. Any other task is executed the usual way.
+
+    Args:
+        NormalActionModule (ActionModule): Ansible Action Plugin used by modules without one
+    """
+
+    def _run_in_process(self, task_vars):
+        """Whether the module of the task can and should run in the Ansible process."""
+        enabled = task_vars.get("nautobot_in_process", os.getenv("NAUTOBOT_IN_PROCESS", False))
+        try:
+            enabled = is_truthy(self._templar.template(enabled))
+        except ValueError:
+            Display().warning("Ignoring invalid nautobot_in_process value: %s" % enabled)
+            return False
+
+        return (
+            enabled
+            and self._connection.transport == "local"
+            and not self._task.async_val
+            and not self._play_context.become
+            and self._resolve_module_name().startswith(COLLECTION_NAME + ".")
+        )
+
+    def _resolve_module_name(self):
+        """Return the fully qualified name of the module of the task.
+
+        The resolved action of the task is this plugin, as every module is redirected to it.
+        """
+        context = self._shared_loader_obj.module_loader.find_plugin_with_context(
+            self._task.action, collection_list=self._task.collections
+        )
+        return context.resolved_fqcn if context.resolved else self._task.action
+
+    def _execute_module(self, module_name=None, module_args=None, task_vars=None, wrap_async=False, **kwargs):
+        """Run the module in the Ansible process when possible, otherwise transfer and run it."""
+        if task_vars is None:
+            task_vars = dict()
+        if wrap_async or module_name is not None or not self._run_in_process(task_vars):
+            return super(ActionModule, self)._execute_module(
+                module_name=module_name, module_args=module_args, task_vars=task_vars, wrap_async=wrap_async, **kwargs
+            )
+
+        module_name = self._resolve_module_name()
+        module_args = dict(self._task.args if module_args is None else module_args)
+        self._update_module_args(module_name, module_args, task_vars)
+        Display().vvv("Running %s in process" % module_name)
+
+        # The environment keyword of the task, templated as for a module run in its own process
+        environment = dict()
+        self._compute_environment_string(environment)
+
+        res = run_module_in_process(module_name, module_args, environment)
+        if "profile" in inspect.signature(self._parse_returned_data).parameters:
+            data = self._parse_returned_data(res, "legacy")
+        else:
+            data = self._parse_returned_data(res)
+        remove_internal_keys(data)
+        return data
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Network to Code (@networktocode) <info@networktocode.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+    name: api_cost
+    author: Network to Code (@networktocode)
+    version_added: "6.2.0"
+    type: aggregate
+    short_description: Summarizes the requests sent to Nautobot during a run
+    description:
+        - Adds up the number of requests, bytes received and seconds spent waiting for Nautobot per module and per endpoint,
+          and prints them at the end of the run, to spot tasks sending many lookups and measure improvements.
+        - Modules only report their requests when their C(timing) option is enabled, for example with the
+          E(NAUTOBOT_TIMING) environment variable set in the C(environment) of the play.
+        - The requests of the inventory, gql_inventory, lookup and lookup_graphql plugins are always counted.
+    requirements:
+        - Enable the callback in C(callbacks_enabled) of ansible.cfg
+    options:
+        output_file:
+            description:
+                - Path of a file the summary is written to as JSON, in addition to being printed.
+            env:
+                - name: NAUTOBOT_API_COST_OUTPUT
+            ini:
+                - section: callback_api_cost
+                  key: output_file
+            type: path
+        top:
+            description:
+                - Number of modules and endpoints printed, the ones sending the most requests first.
+            env:
+                - name: NAUTOBOT_API_COST_TOP
+            ini:
+                - section: callback_api_cost
+                  key: top
+            type: int
+            default: 20
+"""
+
+import json
+import os
+import tempfile
+
+from ansible.plugins.callback import CallbackBase
+from ansible_collections.networktocode.nautobot.plugins.module_utils.timing import (
+    CONTROLLER_REQUESTS,
+    CONTROLLER_SPOOL_ENV,
+)
+
+
+def new_totals():
+    """Return totals of requests, all at zero."""
+    return {"tasks": 0, "requests": 0, "bytes": 0, "elapsed": 0.0}
+
+
+class CallbackModule(CallbackBase):
+    """Aggregate the Nautobot requests reported by modules and plugins and print them per module and endpoint."""
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "networktocode.nautobot.api_cost"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs):
+        """Initialize empty totals."""
+        super(CallbackModule, self).__init__(*args, **kwargs)
+        self.modules = dict()
+        self.endpoints = dict()
+        self.spool = None
+
+    def _add(self, module, endpoints):
+        """Add the requests of one task, or one plugin, to the totals.
+
+        :params module (str): Name of the module or plugin that sent the requests
+        :params endpoints (dict): Totals of the requests per endpoint, as in the `_nautobot_timing` summary
+        """
+        module_totals = self.modules.setdefault(module, new_totals())
+        module_totals["tasks"] += 1
+        for endpoint, totals in endpoints.items():
+            endpoint_totals = self.endpoints.setdefault(endpoint, new_totals())
+            endpoint_totals["tasks"] += 1
+            for key in ("requests", "bytes", "elapsed"):
+                module_totals[key] += totals[key]
+                endpoint_totals[key] += totals[key]
+
+    def _add_requests(self, requests):
+        """Add the requests recorded one by one by the inventory and lookup plugins."""
+        plugins = dict()
+        for request in requests:
+            endpoints = plugins.setdefault(request["phase"], dict())
+            totals = endpoints.setdefault("%s %s" % (request["method"], request["path"]), new_totals())
+            totals["requests"] += 1
+            totals["bytes"] += request["bytes"]
+            totals["elapsed"] += request["elapsed"]
+        for plugin, endpoints in plugins.items():
+            self._add(plugin, endpoints)
+
+    def _add_result(self, result):
+        module = result._task.action
+        results = result._result.get("results")
+        # Loops report each item in results
+        for item in results if isinstance(results, list) else [result._result]:
+            if isinstance(item, dict) and isinstance(item.get("_nautobot_timing"), dict):
+                self._add(module, item["_nautobot_timing"].get("endpoints", {}))
+
+    def _read_spool(self):
+        requests = list()
+        try:
+            with open(self.spool, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        requests.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return requests
+
+    def v2_playbook_on_start(self, playbook):
+        # The plugins running in worker processes report their requests through the spool
+        if self.spool is None:
+            fd, self.spool = tempfile.mkstemp(prefix="nautobot_api_cost_", suffix=".jsonl")
+            os.close(fd)
+            os.environ[CONTROLLER_SPOOL_ENV] = self.spool
+
+    def v2_runner_on_ok(self, result):
+        self._add_result(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._add_result(result)
+
+    def summary(self):
+        """Return the totals per module and per endpoint, along with the grand total."""
+        total = new_totals()
+        for totals in self.modules.values():
+            for key in total:
+                total[key] += totals[key]
+        return {"total": total, "modules": self.modules, "endpoints": self.endpoints}
+
+    def _table(self, title, rows):
+        top = self.get_option("top")
+        lines = ["%-60s %7s %9s %9s %12s %10s" % (title, "tasks", "requests", "per task", "bytes", "seconds")]
+        for name, totals in sorted(rows.items(), key=lambda row: -row[1]["requests"])[:top]:
+            lines.append(
+                "%-60s %7d %9d %9.1f %12d %10.3f"
+                % (
+                    name,
+                    totals["tasks"],
+                    totals["requests"],
+                    totals["requests"] / float(totals["tasks"] or 1),
+                    totals["bytes"],
+                    totals["elapsed"],
+                )
+            )
+        return "\n".join(lines)
+
+    def v2_playbook_on_stats(self, stats):
+        # Requests sent before the spool was set, e.g. while parsing the inventory
+        self._add_requests(CONTROLLER_REQUESTS)
+        del CONTROLLER_REQUESTS[:]
+        if self.spool:
+            self._add_requests(self._read_spool())
+            os.environ.pop(CONTROLLER_SPOOL_ENV, None)
+            try:
+                os.remove(self.spool)
+            except OSError:
+                pass
+            self.spool = None
+
+        summary = self.summary()
+        if not self.modules:
+            return
+
+        self._display.banner("NAUTOBOT API COST")
+        self._display.display(
+            "%d requests, %d bytes, %.3f seconds"
+            % (summary["total"]["requests"], summary["total"]["bytes"], summary["total"]["elapsed"])
+        )
+        self._display.display(self._table("module", self.modules))
+        self._display.display("")
+        self._display.display(self._table("endpoint", self.endpoints))
+
+        output_file = self.get_option("output_file")
+        if output_file:
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2, sort_keys=True)
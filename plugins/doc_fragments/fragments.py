@@ -52,8 +52,162 @@ options:
     version_added: "4.1.0"
     description:
       - "API Version Nautobot REST API"
+      - "When unset, the version reported by Nautobot is requested by every task."
+      - "If C(cache_ttl) is set, it is cached on disk per URL instead, for up to 5 minutes."
     required: false
     type: str
+  cache_ttl:
+    version_added: "6.2.0"
+    description:
+      - "Number of seconds name to ID resolutions are cached on disk and shared between tasks targeting the same Nautobot instance."
+      - "Cached resolutions for an endpoint are discarded whenever the module creates, updates or deletes an object of that endpoint."
+      - "Endpoint choices used to map display values (for example interface types) are cached for the same duration, per Nautobot version."
+      - "Unless C(api_version) is set, the version of Nautobot is cached for the same duration too, up to 5 minutes."
+      - "The cache is stored in C(~/.ansible/cache/nautobot_modules) and is disabled when unset or C(0)."
+      - "Can be omitted if the E(NAUTOBOT_CACHE_TTL) environment variable is configured."
+    required: false
+    type: int
+  objects:
+    version_added: "6.2.0"
+    description:
+      - "List of objects to manage in a single task."
+      - "Each item accepts the same options as the module itself, except the connection options and C(state) which apply to every item."
+      - "Existing objects are looked up with as few list requests as possible, then created, updated and deleted with the bulk API of the endpoint."
+      - "Items can't reference objects created by the same task, split those into separate tasks."
+      - "The result of every item is returned in C(objects) and the module options of the top level are ignored."
+      - "Not supported by the cable and plugin modules, nor with C(state=new), C(first_available) or the C(parent) of IP addresses."
+    required: false
+    type: list
+    elements: dict
+  bulk_chunk_size:
+    version_added: "6.2.0"
+    description:
+      - "Maximum number of objects sent in a single bulk create, update or delete request when C(objects) is used."
+    required: false
+    default: 100
+    type: int
+  use_broker:
+    version_added: "6.2.0"
+    description:
+      - "Send the requests to Nautobot through a broker process running on the host executing the module."
+      - "The broker keeps pooled keep-alive connections to each Nautobot instance."
+      - "Tasks reuse the connections of the broker instead of each doing its own TCP and TLS handshake."
+      - "This matters with many forks against a TLS terminated Nautobot."
+      - "The broker listens on the Unix socket C(~/.ansible/nautobot_broker/broker.sock)."
+      - "It is started by the first task using it and stops after 5 minutes without requests."
+      - "Requests are sent directly when the broker can't be started, and requests using a client certificate always are."
+      - "When the broker doesn't answer in time, the next requests are sent directly, and so is the pending one if it only reads data."
+      - "Can be omitted if the E(NAUTOBOT_USE_BROKER) environment variable is configured."
+    required: false
+    default: false
+    type: bool
+  resolve_workers:
+    version_added: "6.2.0"
+    description:
+      - "Number of threads looking up the IDs of the objects referenced by name concurrently."
+      - "For example, the location and tags of a device are looked up at once when set to C(2) or more."
+      - "By default, they are looked up one at a time."
+      - "Can be omitted if the E(NAUTOBOT_RESOLVE_WORKERS) environment variable is configured."
+    required: false
+    default: 1
+    type: int
+  snapshot_ttl:
+    version_added: "6.2.0"
+    description:
+      - "In check mode, look up the object managed by the module in a snapshot of its endpoint instead of querying it."
+      - "This speeds up drift detection runs checking many objects."
+      - "The snapshot holds every object of the endpoint sharing the related objects the object is looked up with, for example every interface of the device."
+      - "It is downloaded with a single list request."
+      - "Number of seconds the snapshot is cached on disk, in C(~/.ansible/cache/nautobot_modules), and shared with the tasks checking the other objects."
+      - "Objects that can't be matched against the snapshot, for example when looked up with a related object given by name, are queried as usual."
+      - "Ignored outside of check mode and disabled when unset or C(0)."
+      - "Can be omitted if the E(NAUTOBOT_SNAPSHOT_TTL) environment variable is configured."
+    required: false
+    type: int
+  coalesce_requests:
+    version_added: "6.2.0"
+    description:
+      - "Coalesce the identical lookups sent at the same time by the tasks running in parallel, for example when many forks manage objects of the same device."
+      - "The first task sending a lookup shares its response through C(~/.ansible/tmp/nautobot_singleflight)."
+      - "The tasks sending the same lookup meanwhile wait for it instead of sending their own request."
+      - "A response is only shared with the tasks that sent the same lookup while it was in flight, it is not cached, and failed lookups are never shared."
+      - "Can be omitted if the E(NAUTOBOT_COALESCE_REQUESTS) environment variable is configured."
+    required: false
+    default: false
+    type: bool
+  max_retries:
+    version_added: "6.2.0"
+    description:
+      - "Number of times a request is retried when Nautobot answers it with a 429, 502, 503 or 504 status, instead of failing the task."
+      - "Requests creating, updating or deleting objects are only retried on 429 and 503 statuses."
+      - "A 502 or 504 status doesn't guarantee the change wasn't applied."
+      - "The delay asked for by the C(Retry-After) header of the response is waited before retrying, up to 60 seconds."
+      - "The number of retries is returned in C(nautobot_retries) when C(max_retries) or C(rate_limit) is set."
+      - "Can be omitted if the E(NAUTOBOT_MAX_RETRIES) environment variable is configured."
+    required: false
+    default: 0
+    type: int
+  retry_backoff:
+    version_added: "6.2.0"
+    description:
+      - "Number of seconds waited before the first retry of a request when Nautobot doesn't return a C(Retry-After) header, doubled for each following retry."
+      - "A random delay between 0 and this backoff is waited, so tasks retrying at the same time don't all hit Nautobot again together."
+      - "Can be omitted if the E(NAUTOBOT_RETRY_BACKOFF) environment variable is configured."
+    required: false
+    default: 0.5
+    type: float
+  rate_limit:
+    version_added: "6.2.0"
+    description:
+      - "Maximum number of requests per second sent to Nautobot by all the tasks running on the controller, including retries."
+      - "The tasks share a token bucket stored in C(~/.ansible/tmp/nautobot_ratelimit)."
+      - "Can be omitted if the E(NAUTOBOT_RATE_LIMIT) environment variable is configured."
+    required: false
+    type: float
+  timing:
+    version_added: "6.2.0"
+    description:
+      - "Record every request sent to Nautobot and return a summary of them in C(_nautobot_timing)."
+      - "The summary gives the number of requests, bytes received and seconds spent waiting for Nautobot, in total, per phase of the module and per endpoint."
+      - "The C(init) phase covers the normalization of the module parameters and the resolution of their IDs."
+      - "The C(run) phase covers the creation, update or deletion of the object."
+      - "Can be omitted if the E(NAUTOBOT_TIMING) environment variable is configured."
+    required: false
+    default: false
+    type: bool
+  timing_trace:
+    version_added: "6.2.0"
+    description:
+      - "Path of a file every request sent to Nautobot is appended to, as one JSON object per line."
+      - "Each line gives the method, path, status, bytes and elapsed seconds of the request."
+      - "The tasks running in parallel can share the same file. Implies C(timing)."
+      - "Can be omitted if the E(NAUTOBOT_TIMING_TRACE) environment variable is configured."
+    required: false
+    type: path
+  lightweight_lookups:
+    version_added: "6.2.0"
+    description:
+      - "Look up the object managed by the module and the related objects it references with C(depth=0) and C(exclude_m2m=true)."
+      - "Nautobot then returns related objects by ID only and leaves out many-to-many fields such as C(tags)."
+      - "Reduces the size of the responses for objects with many relationships, for example devices and virtual machines."
+      - "The object managed by the module is fetched again in full only when it has to be compared on a many-to-many field given to the module."
+      - "When nothing changes, the object returned by the module doesn't include the many-to-many fields that weren't given to the module."
+      - "Can be omitted if the E(NAUTOBOT_LIGHTWEIGHT_LOOKUPS) environment variable is configured."
+    required: false
+    default: false
+    type: bool
+  async_client:
+    version_added: "6.2.0"
+    description:
+      - "Look up the IDs of the objects referenced by name with an asyncio client instead of using threads."
+      - "The requests are sent at once over up to C(resolve_workers) pooled connections."
+      - "With C(objects), the bulk create, update and delete requests of each operation are also sent at once with it."
+      - "Requests sent by the asyncio client are not retried, rate limited, coalesced or sent through the broker."
+      - "Requires the C(aiohttp) Python library."
+      - "Can be omitted if the E(NAUTOBOT_ASYNC_CLIENT) environment variable is configured."
+    required: false
+    default: false
+    type: bool
 """
 
     ID = r"""
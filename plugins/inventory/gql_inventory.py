@@ -252,6 +252,7 @@ RETURN = """
 """
 import json
 import os
+import time
 import uuid
 from collections.abc import Mapping
 from copy import deepcopy
@@ -267,6 +268,7 @@ from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructa
 from ansible_collections.networktocode.nautobot.plugins.filter.graphql import (
     convert_to_graphql_string,
 )
+from ansible_collections.networktocode.nautobot.plugins.module_utils.timing import record_controller_request
 from ansible_collections.networktocode.nautobot.plugins.module_utils.utils import (
     mark_trusted,
 )
@@ -517,6 +519,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         data = {"query": query}
         self.display.vvv(f"GraphQL query:\n{query}")
 
+        started = time.monotonic()
         try:
             response = open_url(
                 self.api_endpoint + "/api/graphql/",
@@ -529,7 +532,16 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             )
         except urllib_error.HTTPError as err:
             raise AnsibleParserError(to_native(err.fp.read()))
-        json_data = json.loads(response.read())
+        content = response.read()
+        record_controller_request(
+            "gql_inventory",
+            "POST",
+            self.api_endpoint + "/api/graphql/",
+            response.status,
+            len(content),
+            time.monotonic() - started,
+        )
+        json_data = json.loads(content)
         self.display.vvvv(f"JSON response: {json_data}")
 
         return json_data
@@ -18,6 +18,8 @@ DOCUMENTATION = """
     - Get inventory hosts from Nautobot
     - "Note: If gathering an endpoint that has significant number of objects (such as interfaces), you may have failures caused by gathering too much data."
     - "Look to leverage the GraphQL inventory or gather data as a first task in the playbook rather than in inventory."
+    - "When the requests Python library is installed, connections to Nautobot are kept open and reused across requests."
+    - "Responses are then gzip compressed, and the number of connections opened is displayed with C(-vvv)."
   extends_documentation_fragment:
     - constructed
     - inventory_cache
@@ -45,7 +47,7 @@ DOCUMENTATION = """
         - Determine how redirects are followed.
         - By default, I(follow_redirects) is set to uses urllib2 default behavior.
       default: urllib2
-      choices: ['urllib2', 'all', 'yes', 'safe', 'none']
+      choices: ['urllib2', 'all', 'yes', 'safe', 'none', 'no']
     config_context:
       description:
         - If True, it adds config_context in host vars.
@@ -183,6 +185,40 @@ DOCUMENTATION = """
       type: int
       default: 4000
       version_added: "1.0.0"
+    pagination_workers:
+      description:
+        - Number of pages of a list of devices, virtual machines or related objects fetched at once.
+        - When Nautobot returns fewer objects than requested because of its C(MAX_PAGE_SIZE) setting, the number of
+          objects is read from the first page and the following pages are requested concurrently by offset, then
+          assembled in order.
+        - The default of 1 follows the C(next) links one page at a time.
+      env:
+        - name: NAUTOBOT_PAGINATION_WORKERS
+      type: int
+      default: 1
+      version_added: "6.2.0"
+    chunk_workers:
+      description:
+        - When fetch_all is False, number of chunks of device and virtual machine IDs the related objects, for
+          example interfaces and IP addresses, are fetched for at once.
+        - The objects are returned in the same order as when the chunks are fetched one at a time.
+      env:
+        - name: NAUTOBOT_CHUNK_WORKERS
+      type: int
+      default: 1
+      version_added: "6.2.0"
+    fetch_all_threshold:
+      description:
+        - When fetch_all is False, fetch the interfaces, services and IP addresses of every device and virtual machine,
+          as with fetch_all, once more IDs than this number would have to be sent in chunks of max_uri_length.
+        - Avoids hundreds of requests listing IDs when the query filters match a large part of the devices and virtual
+          machines, the objects related to the hosts that aren't in the inventory are ignored.
+        - The default of 0 always sends the IDs.
+      env:
+        - name: NAUTOBOT_FETCH_ALL_THRESHOLD
+      type: int
+      default: 0
+      version_added: "6.2.0"
     virtual_chassis_name:
       description:
         - When a device is part of a virtual chassis, use the virtual chassis name as the Ansible inventory hostname.
@@ -289,8 +325,10 @@ import json
 import math
 import os
 import re
+import time
 import uuid
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from itertools import chain
 from sys import version as python_version
@@ -301,9 +339,10 @@ from ansible.errors import AnsibleError, AnsibleParserError
 from ansible.module_utils._text import to_native, to_text
 from ansible.module_utils.ansible_release import __version__ as ansible_version
 from ansible.module_utils.six.moves.urllib import error as urllib_error
-from ansible.module_utils.six.moves.urllib.parse import urlencode
+from ansible.module_utils.six.moves.urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from ansible.module_utils.urls import open_url
 from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+from ansible_collections.networktocode.nautobot.plugins.module_utils.timing import record_controller_request
 from ansible_collections.networktocode.nautobot.plugins.module_utils.utils import (
     mark_trusted,
 )
@@ -314,10 +353,21 @@ try:
 except ImportError:
     pass
 
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
 
 class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     NAME = "networktocode.nautobot.inventory"
 
+    # Session keeping connections to Nautobot open across requests, None to open one per request with open_url
+    http_session = None
+
     def _set_composite_vars(self, compose, variables, host, strict=False):
         """Override to use custom `_set_variable` which applies `allow_unsafe`."""
         if compose and isinstance(compose, dict):
@@ -355,19 +405,38 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
         if need_to_fetch:
             self.display.v("Fetching: " + url)
-            try:
-                response = open_url(
+            started = time.monotonic()
+            if self.http_session is not None:
+                response = self.http_session.get(
                     url,
                     headers=self.headers,
                     timeout=self.timeout,
-                    validate_certs=self.validate_certs,
-                    follow_redirects=self.follow_redirects,
+                    verify=self.validate_certs,
+                    allow_redirects=self._allow_redirects(),
                 )
-            except urllib_error.HTTPError as err:
-                raise AnsibleParserError(to_native(err.fp.read()))
-
+                # open_url fails on the redirects it doesn't follow too
+                if response.status_code >= 400 or response.is_redirect:
+                    raise AnsibleParserError(to_native(response.content))
+                # Decompressed by requests when Nautobot gzipped the response
+                content = response.content
+                status = response.status_code
+            else:
+                try:
+                    response = open_url(
+                        url,
+                        headers=self.headers,
+                        timeout=self.timeout,
+                        validate_certs=self.validate_certs,
+                        follow_redirects=self.follow_redirects,
+                    )
+                except urllib_error.HTTPError as err:
+                    raise AnsibleParserError(to_native(err.fp.read()))
+
+                content = response.read()
+                status = response.status
+            record_controller_request("inventory", "GET", url, status, len(content), time.monotonic() - started)
             try:
-                raw_data = to_text(response.read(), errors="surrogate_or_strict")
+                raw_data = to_text(content, errors="surrogate_or_strict")
             except UnicodeError:
                 raise AnsibleError("Incorrect encoding of fetched payload from Nautobot API.")
 
@@ -382,6 +451,43 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
         return results
 
+    def _allow_redirects(self):
+        """Map follow_redirects to the allow_redirects of requests, as open_url handles it for GET requests."""
+        return self.follow_redirects not in ("none", "no", False)
+
+    def _pool_size(self):
+        """Return the number of requests the lookup threads may send at once.
+
+        Each lookup thread may run chunk threads, each fetching its pages with pagination threads.
+        """
+        return len(self.lookup_processes) * max(self.pagination_workers, 1) * max(self.chunk_workers, 1)
+
+    def _new_http_session(self, pool_size):
+        """Return a requests session keeping up to pool_size connections to Nautobot open, None without requests.
+
+        requests asks for gzip and deflate compressed responses and decompresses them.
+        """
+        if not HAS_REQUESTS:
+            self.display.vvv("requests is not installed, opening a connection to Nautobot per request")
+            return None
+
+        http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        http_session.mount("http://", adapter)
+        http_session.mount("https://", adapter)
+        return http_session
+
+    def _connection_stats(self):
+        """Return the number of requests sent and of connections opened to send them through http_session."""
+        requests_sent = 0
+        connections = 0
+        for adapter in set(self.http_session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                requests_sent += pools[key].num_requests
+                connections += pools[key].num_connections
+        return requests_sent, connections
+
     def get_resource_list(self, api_url):
         """Retrieves resource list from nautobot API.
 
@@ -398,9 +504,39 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             api_output = self._fetch_information(api_url)
             resources.extend(api_output["results"])
             api_url = api_output["next"]
+            if api_url and self.pagination_workers > 1:
+                pages = self._fetch_pages(api_url, len(api_output["results"]), api_output.get("count"))
+                for api_output in pages:
+                    resources.extend(api_output["results"])
+                # Only set when objects were added since the count was read
+                api_url = api_output["next"]
 
         return resources
 
+    def _fetch_pages(self, next_url, page_size, count):
+        """Fetch the pages following the first one concurrently, using their offset.
+
+        Returns:
+           The pages from next_url on, in order.
+        """
+        if not page_size or not count:
+            return [self._fetch_information(next_url)]
+
+        url = urlsplit(next_url)
+        query = [
+            (key, value)
+            for key, value in parse_qsl(url.query, keep_blank_values=True)
+            if key not in ("limit", "offset")
+        ]
+        start = int(dict(parse_qsl(url.query)).get("offset", page_size))
+        urls = [
+            urlunsplit(url._replace(query=urlencode(query + [("limit", page_size), ("offset", offset)])))
+            for offset in range(start, count, page_size)
+        ] or [next_url]
+
+        with ThreadPoolExecutor(max_workers=min(self.pagination_workers, len(urls))) as executor:
+            return list(executor.map(self._fetch_information, urls))
+
     def get_resource_list_chunked(self, api_url, query_key, query_values):
         # Make an API call for multiple specific IDs, like /api/ipam/ip-addresses?limit=0&device_id=1&device_id=2&device_id=3
         # Drastically cuts down HTTP requests compared to 1 request per host, in the case where we don't want to fetch_all
@@ -421,7 +557,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         if chunk_size < 1:
             chunk_size = 1
 
-        resources = []
+        urls = []
 
         for i in range(0, len(query_values), chunk_size):
             # fmt: off
@@ -432,10 +568,29 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             for value in chunk:
                 url += query_string(value, "&" if "?" in url else "?")
 
+            urls.append(url)
+
+        if self.chunk_workers > 1 and len(urls) > 1:
+            # map returns the chunks in order, whatever order they complete in
+            with ThreadPoolExecutor(max_workers=min(self.chunk_workers, len(urls))) as executor:
+                return list(chain.from_iterable(executor.map(self.get_resource_list, urls)))
+
+        resources = []
+        for url in urls:
             resources.extend(self.get_resource_list(url))
 
         return resources
 
+    def _use_fetch_all(self, *query_values):
+        """Whether to fetch every related object instead of the ones related to query_values.
+
+        Returns:
+           True with fetch_all, or when there are more IDs in query_values than fetch_all_threshold.
+        """
+        if self.fetch_all:
+            return True
+        return bool(self.fetch_all_threshold) and sum(len(values) for values in query_values) > self.fetch_all_threshold
+
     @property
     def group_extractors(self):
         # List of group_by options and hostvars to extract
@@ -883,7 +1038,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         url = self.api_endpoint + "/api/ipam/services/?limit=0&depth=1&exclude_m2m=False"
         services = []
 
-        if self.fetch_all:
+        if self._use_fetch_all(self.devices_lookup, self.vms_lookup):
             services = self.get_resource_list(url)
         else:
             device_services = self.get_resource_list_chunked(
@@ -921,15 +1076,19 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         device_interfaces = []
         vm_interfaces = []
 
-        if self.fetch_all:
+        # Device and VM interfaces are separate endpoints, each fetched in full when it has too many IDs
+        if self._use_fetch_all(self.devices_lookup):
             device_interfaces = self.get_resource_list(url_device_interfaces)
-            vm_interfaces = self.get_resource_list(url_vm_interfaces)
         else:
             device_interfaces = self.get_resource_list_chunked(
                 api_url=url_device_interfaces,
                 query_key="device_id",
                 query_values=self.devices_lookup.keys(),
             )
+
+        if self._use_fetch_all(self.vms_lookup):
+            vm_interfaces = self.get_resource_list(url_vm_interfaces)
+        else:
             vm_interfaces = self.get_resource_list_chunked(
                 api_url=url_vm_interfaces,
                 query_key="virtual_machine_id",
@@ -988,7 +1147,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         )
         ipaddresses = []
 
-        if self.fetch_all:
+        if self._use_fetch_all(self.devices_with_ips, self.vms_lookup):
             ipaddresses = self.get_resource_list(url)
         else:
             device_ips = self.get_resource_list_chunked(
@@ -1432,9 +1591,9 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             self._add_host_to_keyed_groups(self.get_option("keyed_groups"), host, hostname, strict=strict)
             self.add_host_to_groups(host=host, hostname=hostname)
 
-            # Create groups for parent locations, containing child locations
-            if "locations" in self.group_by:
-                self._add_location_groups()
+        # Create groups for parent locations, containing child locations, once for all hosts
+        if "locations" in self.group_by and (self.devices_list or self.vms_list):
+            self._add_location_groups()
 
     def parse(self, inventory, loader, path, cache=True):
         super(InventoryModule, self).parse(inventory, loader, path)
@@ -1448,6 +1607,9 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         self.api_version = self.get_option("api_version")
         self.timeout = self.get_option("timeout")
         self.max_uri_length = self.get_option("max_uri_length")
+        self.pagination_workers = self.get_option("pagination_workers")
+        self.chunk_workers = self.get_option("chunk_workers")
+        self.fetch_all_threshold = self.get_option("fetch_all_threshold")
         self.validate_certs = self.get_option("validate_certs")
         self.follow_redirects = self.get_option("follow_redirects")
         self.config_context = self.get_option("config_context")
@@ -1480,7 +1642,15 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         # Compile regular expressions, if any
         self.rename_variables = self.parse_rename_variables(self.get_option("rename_variables"))
 
-        self.main()
+        # One connection for each request that may be sent at once by the lookup threads
+        self.http_session = self._new_http_session(self._pool_size())
+        try:
+            self.main()
+        finally:
+            if self.http_session is not None:
+                self.display.vvv("Sent %d requests to Nautobot over %d connections" % self._connection_stats())
+                self.http_session.close()
+                self.http_session = None
 
     def parse_rename_variables(self, rename_variables):
         return [{"pattern": re.compile(i["pattern"]), "repl": i["repl"]} for i in rename_variables or ()]
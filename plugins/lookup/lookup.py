@@ -145,6 +145,7 @@ from ansible.module_utils.six import raise_from
 from ansible.parsing.splitter import parse_kv, split_args
 from ansible.plugins.lookup import LookupBase
 from ansible.utils.display import Display
+from ansible_collections.networktocode.nautobot.plugins.module_utils.timing import controller_hook
 from ansible_collections.networktocode.nautobot.plugins.module_utils.utils import (
     is_truthy,
     mark_trusted,
@@ -409,6 +410,7 @@ class LookupModule(LookupBase):
             verify=ssl_verify,
             retries=num_retries,
         )
+        nautobot.http_session.hooks["response"].append(controller_hook("lookup"))
         results = []
         for term in terms:
             if term == "nautobot_status":
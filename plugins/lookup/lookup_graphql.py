@@ -118,6 +118,7 @@ else:
     PYNAUTOBOT_IMPORT_ERROR = None
 
 try:
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.timing import controller_hook
     from ansible_collections.networktocode.nautobot.plugins.module_utils.utils import (
         NautobotApiBase,
         NautobotGraphQL,
@@ -125,6 +126,7 @@ try:
     )
 except ModuleNotFoundError:
     # For testing
+    from plugins.module_utils.timing import controller_hook
     from plugins.module_utils.utils import NautobotApiBase, NautobotGraphQL
 
 from ansible.utils.display import Display
@@ -167,6 +169,7 @@ def nautobot_lookup_graphql(**kwargs):
         raise AnsibleLookupError("validate_certs must be a boolean")
 
     nautobot_api = NautobotApiBase(token=token, url=url, ssl_verify=ssl_verify, api_version=api_version)
+    nautobot_api.api.http_session.hooks["response"].append(controller_hook("lookup_graphql"))
     graph_variables = kwargs.get("graph_variables")
     Display().v("Graph Variables: %s" % graph_variables)
 
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Network to Code (@networktocode) <info@networktocode.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import asyncio
+import json
+import os
+import ssl
+import time
+import traceback
+
+AIOHTTP_IMP_ERR = None
+try:
+    import aiohttp
+
+    HAS_AIOHTTP = True
+except ImportError:
+    AIOHTTP_IMP_ERR = traceback.format_exc()
+    HAS_AIOHTTP = False
+
+# Connections kept open to Nautobot, and so requests sent at once
+ASYNC_POOL_SIZE = 4
+
+
+def _query(params):
+    """Encode params the way requests does, with one pair per item of list values."""
+    query = list()
+    for key, value in params.items():
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            if item is not None:
+                query.append((key, item if isinstance(item, str) else str(item)))
+    return query
+
+
+def _parse_choices(options):
+    """Return the choices of each field from the OPTIONS response of an endpoint, like `Endpoint.choices`."""
+    if options.get("schema", {}).get("properties") is not None:
+        # Nautobot 2.3 and below
+        post_data = options["schema"]["properties"]
+        return {
+            prop: [{"value": x, "display": y} for x, y in zip(post_data[prop]["enum"], post_data[prop]["enumNames"])]
+            for prop in post_data
+            if "enum" in post_data[prop]
+        }
+    if options.get("actions", {}).get("POST") is not None:
+        # Nautobot 2.4+
+        choices = dict()
+        for prop, field in options["actions"]["POST"].items():
+            if "choices" in field:
+                choices[prop] = field["choices"]
+            elif field["type"] == "list" and "choices" in field.get("child", {}):
+                choices[prop] = field["child"]["choices"]
+        return choices
+    raise ValueError("Unexpected format in the OPTIONS response")
+
+
+def _ssl(verify):
+    """Return the ssl argument of aiohttp matching the verify setting of a requests session.
+
+    :params verify (bool|str): Whether to validate certificates, or the CA bundle file or directory to validate them with
+    """
+    if verify is False:
+        return False
+    if isinstance(verify, str):
+        if os.path.isdir(verify):
+            return ssl.create_default_context(capath=verify)
+        return ssl.create_default_context(cafile=verify)
+    return None
+
+
+class NautobotAsyncApi:
+    """asyncio client of the Nautobot REST API sharing a pool of aiohttp connections.
+
+    It mirrors the pynautobot client it is built from: the same URL, token, API version,
+    certificate validation and default filters are used, and objects are returned as the
+    pynautobot Records of their endpoint, so code written for pynautobot can use them as is.
+    Failed requests raise `pynautobot.RequestError`, built from a requests Response, so they
+    are handled the same way. Use it as an async context manager:
+
+        async with NautobotAsyncApi(nb) as api:
+            devices, interfaces = await asyncio.gather(
+                api.endpoint(nb.dcim.devices).filter(location="HQ"),
+                api.endpoint(nb.dcim.interfaces).filter(device="core1"),
+            )
+    :params nb (pynautobot.api): The synchronous client
+    :params pool_size (int): Number of connections, and requests sent at once
+    :params on_response (callable): Called with the method, URL, status, bytes and seconds of each request
+    """
+
+    def __init__(self, nb, pool_size=ASYNC_POOL_SIZE, on_response=None):
+        """Initialize the client, connections are only opened in the async context."""
+        self.nb = nb
+        self.pool_size = pool_size
+        self.on_response = on_response
+        self.session = None
+
+    async def __aenter__(self):
+        """Open the connection pool, sending the headers pynautobot sends."""
+        verify = self.nb.http_session.verify
+        headers = {"Authorization": "Token %s" % self.nb.token} if self.nb.token else {}
+        headers.update(self.nb.http_session.headers)
+        headers["Accept"] = (
+            "application/json; version=%s" % self.nb.api_version if self.nb.api_version else "application/json"
+        )
+        connector = aiohttp.TCPConnector(limit=self.pool_size, ssl=_ssl(verify))
+        self.session = aiohttp.ClientSession(connector=connector, headers=headers)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Close the connection pool."""
+        await self.session.close()
+        self.session = None
+
+    def endpoint(self, nb_endpoint):
+        """Return the async counterpart of a pynautobot endpoint."""
+        return NautobotAsyncEndpoint(self, nb_endpoint)
+
+    def _request_error(self, method, url, status, reason, content, data):
+        import pynautobot
+        import requests
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.url = url
+        response._content = content
+        response.request = requests.Request(method, url, json=data).prepare()
+        return pynautobot.RequestError(response)
+
+    async def request(self, method, url, params=None, data=None):
+        """Send a request and return its decoded JSON response.
+
+        :raises pynautobot.RequestError: if Nautobot doesn't answer with a success status
+        """
+        started = time.monotonic()
+        async with self.session.request(method, url, params=_query(params or {}), json=data) as response:
+            content = await response.read()
+            if self.on_response:
+                self.on_response(method, str(response.url), response.status, len(content), time.monotonic() - started)
+            if response.status >= 400:
+                raise self._request_error(method, str(response.url), response.status, response.reason, content, data)
+        return json.loads(content) if content else None
+
+
+class NautobotAsyncEndpoint:
+    """Subset of the API of a pynautobot endpoint used by NautobotModule, with coroutines.
+
+    :params api (NautobotAsyncApi): The client sending the requests
+    :params nb_endpoint (pynautobot endpoint object): The endpoint mirrored
+    """
+
+    def __init__(self, api, nb_endpoint):
+        """Initialize the endpoint."""
+        self.api = api
+        self.nb_endpoint = nb_endpoint
+        self.url = nb_endpoint.url
+
+    def _record(self, values):
+        return self.nb_endpoint.return_obj(values, self.nb_endpoint.api, self.nb_endpoint)
+
+    async def get(self, *args, **kwargs):
+        """Return the object with the ID args[0], or the single object matching kwargs, or None.
+
+        :raises ValueError: if more than one object matches, like `Endpoint.get`
+        """
+        if args:
+            try:
+                values = await self.api.request(
+                    "GET", "%s/%s/" % (self.url, args[0]), params=self.api.nb.default_filters
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                if getattr(getattr(e, "req", None), "status_code", None) == 404:
+                    return None
+                raise
+            return self._record(values)
+
+        nb_objects = await self.filter(**kwargs)
+        if len(nb_objects) > 1:
+            raise ValueError("get() returned more than one result.")
+        return nb_objects[0] if nb_objects else None
+
+    async def filter(self, **kwargs):
+        """Return every object matching kwargs, the pages after the first one being fetched at once."""
+        params = dict(self.api.nb.default_filters, **kwargs)
+        page = await self.api.request("GET", "%s/" % self.url, params=params)
+        results = page["results"]
+        if page.get("next") and results:
+            page_size = len(results)
+            offsets = range(page_size, page["count"], page_size)
+            pages = await asyncio.gather(
+                *[
+                    self.api.request("GET", "%s/" % self.url, params=dict(params, limit=page_size, offset=offset))
+                    for offset in offsets
+                ]
+            )
+            for page in pages:
+                results.extend(page["results"])
+        return [self._record(values) for values in results]
+
+    async def create(self, data):
+        """Create an object, or objects when data is a list, and return them."""
+        created = await self.api.request("POST", "%s/" % self.url, data=data)
+        if isinstance(created, list):
+            return [self._record(values) for values in created]
+        return self._record(created)
+
+    async def update(self, objects):
+        """Update objects given as dicts with their id and the fields to change, and return them."""
+        updated = await self.api.request("PATCH", "%s/" % self.url, data=objects)
+        return [self._record(values) for values in updated]
+
+    async def delete(self, objects):
+        """Delete objects given as Records, dicts or IDs, and return True like `Endpoint.delete`."""
+        ids = [{"id": getattr(obj, "id", None) or (obj.get("id") if isinstance(obj, dict) else obj)} for obj in objects]
+        await self.api.request("DELETE", "%s/" % self.url, data=ids)
+        return True
+
+    async def choices(self):
+        """Return the choices of each field of the endpoint, like `Endpoint.choices`."""
+        return _parse_choices(await self.api.request("OPTIONS", "%s/" % self.url))
+
+    def available_ips(self, nb_object):
+        """Return the available-ips detail endpoint of a prefix."""
+        return NautobotAsyncDetailEndpoint(self.api, nb_object, "available-ips", self.api.nb.ipam.ip_addresses)
+
+    def available_prefixes(self, nb_object):
+        """Return the available-prefixes detail endpoint of a prefix."""
+        return NautobotAsyncDetailEndpoint(self.api, nb_object, "available-prefixes", self.nb_endpoint)
+
+
+class NautobotAsyncDetailEndpoint:
+    """Async counterpart of a pynautobot DetailEndpoint, e.g. `prefix.available_ips`."""
+
+    def __init__(self, api, nb_object, name, return_endpoint):
+        """Initialize the detail endpoint of nb_object, returning Records of return_endpoint."""
+        self.api = api
+        self.url = "%s/%s/%s/" % (nb_object.endpoint.url, nb_object.id, name)
+        self.return_endpoint = NautobotAsyncEndpoint(api, return_endpoint)
+
+    async def list(self, **kwargs):
+        """Return the available objects."""
+        available = await self.api.request("GET", self.url, params=dict(self.api.nb.default_filters, **kwargs))
+        return [self.return_endpoint._record(values) for values in available]
+
+    async def create(self, data=None):
+        """Allocate an available object, or objects when data is a list, and return them."""
+        created = await self.api.request("POST", self.url, data=data or {})
+        if isinstance(created, list):
+            return [self.return_endpoint._record(values) for values in created]
+        return self.return_endpoint._record(created)
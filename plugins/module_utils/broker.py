@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Network to Code (@networktocode) <info@networktocode.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import base64
+import datetime
+import fcntl
+import hashlib
+import json
+import os
+import selectors
+import socket
+import socketserver
+import time
+import traceback
+
+REQUESTS_IMP_ERR = None
+try:
+    import requests
+    from requests.adapters import BaseAdapter, HTTPAdapter
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+
+    HAS_REQUESTS = True
+except ImportError:
+    REQUESTS_IMP_ERR = traceback.format_exc()
+    HAS_REQUESTS = False
+    BaseAdapter = object
+
+BROKER_DIR = os.path.join(os.path.expanduser("~/.ansible"), "nautobot_broker")
+BROKER_SOCKET = os.path.join(BROKER_DIR, "broker.sock")
+
+# Seconds without any request before the broker shuts itself down
+BROKER_IDLE_TIMEOUT = 300
+
+# Seconds a module waits for a broker it started to accept connections
+BROKER_START_TIMEOUT = 5
+
+# Connections kept alive per Nautobot instance, sized for forks=50
+BROKER_POOL_MAXSIZE = 50
+
+# Seconds a module waits for the response of the broker to a request without a timeout
+BROKER_TIMEOUT = 120
+
+# Seconds added to the timeout of a request for the broker to forward it
+BROKER_TIMEOUT_MARGIN = 5
+
+# Requests sent again directly when the broker doesn't answer in time
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+
+class NautobotBroker(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Local broker forwarding HTTP requests to Nautobot over pooled keep-alive sessions.
+
+    Modules send one JSON encoded request per connection to the Unix socket and get the JSON
+    encoded response back. One requests.Session is kept per Nautobot instance, certificate
+    validation setting and token, so every task talking to the same Nautobot instance reuses
+    the same TLS connections instead of doing its own handshake.
+    """
+
+    # How often the idle timeout is checked
+    timeout = 1
+
+    def __init__(self, path, idle_timeout=BROKER_IDLE_TIMEOUT):
+        """Bind the broker to the Unix socket at path, only readable by the current user."""
+        socketserver.UnixStreamServer.__init__(self, path, _BrokerRequestHandler, bind_and_activate=False)
+        old_umask = os.umask(0o177)
+        try:
+            self.server_bind()
+        finally:
+            os.umask(old_umask)
+        self.server_activate()
+        self.idle_timeout = idle_timeout
+        self.last_activity = time.monotonic()
+        self._sessions = dict()
+
+    def touch(self):
+        self.last_activity = time.monotonic()
+
+    def get_session(self, url, verify, headers):
+        """Return the pooled session of the Nautobot instance serving url."""
+        origin = url.split("/", 3)[:3]
+        authorization = hashlib.sha256(headers.get("Authorization", "").encode("utf-8")).hexdigest()
+        key = ("/".join(origin), json.dumps(verify), authorization)
+        # dict.setdefault is atomic, a session created by a concurrent request is simply dropped
+        session = self._sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=BROKER_POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session = self._sessions.setdefault(key, session)
+        return session
+
+    def forward(self, request):
+        """Send a request decoded from a module to Nautobot and encode its response."""
+        headers = request["headers"]
+        session = self.get_session(request["url"], request["verify"], headers)
+        body = base64.b64decode(request["body"]) if request.get("body") is not None else None
+        response = session.request(
+            request["method"],
+            request["url"],
+            headers=headers,
+            data=body,
+            verify=request["verify"],
+            # JSON turned the (connect, read) tuple into a list
+            timeout=tuple(request["timeout"]) if isinstance(request.get("timeout"), list) else request.get("timeout"),
+            proxies=request.get("proxies"),
+            allow_redirects=False,
+        )
+        return {
+            "status": response.status_code,
+            "reason": response.reason,
+            "url": response.url,
+            "headers": dict(response.headers),
+            "body": base64.b64encode(response.content).decode("ascii"),
+            "elapsed": response.elapsed.total_seconds(),
+        }
+
+    def serve_until_idle(self):
+        """Handle requests until none was received for idle_timeout seconds.
+
+        The socket is then unlinked so no new connection reaches the broker, and the connections
+        already waiting to be accepted are still handled instead of being reset once it closes.
+        """
+        while time.monotonic() - self.last_activity < self.idle_timeout:
+            self.handle_request()
+
+        os.remove(self.server_address)
+        with selectors.DefaultSelector() as selector:
+            selector.register(self, selectors.EVENT_READ)
+            while selector.select(0):
+                self.handle_request()
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        # Wait for the requests being handled before closing the sessions they use
+        socketserver.ThreadingMixIn.server_close(self)
+        for session in self._sessions.values():
+            session.close()
+
+
+class _BrokerRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.touch()
+        line = self.rfile.readline()
+        if not line:
+            # A client checking the broker is running
+            return
+        try:
+            response = self.server.forward(json.loads(line))
+        except Exception as e:  # pylint: disable=broad-except
+            response = {"error": "%s: %s" % (type(e).__name__, e)}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        self.server.touch()
+
+
+def run_broker(path=BROKER_SOCKET, idle_timeout=BROKER_IDLE_TIMEOUT):
+    """Run the broker until it is idle, unless another broker already serves path."""
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    with open("%s.lock" % path, "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return
+
+        # Only the broker holding the lock owns the socket, anything left there is stale
+        if os.path.exists(path):
+            os.remove(path)
+        broker = NautobotBroker(path, idle_timeout)
+        try:
+            broker.serve_until_idle()
+        finally:
+            # Already removed once the broker was idle
+            if os.path.exists(path):
+                os.remove(path)
+            broker.server_close()
+
+
+def _socket_timeout(timeout):
+    """Return the seconds to wait for the broker to answer a request sent with timeout."""
+    if isinstance(timeout, (tuple, list)):
+        timeout = None if None in timeout else sum(timeout)
+    if timeout is None:
+        return BROKER_TIMEOUT
+    return timeout + BROKER_TIMEOUT_MARGIN
+
+
+def spawn_broker(path=BROKER_SOCKET, idle_timeout=BROKER_IDLE_TIMEOUT):
+    """Start the broker in a daemon process detached from the module."""
+    pid = os.fork()
+    if pid:
+        os.waitpid(pid, 0)
+        return
+
+    try:
+        os.setsid()
+        if os.fork():
+            os._exit(0)
+        # Ansible waits for the output of the module to be closed before reading it
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        run_broker(path, idle_timeout)
+    finally:
+        os._exit(0)
+
+
+class NautobotBrokerAdapter(BaseAdapter):
+    """Transport adapter sending the requests of a session through the broker.
+
+    The broker is started by `start`, before the module runs any thread, as forking a process
+    with threads running isn't safe. If it can't be reached, requests are sent directly
+    with a regular HTTPAdapter, as are the requests using a client certificate, which isn't
+    forwarded to the broker. Once a request has been handed to the broker it is only sent again
+    directly if it is idempotent and the broker didn't answer in time, so a failure can't
+    duplicate a write.
+    """
+
+    def __init__(self, path=BROKER_SOCKET, spawn=True):
+        """Initialize the adapter.
+
+        :params path (str): Path of the Unix socket of the broker
+        :params spawn (bool): Start the broker if it isn't running
+        """
+        super(NautobotBrokerAdapter, self).__init__()
+        self.path = path
+        self.spawn = spawn
+        self.fallback = HTTPAdapter()
+        self.disabled = not hasattr(socket, "AF_UNIX")
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _connect_or_spawn(self):
+        try:
+            return self._connect()
+        except OSError:
+            if not self.spawn:
+                raise
+
+        spawn_broker(self.path)
+        deadline = time.monotonic() + BROKER_START_TIMEOUT
+        while True:
+            try:
+                return self._connect()
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def start(self):
+        """Start the broker if it isn't running, then never start it again from this adapter."""
+        if not self.disabled:
+            try:
+                self._connect_or_spawn().close()
+            except OSError:
+                self.disabled = True
+        self.spawn = False
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if not self.disabled and cert is None:
+            try:
+                sock = self._connect_or_spawn()
+            except OSError:
+                self.disabled = True
+
+        if self.disabled or cert is not None:
+            return self.fallback.send(
+                request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+            )
+
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        message = {
+            "method": request.method,
+            "url": request.url,
+            "headers": dict(request.headers),
+            "body": base64.b64encode(body).decode("ascii") if body is not None else None,
+            "verify": verify,
+            "timeout": timeout,
+            "proxies": proxies,
+        }
+        try:
+            sock.settimeout(_socket_timeout(timeout))
+            with sock, sock.makefile("rwb") as stream_file:
+                stream_file.write(json.dumps(message).encode("utf-8") + b"\n")
+                stream_file.flush()
+                reply = json.loads(stream_file.readline())
+        except socket.timeout as e:
+            # The broker is stuck, the next requests are sent directly
+            self.disabled = True
+            if request.method in IDEMPOTENT_METHODS:
+                return self.fallback.send(
+                    request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+                )
+            raise requests.exceptions.ReadTimeout("Nautobot broker timed out: %s" % e, request=request)
+        except (OSError, ValueError) as e:
+            raise requests.exceptions.ConnectionError("Nautobot broker failed: %s" % e, request=request)
+
+        if "error" in reply:
+            raise requests.exceptions.ConnectionError(reply["error"], request=request)
+
+        return self.build_response(request, reply)
+
+    def build_response(self, request, reply):
+        response = requests.Response()
+        response.status_code = reply["status"]
+        response.reason = reply["reason"]
+        response.url = reply["url"]
+        response.headers = CaseInsensitiveDict(reply["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(reply["body"])
+        # The body is already read, there is no connection left to release on close()
+        response._content_consumed = True
+        response.elapsed = datetime.timedelta(seconds=reply["elapsed"])
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        self.fallback.close()
+
+
+def use_broker(http_session, path=BROKER_SOCKET):
+    """Route every request of http_session through the broker, starting it now."""
+    adapter = NautobotBrokerAdapter(path)
+    adapter.start()
+    http_session.mount("http://", adapter)
+    http_session.mount("https://", adapter)
+    return adapter
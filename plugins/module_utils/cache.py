@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Network to Code (@networktocode) <info@networktocode.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# Mirrors the location used by the inventory plugin for its OpenAPI cache
+CACHE_DIR = os.path.join(os.path.expanduser("~/.ansible"), "cache", "nautobot_modules")
+
+
+class NautobotFileCache:
+    """On-disk, TTL-bounded cache shared by every task talking to the same Nautobot instance.
+
+    Entries are grouped into namespaces, each stored as one JSON file inside a directory
+    derived from the Nautobot URL and token, so results are never shared between instances
+    or between tokens with different permissions. Files are replaced atomically, so forks
+    running concurrently never read a partially written file; the last writer wins, which
+    is acceptable for cached data. Any I/O error is treated as a cache miss.
+    """
+
+    def __init__(self, url, token, ttl, cache_dir=None):
+        """Initialize the cache.
+
+        :params url (str): URL of the Nautobot instance
+        :params token (str): Token used to talk to the Nautobot instance
+        :params ttl (int): Number of seconds an entry stays valid
+        :params cache_dir (str): Base directory of the cache, defaults to CACHE_DIR
+        """
+        self.ttl = ttl
+        digest = hashlib.sha256(("%s|%s" % (url.rstrip("/"), token)).encode("utf-8")).hexdigest()
+        self.path = os.path.join(cache_dir or CACHE_DIR, digest[:16])
+        self._namespaces = {}
+
+    @staticmethod
+    def make_key(*parts):
+        """Build a stable cache key out of JSON serializable parts (dicts are sorted)."""
+        return json.dumps(parts, sort_keys=True, default=str)
+
+    def _namespace_file(self, namespace):
+        return os.path.join(self.path, "%s.json" % namespace)
+
+    def _read(self, namespace):
+        try:
+            with open(self._namespace_file(namespace), "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _write(self, namespace, entries):
+        tmp_path = None
+        try:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".%s." % namespace)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self._namespace_file(namespace))
+        except OSError:
+            # Caching is best effort, never fail a task because the cache is not writable
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get(self, namespace, key):
+        """Return the cached value for key or None if it is missing or expired."""
+        if namespace not in self._namespaces:
+            self._namespaces[namespace] = self._read(namespace)
+
+        entry = self._namespaces[namespace].get(key)
+        if not isinstance(entry, dict) or entry.get("expires", 0) <= time.time():
+            return None
+        return entry.get("value")
+
+    def set(self, namespace, key, value):
+        """Store value under key, merging with entries written by other processes."""
+        now = time.time()
+        # Re-read to pick up entries written by concurrent tasks and drop the expired ones
+        entries = {k: v for k, v in self._read(namespace).items() if isinstance(v, dict) and v.get("expires", 0) > now}
+        entries[key] = {"value": value, "expires": now + self.ttl}
+        self._namespaces[namespace] = entries
+        self._write(namespace, entries)
+
+    def invalidate(self, namespace):
+        """Drop every entry of a namespace."""
+        self._namespaces.pop(namespace, None)
+        try:
+            os.remove(self._namespace_file(namespace))
+        except OSError:
+            pass
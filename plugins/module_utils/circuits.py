@@ -38,6 +38,9 @@ class NautobotCircuitsModule(NautobotModule):
         nb_endpoint = getattr(nb_app, self.endpoint)
         user_query_params = self.module.params.get("query_params")
 
+        if self.objects is not None:
+            return self._run_bulk(nb_endpoint, endpoint_name)
+
         data = self.data
 
         # Used for msg output
@@ -66,4 +69,4 @@ class NautobotCircuitsModule(NautobotModule):
 
         self.result.update({endpoint_name: serialized_object})
 
-        self.module.exit_json(**self.result)
+        self._exit_json()
@@ -56,6 +56,18 @@ NB_DEVICE_CLUSTER_ASSIGNMENTS = "device_cluster_assignments"
 
 
 class NautobotDcimModule(NautobotModule):
+    def _check_existing_object(self, nb_object, data, params):
+        """Handle interfaces found on another member of the virtual chassis of the device."""
+        if self.endpoint == "interfaces" and not params.get("module") and nb_object.device.id != data["device"]:
+            device = self.nb.dcim.devices.get(nb_object.device.id)
+            if device["virtual_chassis"]:
+                if params.get("update_vc_child"):
+                    data["device"] = nb_object.device.id
+                else:
+                    self._handle_errors(
+                        msg="Must set update_vc_child to True to allow child device interface modification"
+                    )
+
     def run(self):
         """Run the Nautobot DCIM module.
 
@@ -106,6 +118,13 @@ class NautobotDcimModule(NautobotModule):
         nb_endpoint = getattr(nb_app, self.endpoint)
         user_query_params = self.module.params.get("query_params")
 
+        if self.objects is not None:
+            # Make color params lowercase
+            for data in self.objects_data:
+                if data.get("color"):
+                    data["color"] = data["color"].lower()
+            return self._run_bulk(nb_endpoint, endpoint_name)
+
         data = self.data
 
         # # Include config context for device endpoint
@@ -187,17 +206,8 @@ class NautobotDcimModule(NautobotModule):
             object_query_params = self._build_query_params(endpoint_name, data, user_query_params)
             self.nb_object = self._nb_endpoint_get(nb_endpoint, object_query_params, name)
 
-        # This is logic to handle interfaces on a VC
-        if self.endpoint == "interfaces":
-            if self.nb_object and not self.module.params["module"]:
-                device = self.nb.dcim.devices.get(self.nb_object.device.id)
-                if device["virtual_chassis"] and self.nb_object.device.id != self.data["device"]:
-                    if self.module.params.get("update_vc_child"):
-                        data["device"] = self.nb_object.device.id
-                    else:
-                        self._handle_errors(
-                            msg="Must set update_vc_child to True to allow child device interface modification"
-                        )
+        if self.nb_object:
+            self._check_existing_object(self.nb_object, data, self.module.params)
 
         if self.state == "present":
             self._ensure_object_exists(nb_endpoint, endpoint_name, name, data)
@@ -212,4 +222,4 @@ class NautobotDcimModule(NautobotModule):
 
         self.result.update({endpoint_name: serialized_object})
 
-        self.module.exit_json(**self.result)
+        self._exit_json()
@@ -49,6 +49,13 @@ class NautobotExtrasModule(NautobotModule):
         nb_endpoint = getattr(nb_app, self.endpoint)
         user_query_params = self.module.params.get("query_params")
 
+        if self.objects is not None:
+            # Make color params lowercase
+            for data in self.objects_data:
+                if data.get("color"):
+                    data["color"] = data["color"].lower()
+            return self._run_bulk(nb_endpoint, endpoint_name)
+
         data = self.data
 
         # Used for msg output
@@ -88,4 +95,4 @@ class NautobotExtrasModule(NautobotModule):
 
         self.result.update({endpoint_name: serialized_object})
 
-        self.module.exit_json(**self.result)
+        self._exit_json()
@@ -97,7 +97,7 @@ class NautobotIpamModule(NautobotModule):
             if self.check_mode:
                 self.result["changed"] = True
                 self.result["msg"] = "New prefix created within %s" % (data["parent"])
-                self.module.exit_json(**self.result)
+                self._exit_json()
             # Convert parent to prefix key when calling prefix endpoint
             data["prefix"] = data.pop("parent")
             self.nb_object, diff = self._create_object(self.nb_object.available_prefixes, data)
@@ -137,6 +137,26 @@ class NautobotIpamModule(NautobotModule):
         nb_endpoint = getattr(nb_app, self.endpoint)
         user_query_params = self.module.params.get("query_params")
 
+        if self.objects is not None:
+            if any(item.get("first_available") for item in self.objects):
+                self._handle_errors(msg="first_available can't be used with objects")
+            if self.state == "new":
+                self._handle_errors(msg="state new can't be used with objects, use state present")
+            if self.endpoint == "ip_addresses" and any(params.get("parent") for params in self.objects_params):
+                self._handle_errors(msg="parent can't be used with objects, set the address of every item instead")
+            for data in self.objects_data:
+                if self.endpoint == "ip_addresses" and not data.get("address"):
+                    self._handle_errors(msg="address is required for every item of objects")
+                elif self.endpoint == "ip_addresses":
+                    try:
+                        data["address"] = to_text(ip_interface(data["address"]).with_prefixlen)
+                    except ValueError:
+                        pass
+            if self.endpoint in ["vlans", "prefixes"] and any(params.get("location") for params in self.objects_params):
+                # Need to force the api_version to 2.0 when using `location` parameter
+                self.nb.api_version = "2.0"
+            return self._run_bulk(nb_endpoint, endpoint_name)
+
         data = self.data
         if self.endpoint == "ip_addresses" and data.get("address"):
             try:
@@ -188,4 +208,4 @@ class NautobotIpamModule(NautobotModule):
 
         self.result.update({endpoint_name: serialized_object})
 
-        self.module.exit_json(**self.result)
+        self._exit_json()
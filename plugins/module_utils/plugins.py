@@ -16,6 +16,9 @@ class NautobotPluginModule(NautobotModule):
         to create/update/delete the endpoint objects.
         """
         self.result = {"changed": False}
+        if self.objects is not None:
+            self._handle_errors(msg="objects is not supported by the plugin module")
+
         plugin_name = self.data["plugin"]
         endpoint_name = self.data["endpoint"]
         object_name = ", ".join(f"{key}:{value}" for key, value in self.data["identifiers"].items())
@@ -51,4 +54,4 @@ class NautobotPluginModule(NautobotModule):
 
         self.result[endpoint_name] = serialized_object
 
-        self.module.exit_json(**self.result)
+        self._exit_json()
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Network to Code (@networktocode) <info@networktocode.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import email.utils
+import fcntl
+import hashlib
+import json
+import os
+import random
+import time
+import traceback
+
+REQUESTS_IMP_ERR = None
+try:
+    import requests
+    from requests.adapters import BaseAdapter
+
+    HAS_REQUESTS = True
+except ImportError:
+    REQUESTS_IMP_ERR = traceback.format_exc()
+    HAS_REQUESTS = False
+    BaseAdapter = object
+
+RATE_LIMIT_DIR = os.path.join(os.path.expanduser("~/.ansible"), "tmp", "nautobot_ratelimit")
+
+# Statuses meaning Nautobot, or the proxy in front of it, didn't handle the request
+RETRY_STATUSES = frozenset((429, 502, 503, 504))
+
+# Statuses guaranteeing a write wasn't applied, requests changing data are only retried on them
+RETRY_WRITE_STATUSES = frozenset((429, 503))
+
+# Requests only reading data, retried on every status of RETRY_STATUSES and on connection errors
+RETRY_READ_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+# Longest wait between two attempts, including the one asked for by Retry-After
+RETRY_MAX_BACKOFF = 60
+
+# Requests sent at once before rate_limit applies
+RATE_LIMIT_BURST = 1
+
+
+class NautobotRateLimiter:
+    """Token bucket limiting the requests sent to a Nautobot instance by every task on the controller.
+
+    The bucket is stored in a file locked while it is updated, so the forks running modules
+    against the same Nautobot instance share it. Each request reserves a token, possibly one that
+    is only refilled in the future, and waits until then, so waiting tasks are served in order
+    without polling the file. Any I/O error lets the request through.
+    """
+
+    def __init__(self, url, rate, burst=RATE_LIMIT_BURST, path=RATE_LIMIT_DIR):
+        """Initialize the rate limiter.
+
+        :params url (str): URL of the Nautobot instance
+        :params rate (float): Requests per second
+        :params burst (int): Requests sent at once when the bucket is full
+        :params path (str): Directory of the bucket files
+        """
+        self.rate = rate
+        self.burst = burst
+        self.path = path
+        digest = hashlib.sha256(url.rstrip("/").encode("utf-8")).hexdigest()
+        self.file = os.path.join(path, "%s.json" % digest)
+
+    def reserve(self):
+        """Take a token from the bucket and return the number of seconds to wait before using it."""
+        try:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            with open(self.file, "a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    now = time.time()
+                    try:
+                        f.seek(0)
+                        bucket = json.load(f)
+                        tokens = float(bucket["tokens"]) + (now - float(bucket["updated"])) * self.rate
+                    except (KeyError, TypeError, ValueError):
+                        tokens = self.burst
+                    tokens = min(tokens, self.burst) - 1
+                    f.seek(0)
+                    f.truncate()
+                    json.dump({"tokens": tokens, "updated": now}, f)
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        except OSError:
+            return 0
+        return max(0, -tokens / self.rate)
+
+    def acquire(self):
+        """Wait until a request can be sent and return the number of seconds waited."""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class NautobotRetryAdapter(BaseAdapter):
+    """Transport adapter retrying the requests Nautobot couldn't handle and limiting their rate.
+
+    Requests answered with one of RETRY_STATUSES are sent again after an exponential backoff with
+    full jitter, or after the delay asked for by the Retry-After header. Only RETRY_WRITE_STATUSES
+    are retried for the requests changing data, as a write answered by a gateway error may have
+    been applied, and a retried DELETE answered with 404 is taken as done by an earlier attempt.
+    Connection errors are retried for RETRY_READ_METHODS only. Every request, including retries, goes
+    through the rate limiter when one is set. Requests are sent by the wrapped adapter, so this
+    works the same with or without the broker.
+    """
+
+    def __init__(self, adapter, retries, backoff, limiter=None, stats=None):
+        """Initialize the adapter.
+
+        :params adapter (requests.adapters.BaseAdapter): Adapter sending the requests
+        :params retries (int): Number of times a request is retried
+        :params backoff (float): Base of the exponential backoff, in seconds
+        :params limiter (NautobotRateLimiter): Rate limiter shared with the other tasks
+        :params stats (dict): Counters of retries and waits, possibly shared with other adapters
+        """
+        super(NautobotRetryAdapter, self).__init__()
+        self.adapter = adapter
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = limiter
+        self.stats = stats if stats is not None else new_retry_stats()
+
+    def _retry_after(self, response):
+        """Return the seconds to wait asked for by the Retry-After header of response, if any."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff(self, attempt, response=None):
+        retry_after = self._retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, RETRY_MAX_BACKOFF)
+        return random.uniform(0, min(self.backoff * 2**attempt, RETRY_MAX_BACKOFF))  # noqa: S311
+
+    def _should_retry(self, request, response):
+        statuses = RETRY_STATUSES if request.method in RETRY_READ_METHODS else RETRY_WRITE_STATUSES
+        return response.status_code in statuses
+
+    def send(self, request, **kwargs):
+        attempt = 0
+        while True:
+            if self.limiter:
+                self.stats["rate_limit_wait"] += self.limiter.acquire()
+            try:
+                response = self.adapter.send(request, **kwargs)
+            except requests.exceptions.ConnectionError:
+                if request.method not in RETRY_READ_METHODS or attempt >= self.retries:
+                    raise
+                response = None
+            else:
+                if attempt and request.method == "DELETE" and response.status_code == 404:
+                    # Deleted by an earlier attempt answered with an error
+                    response.status_code = 204
+                    response.reason = "No Content"
+                    response._content = b""
+                    return response
+                if attempt >= self.retries or not self._should_retry(request, response):
+                    return response
+                # Release the connection before waiting
+                response.close()
+
+            wait = self._backoff(attempt, response)
+            attempt += 1
+            self.stats["retries"] += 1
+            self.stats["retry_wait"] += wait
+            time.sleep(wait)
+
+    def close(self):
+        self.adapter.close()
+
+
+def new_retry_stats():
+    """Return the counters of retries and waits, all at zero."""
+    return {"retries": 0, "retry_wait": 0.0, "rate_limit_wait": 0.0}
+
+
+def use_retries(http_session, retries, backoff, limiter=None):
+    """Retry the requests of http_session sent through the currently mounted adapters.
+
+    :returns stats (dict): Counters of the retries of every request of http_session
+    """
+    stats = new_retry_stats()
+    for prefix in ("http://", "https://"):
+        adapter = http_session.get_adapter(prefix)
+        http_session.mount(prefix, NautobotRetryAdapter(adapter, retries, backoff, limiter, stats))
+    return stats
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Network to Code (@networktocode) <info@networktocode.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import json
+import os
+import time
+
+SINGLEFLIGHT_DIR = os.path.join(os.path.expanduser("~/.ansible"), "tmp", "nautobot_singleflight")
+
+# Seconds a call waits for an identical call of another process before making its own
+SINGLEFLIGHT_WAIT = 30
+
+# Result files older than this many seconds are removed
+SINGLEFLIGHT_SWEEP_AGE = 600
+
+
+class NautobotSingleFlight:
+    """Coalesce identical calls made at the same time by the tasks running on a host.
+
+    With many forks looping over the objects of the same device, each task sends the same
+    lookups, e.g. the device by name, within milliseconds. The first task making a call takes
+    a lock on a file named after the call and stores the result in it, the tasks making the same
+    call meanwhile wait for the lock and reuse that result instead of sending their own request.
+    A result is only reused by the calls that started waiting before it was stored, so a call
+    made once an identical call completed, e.g. after the object was created, is always sent.
+    Any I/O error falls back to making the call.
+    """
+
+    def __init__(self, url, token, path=SINGLEFLIGHT_DIR):
+        """Initialize the coalescing of calls to a Nautobot instance.
+
+        :params url (str): URL of the Nautobot instance
+        :params token (str): Token used to talk to the Nautobot instance, calls are never shared between tokens
+        :params path (str): Directory of the lock and result files
+        """
+        self.scope = "%s|%s" % (url.rstrip("/"), token)
+        self.path = path
+        self._swept = False
+
+    def _file(self, key):
+        digest = hashlib.sha256(("%s|%s" % (self.scope, json.dumps(key, sort_keys=True, default=str))).encode("utf-8"))
+        return os.path.join(self.path, "%s.json" % digest.hexdigest())
+
+    def _read(self, f, since):
+        """Return the result stored in f, if any and stored after since."""
+        try:
+            f.seek(0)
+            entry = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+        if not isinstance(entry, dict) or entry.get("completed", 0) <= since:
+            return False, None
+        return True, entry.get("value")
+
+    def _write(self, f, value):
+        try:
+            f.seek(0)
+            f.truncate()
+            json.dump({"completed": time.time(), "value": value}, f)
+            f.flush()
+        except (OSError, TypeError, ValueError):
+            # Waiting calls find no result and make their own
+            pass
+
+    def _sweep(self):
+        """Remove the result files left by calls made long ago, once per module run."""
+        if self._swept:
+            return
+        self._swept = True
+        try:
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    if entry.stat().st_mtime < time.time() - SINGLEFLIGHT_SWEEP_AGE:
+                        os.remove(entry.path)
+        except OSError:
+            pass
+
+    def do(self, key, fn):
+        """Return fn(), or the result of the identical call made by another task at the same time.
+
+        :params key: JSON serializable identity of the call, e.g. URL and query params of a request
+        :params fn (callable): Makes the call, its result must be JSON serializable
+        """
+        try:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            self._sweep()
+            f = open(self._file(key), "a+", encoding="utf-8")
+        except OSError:
+            return fn()
+
+        with f:
+            deadline = time.monotonic() + SINGLEFLIGHT_WAIT
+            # Only a call in flight when this one starts, i.e. holding the lock, is waited for
+            waiting_since = None
+            while True:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except OSError:
+                    if waiting_since is None:
+                        waiting_since = time.time()
+                    if time.monotonic() > deadline:
+                        return fn()
+                    time.sleep(0.01)
+
+            try:
+                found, value = self._read(f, waiting_since) if waiting_since is not None else (False, None)
+                if found:
+                    return value
+                value = fn()
+                self._write(f, value)
+                return value
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Network to Code (@networktocode) <info@networktocode.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+
+from ansible_collections.networktocode.nautobot.plugins.module_utils.cache import NautobotFileCache
+
+
+class NautobotSnapshot:
+    """Every object of an endpoint matching a filter, downloaded once and indexed by natural key.
+
+    Objects are looked up with `get` the same way `Endpoint.get` would find them, without
+    sending any request. The objects are indexed on demand by each field used to look them up,
+    e.g. name, so a lookup only compares the few objects sharing its value.
+    :params records (list): Objects of the endpoint, as returned by the REST API
+    :params match (callable): Compares a record with query params, returning True, False or
+    None when it can't be decided without asking Nautobot, see `NautobotBatchLookup.match`
+    """
+
+    def __init__(self, records, match):
+        """Initialize the snapshot."""
+        self.records = records
+        self.match = match
+        self._indexes = dict()
+
+    @classmethod
+    def load(cls, nb_endpoint, filters, match, cache=None):
+        """Download the objects of nb_endpoint matching filters, unless cache already holds them.
+
+        :params nb_endpoint (pynautobot endpoint object): The endpoint to download
+        :params filters (dict): Filters of the list request, e.g. `{"device_id": "..."}`
+        :params match (callable): See NautobotSnapshot
+        :params cache (NautobotFileCache): Cache the objects are shared through between tasks
+        """
+        namespace = snapshot_namespace(nb_endpoint, filters)
+        records = cache.get(namespace, "records") if cache else None
+        if records is None:
+            # Nested objects are only needed by their ID to be compared
+            records = [dict(record) for record in nb_endpoint.filter(depth=0, **filters)]
+            if cache:
+                cache.set(namespace, "records", records)
+        return cls(records, match)
+
+    def _index(self, field):
+        """Index the records by field, or return None if field isn't a plain value of the records."""
+        if field not in self._indexes:
+            index = dict()
+            for record in self.records:
+                value = record.get(field, index)
+                # e.g. device_id is compared with the device field by match
+                if value is index or isinstance(value, (dict, list)):
+                    index = None
+                    break
+                index.setdefault(str(value), list()).append(record)
+            self._indexes[field] = index
+        return self._indexes[field]
+
+    def get(self, query_params):
+        """Find the single record matching query_params.
+
+        :returns tuple(answered, record): whether the snapshot can answer the query and the
+        record found, None if no record matches
+        :raises ValueError: if more than one record matches, same as Endpoint.get
+        """
+        candidates = self.records
+        for key, value in query_params.items():
+            if isinstance(value, (dict, list)):
+                return False, None
+            index = self._index(key)
+            if index is not None:
+                candidates = index.get(str(value), [])
+                break
+
+        matches = [self.match(record, query_params) for record in candidates]
+        if None in matches:
+            return False, None
+
+        found = [record for record, match in zip(candidates, matches) if match]
+        if len(found) > 1:
+            raise ValueError("get() returned more than a single result")
+        return True, found[0] if found else None
+
+
+def snapshot_namespace(nb_endpoint, filters):
+    """Return the cache namespace of the snapshot of nb_endpoint filtered by filters.
+
+    Each snapshot has its own namespace, i.e. its own file, so storing one doesn't rewrite the others.
+    """
+    digest = hashlib.sha256(NautobotFileCache.make_key(nb_endpoint.url, filters).encode("utf-8")).hexdigest()
+    return "snapshot.%s.%s" % (nb_endpoint.name.replace("-", "_"), digest[:16])
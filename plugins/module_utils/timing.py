@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2026, Network to Code (@networktocode) <info@networktocode.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import fcntl
+import json
+import os
+import re
+import time
+from urllib.parse import urlsplit
+
+# UUIDs and integer IDs in request paths, replaced so requests to the same endpoint are grouped
+PATH_ID_RE = re.compile(r"/(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)(?=/|$)", re.IGNORECASE)
+
+# Environment variable holding the file the requests of inventory and lookup plugins are spooled to,
+# set by the api_cost callback so the requests sent from the worker processes reach it
+CONTROLLER_SPOOL_ENV = "NAUTOBOT_TIMING_SPOOL"
+
+# Requests of inventory and lookup plugins sent before the spool is set, e.g. while parsing the inventory
+CONTROLLER_REQUESTS = list()
+
+
+def endpoint_path(url):
+    """Return the path of url with object IDs replaced by {id}, e.g. /api/dcim/devices/{id}/."""
+    return PATH_ID_RE.sub("/{id}", urlsplit(url).path)
+
+
+class NautobotTiming:
+    """Record every HTTP request sent by a module and summarize them per endpoint.
+
+    Requests are recorded by a response hook of the requests session used by pynautobot, so
+    every request is seen whatever part of the module sends it. Each request is tagged with the
+    phase of the module it is sent in, `init` while the module parameters are normalized and
+    their IDs resolved, then `run` while the object is created, updated or deleted.
+    """
+
+    def __init__(self, phase="init"):
+        """Initialize an empty record, in the init phase unless set otherwise."""
+        self.phase = phase
+        self.requests = list()
+        self.started = time.monotonic()
+
+    def record(self, method, url, status, size, elapsed):
+        """Record a request sent in the current phase.
+
+        :params method (str): HTTP method of the request
+        :params url (str): URL of the request
+        :params status (int): HTTP status of the response
+        :params size (int): Number of bytes received
+        :params elapsed (float): Seconds the request took
+        """
+        self.requests.append(
+            {
+                "phase": self.phase,
+                "method": method.upper(),
+                "path": endpoint_path(url),
+                "status": status,
+                "bytes": size,
+                "elapsed": round(elapsed, 6),
+            }
+        )
+
+    def hook(self, response, *args, **kwargs):
+        """Record response, meant to be registered as a `response` hook of a requests session."""
+        self.record(
+            response.request.method,
+            response.request.url,
+            response.status_code,
+            len(response.content or b""),
+            response.elapsed.total_seconds(),
+        )
+        return response
+
+    def use(self, http_session):
+        """Record every request sent through http_session."""
+        http_session.hooks["response"].append(self.hook)
+
+    def summary(self):
+        """Return the number of requests, bytes received and seconds spent waiting for Nautobot.
+
+        The totals are given for the whole module, for each phase and for each endpoint, e.g.
+        `GET /api/dcim/devices/`, along with the total duration of the module.
+        """
+
+        def totals(requests):
+            return {
+                "requests": len(requests),
+                "bytes": sum(request["bytes"] for request in requests),
+                "elapsed": round(sum(request["elapsed"] for request in requests), 6),
+            }
+
+        phases = dict()
+        endpoints = dict()
+        for request in self.requests:
+            phases.setdefault(request["phase"], list()).append(request)
+            endpoints.setdefault("%s %s" % (request["method"], request["path"]), list()).append(request)
+
+        summary = totals(self.requests)
+        summary["duration"] = round(time.monotonic() - self.started, 6)
+        summary["phases"] = {phase: totals(requests) for phase, requests in phases.items()}
+        summary["endpoints"] = {endpoint: totals(requests) for endpoint, requests in endpoints.items()}
+        return summary
+
+    def write_trace(self, path, **fields):
+        """Append one JSON line per request to the trace file at path.
+
+        The file is locked while written so the traces of concurrent tasks don't interleave.
+        :params path (str): Path of the trace file
+        :params fields: Added to every line, e.g. the name of the module
+        """
+        with open(path, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                for request in self.requests:
+                    f.write(json.dumps(dict(fields, **request), sort_keys=True) + "\n")
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def record_controller_request(source, method, url, status, size, elapsed):
+    """Record a request sent by an inventory or lookup plugin, for the api_cost callback.
+
+    :params source (str): Name of the plugin, e.g. inventory
+    :params method (str): HTTP method of the request
+    :params url (str): URL of the request
+    :params status (int): HTTP status of the response
+    :params size (int): Number of bytes received
+    :params elapsed (float): Seconds the request took
+    """
+    request = {
+        "phase": source,
+        "method": method.upper(),
+        "path": endpoint_path(url),
+        "status": status,
+        "bytes": size,
+        "elapsed": round(elapsed, 6),
+    }
+    spool = os.environ.get(CONTROLLER_SPOOL_ENV)
+    if not spool:
+        CONTROLLER_REQUESTS.append(request)
+        return
+    try:
+        with open(spool, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(json.dumps(request, sort_keys=True) + "\n")
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+
+def controller_hook(source):
+    """Return a response hook recording the requests of a requests session used by the source plugin."""
+
+    def hook(response, *args, **kwargs):
+        record_controller_request(
+            source,
+            response.request.method,
+            response.request.url,
+            response.status_code,
+            len(response.content or b""),
+            response.elapsed.total_seconds(),
+        )
+        return response
+
+    return hook
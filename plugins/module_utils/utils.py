@@ -9,19 +9,48 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 # Import necessary packages
+import importlib.util
 import json
 import os
+import sys
 import traceback
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from itertools import chain
+from urllib.parse import quote_plus
 from uuid import UUID
 
 from ansible.module_utils.basic import env_fallback, missing_required_lib
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
 from ansible.module_utils.common.text.converters import to_text
-from ansible.module_utils.urls import open_url
+from ansible_collections.networktocode.nautobot.plugins.module_utils.cache import NautobotFileCache
+from ansible_collections.networktocode.nautobot.plugins.module_utils.singleflight import NautobotSingleFlight
+from ansible_collections.networktocode.nautobot.plugins.module_utils.snapshot import NautobotSnapshot
+from ansible_collections.networktocode.nautobot.plugins.module_utils.timing import NautobotTiming
+
+
+def lazy_import(name):
+    """Return the module name, only loaded when one of its attributes is first used.
+
+    Importing pynautobot, and requests with it, is a large part of the start time of a module,
+    which is wasted when the module exits before talking to Nautobot, e.g. on invalid arguments.
+    :raises ImportError: if the module isn't installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError("No module named '%s'" % name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
 
 PYNAUTOBOT_IMP_ERR = None
 try:
-    import pynautobot
+    pynautobot = lazy_import("pynautobot")
 
     HAS_PYNAUTOBOT = True
 except ImportError:
@@ -131,6 +160,10 @@ API_APPS_ENDPOINTS = dict(
     wireless=["wireless_networks", "radio_profiles", "supported_data_rates"],
 )
 
+# Application of every endpoint, precomputed so _find_app doesn't scan API_APPS_ENDPOINTS.
+# Same as the scan it replaces, the last application listing an endpoint wins.
+ENDPOINT_TO_APP = {endpoint: app for app, endpoints in API_APPS_ENDPOINTS.items() for endpoint in endpoints}
+
 # Used to normalize data for the respective query types used to find endpoints
 QUERY_TYPES = dict(
     circuit="cid",
@@ -635,6 +668,30 @@ CONVERT_KEYS = {
     "termination_b": "termination_b_id",
 }
 
+# Query params that don't filter on the equality of a field, objects queried with them can't
+# be matched locally against a list response and are looked up one at a time in bulk mode
+BULK_LOOKUP_UNCOMPARABLE_PARAMS = set(["address", "parent", "prefix", "q"])
+
+# Maximum number of objects looked up with a single list request in bulk mode
+BULK_LOOKUP_CHUNK_SIZE = 50
+
+# Maximum length of the query string of a single lookup list request, well below the URL
+# limits of common web servers and proxies
+BULK_LOOKUP_MAX_QUERY_LENGTH = 2000
+
+# Query params added to lookups with lightweight_lookups, related objects are only returned by
+# their ID and many-to-many fields, e.g. tags, are left out
+LIGHTWEIGHT_LOOKUP_FILTERS = {"depth": 0, "exclude_m2m": True}
+
+# Maximum seconds the API version reported by a Nautobot instance is cached on disk
+VERSION_CACHE_TTL = 300
+
+# Default number of threads resolving the IDs of user specified data, concurrent lookups are opt-in
+RESOLVE_WORKERS = 1
+
+# Seconds waited before the first retry of a request, doubled for each following retry
+RETRY_BACKOFF = 0.5
+
 
 # Options not sent for filtering
 NAUTOBOT_ARG_SPEC = dict(
@@ -649,6 +706,28 @@ NAUTOBOT_ARG_SPEC = dict(
     query_params=dict(required=False, type="list", elements="str"),
     validate_certs=dict(type="raw", default=True, fallback=(env_fallback, ["NAUTOBOT_VALIDATE_CERTS"])),
     api_version=dict(type="str", required=False),
+    cache_ttl=dict(type="int", required=False, fallback=(env_fallback, ["NAUTOBOT_CACHE_TTL"])),
+    objects=dict(type="list", elements="dict", required=False),
+    bulk_chunk_size=dict(type="int", required=False, default=100),
+    use_broker=dict(type="bool", required=False, default=False, fallback=(env_fallback, ["NAUTOBOT_USE_BROKER"])),
+    resolve_workers=dict(
+        type="int", required=False, default=RESOLVE_WORKERS, fallback=(env_fallback, ["NAUTOBOT_RESOLVE_WORKERS"])
+    ),
+    snapshot_ttl=dict(type="int", required=False, fallback=(env_fallback, ["NAUTOBOT_SNAPSHOT_TTL"])),
+    coalesce_requests=dict(
+        type="bool", required=False, default=False, fallback=(env_fallback, ["NAUTOBOT_COALESCE_REQUESTS"])
+    ),
+    max_retries=dict(type="int", required=False, default=0, fallback=(env_fallback, ["NAUTOBOT_MAX_RETRIES"])),
+    retry_backoff=dict(
+        type="float", required=False, default=RETRY_BACKOFF, fallback=(env_fallback, ["NAUTOBOT_RETRY_BACKOFF"])
+    ),
+    rate_limit=dict(type="float", required=False, fallback=(env_fallback, ["NAUTOBOT_RATE_LIMIT"])),
+    timing=dict(type="bool", required=False, default=False, fallback=(env_fallback, ["NAUTOBOT_TIMING"])),
+    timing_trace=dict(type="path", required=False, fallback=(env_fallback, ["NAUTOBOT_TIMING_TRACE"])),
+    lightweight_lookups=dict(
+        type="bool", required=False, default=False, fallback=(env_fallback, ["NAUTOBOT_LIGHTWEIGHT_LOOKUPS"])
+    ),
+    async_client=dict(type="bool", required=False, default=False, fallback=(env_fallback, ["NAUTOBOT_ASYNC_CLIENT"])),
 )
 
 ID_ARG_SPEC = dict(
@@ -719,6 +798,184 @@ def sort_dict_with_lists(data):
     return data
 
 
+def _canonical(data):
+    """Return a hashable form of data, equal for data only differing by the order of lists."""
+    # Dicts and lists are tagged so an empty dict and an empty list stay different
+    if isinstance(data, dict):
+        return (dict, frozenset((k, _canonical(v)) for k, v in data.items()))
+    if isinstance(data, list):
+        # A list is the multiset of its items
+        return (list, frozenset(Counter(_canonical(v) for v in data).items()))
+    if isinstance(data, set):
+        return frozenset(data)
+    return data
+
+
+def is_equivalent(before, after):
+    """Compare two objects ignoring the order of lists, same as comparing them with sort_dict_with_lists.
+
+    Returns on the first difference found and doesn't build sorted copies. Lists are compared
+    item by item first, as they are usually in the same order, and as multisets of their items
+    otherwise.
+    """
+    if before is after:
+        return True
+    if isinstance(before, dict):
+        if not isinstance(after, dict) or len(before) != len(after):
+            return False
+        for k, v in before.items():
+            if k not in after or not is_equivalent(v, after[k]):
+                return False
+        return True
+    if isinstance(before, list):
+        if not isinstance(after, list) or len(before) != len(after):
+            return False
+        for index, (v, w) in enumerate(zip(before, after)):
+            if not is_equivalent(v, w):
+                # Only the items from the first mismatch on may be in a different order
+                return Counter(_canonical(v) for v in before[index:]) == Counter(_canonical(w) for w in after[index:])
+        return True
+    return before == after
+
+
+class NautobotBatchLookup:
+    """Look up many objects with as few list requests as possible.
+
+    Lookups are queued with `add` and resolved at once with `resolve`. Lookups of the same
+    endpoint sharing the same query params are sent as a single filtered list request per
+    chunk of BULK_LOOKUP_CHUNK_SIZE lookups, or less when the query string would exceed
+    BULK_LOOKUP_MAX_QUERY_LENGTH, e.g. `filter(name=[...], device_id=[...])`, and
+    the objects returned are matched back to each lookup locally. Lookups that can't be
+    matched locally are sent one at a time with `_nb_endpoint_get`, so the result is always
+    the same as querying each object on its own, including the error raised when more than
+    one object matches.
+    :params module (NautobotModule): Module used to query Nautobot and report errors
+    """
+
+    def __init__(self, module):
+        """Initialize the batch lookup."""
+        self.module = module
+        self._lookups = list()
+
+    def add(self, nb_endpoint, query_params, search_item):
+        """Queue a lookup.
+
+        :returns index (int): Position of the lookup in the list returned by resolve
+        :params nb_endpoint (pynautobot endpoint object): The endpoint to query
+        :params query_params (dict): Query parameters uniquely identifying the object
+        :params search_item (str): Used in the error message if more than one object matches
+        """
+        self._lookups.append((nb_endpoint, query_params, search_item))
+        return len(self._lookups) - 1
+
+    def match(self, nb_object, query_params):
+        """Compare an object returned by a list request against the query params of a lookup.
+
+        :returns match (bool|None): Whether the object matches, None if it can't be decided without
+        asking Nautobot, for example when a related object is queried by name
+        :params nb_object (pynautobot Record): Object returned by the list request
+        :params query_params (dict): Query params of the lookup
+        """
+        record = dict(nb_object)
+        for key, value in query_params.items():
+            if key in BULK_LOOKUP_UNCOMPARABLE_PARAMS or isinstance(value, (list, dict)):
+                return None
+            field = key[:-3] if key.endswith("_id") and key not in record else key
+            if field not in record:
+                return None
+
+            current = record[field]
+            if isinstance(current, dict):
+                if "id" in current:
+                    # Related objects can only be compared when queried by ID
+                    if not (isinstance(value, int) or self.module.is_valid_uuid(value)):
+                        return None
+                    current = current["id"]
+                elif "value" in current:
+                    current = current["value"]
+                else:
+                    return None
+            elif isinstance(current, list):
+                return None
+
+            if str(current) != str(value):
+                return False
+
+        return True
+
+    def _is_batchable(self, query_params):
+        return not BULK_LOOKUP_UNCOMPARABLE_PARAMS.intersection(query_params) and not any(
+            isinstance(value, (list, dict)) for value in query_params.values()
+        )
+
+    def _chunks(self, indexes, keys):
+        """Split the lookups of a group into chunks sent as a single list request each."""
+        chunk, values, length = list(), set(), 0
+        for index in indexes:
+            query_params = self._lookups[index][1]
+            # Only values not already part of the chunk lengthen the query string
+            new_values = set((key, str(query_params[key])) for key in keys) - values
+            added = sum(len(quote_plus(key)) + len(quote_plus(value)) + 2 for key, value in new_values)
+            if chunk and (len(chunk) == BULK_LOOKUP_CHUNK_SIZE or length + added > BULK_LOOKUP_MAX_QUERY_LENGTH):
+                yield chunk
+                chunk, values, length = list(), set(), 0
+                new_values = set((key, str(query_params[key])) for key in keys)
+                added = sum(len(quote_plus(key)) + len(quote_plus(value)) + 2 for key, value in new_values)
+            chunk.append(index)
+            values.update(new_values)
+            length += added
+        if chunk:
+            yield chunk
+
+    def resolve(self):
+        """Resolve every queued lookup.
+
+        :returns nb_objects (list): The object found by each lookup, in the order they were added,
+        or None if it does not exist
+        """
+        nb_objects = [None] * len(self._lookups)
+        groups = dict()
+        for index, (nb_endpoint, query_params, search_item) in enumerate(self._lookups):
+            if self._is_batchable(query_params):
+                groups.setdefault((nb_endpoint.url, tuple(sorted(query_params))), list()).append(index)
+            else:
+                nb_objects[index] = self.module._nb_endpoint_get(nb_endpoint, query_params, search_item)
+
+        for indexes in groups.values():
+            nb_endpoint = self._lookups[indexes[0]][0]
+            keys = sorted(self._lookups[indexes[0]][1])
+            for chunk in self._chunks(indexes, keys):
+                filters = {key: sorted(set(self._lookups[index][1][key] for index in chunk), key=str) for key in keys}
+                filters.update(self.module.lookup_filters)
+                try:
+                    candidates = list(nb_endpoint.filter(**filters))
+                except pynautobot.RequestError as e:
+                    self.module._handle_errors(msg=e.error)
+
+                matches_of = dict(
+                    (index, [self.match(candidate, self._lookups[index][1]) for candidate in candidates])
+                    for index in chunk
+                )
+                # Objects matching none of the lookups were returned for a reason that can't be checked
+                # locally, e.g. interfaces of another member of the virtual chassis of the device queried
+                unexplained = any(
+                    all(matches_of[index][position] is False for index in chunk) for position in range(len(candidates))
+                )
+                for index in chunk:
+                    query_params, search_item = self._lookups[index][1:]
+                    matches = matches_of[index]
+                    if None in matches or (unexplained and True not in matches):
+                        nb_objects[index] = self.module._nb_endpoint_get(nb_endpoint, query_params, search_item)
+                        continue
+
+                    found = [candidate for candidate, match in zip(candidates, matches) if match]
+                    if len(found) > 1:
+                        self.module._handle_errors(msg="More than one result returned for %s" % (search_item))
+                    nb_objects[index] = found[0] if found else None
+
+        return nb_objects
+
+
 class NautobotModule:
     """Run the Nautobot module.
 
@@ -737,14 +994,45 @@ class NautobotModule:
         self.endpoint = endpoint
         query_params = self.module.params.get("query_params")
 
-        if not HAS_PYNAUTOBOT:
-            self.module.fail_json(msg=missing_required_lib("pynautobot"), exception=PYNAUTOBOT_IMP_ERR)
+        pynautobot_imp_err = PYNAUTOBOT_IMP_ERR
+        if HAS_PYNAUTOBOT:
+            try:
+                # pynautobot is only executed when first used, so a broken install is only noticed here
+                pynautobot.api
+            except ImportError:
+                pynautobot_imp_err = traceback.format_exc()
+        if pynautobot_imp_err:
+            self.module.fail_json(msg=missing_required_lib("pynautobot"), exception=pynautobot_imp_err)
         # These should not be required after making connection to Nautobot
         url = self.module.params["url"]
         token = self.module.params["token"]
         ssl_verify = self.module.params["validate_certs"]
         api_version = self.module.params["api_version"]
 
+        # Opt-in on-disk cache of name to ID resolutions shared across tasks
+        cache_ttl = self.module.params.get("cache_ttl")
+        self.cache = NautobotFileCache(url, token, cache_ttl) if cache_ttl else None
+        self._choices_index = dict()
+        self._resolved_ids = dict()
+
+        # Opt-in snapshots of the module endpoint, only used in check mode as nothing is changed
+        snapshot_ttl = self.module.params.get("snapshot_ttl")
+        self.snapshot_cache = NautobotFileCache(url, token, snapshot_ttl) if snapshot_ttl and self.check_mode else None
+        self._snapshots = dict()
+
+        # Opt-in lookups of the smallest representation of objects, fetched in full only to be updated
+        self.lookup_filters = dict(LIGHTWEIGHT_LOOKUP_FILTERS) if self.module.params.get("lightweight_lookups") else {}
+
+        # Opt-in coalescing of the identical lookups sent by concurrent tasks
+        self.singleflight = NautobotSingleFlight(url, token) if self.module.params.get("coalesce_requests") else None
+
+        # Counters of the retries of the requests sent, when max_retries or rate_limit is set
+        self.retry_stats = None
+
+        # Opt-in record of every request sent, returned in the result and written to a trace file
+        timing = self.module.params.get("timing") or self.module.params.get("timing_trace")
+        self.timing = NautobotTiming() if timing else None
+
         # Attempt to initiate connection to Nautobot
         if client is None:
             self.nb = self._connect_api(url, token, ssl_verify, api_version)
@@ -755,13 +1043,58 @@ class NautobotModule:
         # if self.module.params.get("query_params"):
         #    self._validate_query_params(self.module.params["query_params"])
 
-        # These methods will normalize the regular data
-        cleaned_data = self._remove_arg_spec_default(module.params)
+        # In bulk mode every item of objects is validated and normalized on its own
+        self.objects = self.module.params.get("objects")
+        if self.objects is not None:
+            self.data = None
+            self.objects_params = [self._validate_object(index, item) for index, item in enumerate(self.objects)]
+            self._prefetch_ids(self.objects_params)
+            self.objects_data = [self._build_data(params, query_params, remove_keys) for params in self.objects_params]
+        else:
+            self.data = self._build_data(module.params, query_params, remove_keys)
+
+        if self.timing:
+            self.timing.phase = "run"
+
+    def _build_data(self, params, query_params, remove_keys):
+        """Normalize module parameters into the payload sent to Nautobot.
+
+        :returns data (dict): The payload with choices and IDs resolved
+        :params params (dict): Module parameters, or the parameters of one item of objects
+        :params query_params (list): User defined query_params
+        :params remove_keys (list): Keys that are not sent to Nautobot
+        """
+        cleaned_data = self._remove_arg_spec_default(params)
         norm_data = self._normalize_data(cleaned_data)
         choices_data = self._change_choices_id(self.endpoint, norm_data)
         data = self._find_ids(choices_data, query_params)
         data = self._convert_identical_keys(data)
-        self.data = self._build_payload(data, remove_keys)
+        return self._build_payload(data, remove_keys)
+
+    def _validate_object(self, index, item):
+        """Validate one item of objects against the argument spec of the module.
+
+        The connection options and state apply to the whole batch and can't be set per item,
+        required_if rules of the module are evaluated against the state of the batch.
+        :returns params (dict): Validated parameters of the item with defaults applied
+        :params index (int): Position of the item, used in error messages
+        :params item (dict): Item of objects
+        """
+        spec = {k: v for k, v in self.module.argument_spec.items() if k not in NAUTOBOT_ARG_SPEC}
+        spec["state"] = dict(type="str")
+        required_if = []
+        for rule in self.module.required_if or []:
+            requirements = [key for key in rule[2] if key in spec]
+            if rule[0] in spec and requirements:
+                required_if.append((rule[0], rule[1], requirements) + tuple(rule[3:]))
+        validator = ArgumentSpecValidator(spec, required_if=required_if)
+        result = validator.validate(dict(item, state=self.state))
+        if result.error_messages:
+            self._handle_errors(msg="objects[%s]: %s" % (index, "; ".join(result.error_messages)))
+
+        params = result.validated_parameters
+        params.pop("state")
+        return params
 
     def _build_payload(self, data, remove_keys):
         """Remove any key/value pairs that aren't relevant for interacting with Nautobot.
@@ -808,7 +1141,15 @@ class NautobotModule:
     def _connect_api(self, url, token, ssl_verify, api_version):
         try:
             nb = pynautobot.api(url, token=token, api_version=api_version, verify=ssl_verify, exclude_m2m=False)
-            self.version = nb.version
+            if self.module.params.get("use_broker"):
+                # requests is only imported once connecting to Nautobot
+                from ansible_collections.networktocode.nautobot.plugins.module_utils.broker import use_broker
+
+                use_broker(nb.http_session)
+            self._use_retries(nb.http_session, url)
+            if self.timing:
+                self.timing.use(nb.http_session)
+            self.version = self._get_version(nb, url, api_version)
             return nb
         except pynautobot.RequestError as e:
             self._handle_errors(msg=e.error)
@@ -818,9 +1159,83 @@ class NautobotModule:
         except Exception:
             self.module.fail_json(msg="Failed to establish connection to Nautobot API")
 
+    def _use_retries(self, http_session, url):
+        """Retry the requests Nautobot couldn't handle and limit their rate, as set by the user."""
+        max_retries = self.module.params.get("max_retries") or 0
+        retry_backoff = self.module.params.get("retry_backoff")
+        rate_limit = self.module.params.get("rate_limit")
+        if max_retries < 0:
+            self._handle_errors(msg="max_retries must be greater than or equal to 0")
+        if retry_backoff is not None and retry_backoff < 0:
+            self._handle_errors(msg="retry_backoff must be greater than or equal to 0")
+        if rate_limit is not None and rate_limit <= 0:
+            self._handle_errors(msg="rate_limit must be greater than 0")
+        if not max_retries and not rate_limit:
+            return
+
+        from ansible_collections.networktocode.nautobot.plugins.module_utils.retry import (
+            NautobotRateLimiter,
+            use_retries,
+        )
+
+        limiter = NautobotRateLimiter(url, rate_limit) if rate_limit else None
+        backoff = RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self.retry_stats = use_retries(http_session, max_retries, backoff, limiter)
+
+    def _instrumentation(self):
+        """Return the retry counters and the timing summary to add to the result, if enabled.
+
+        The timing trace file is written at the same time, as the module is about to exit.
+        """
+        result = dict()
+        if self.retry_stats is not None:
+            result["nautobot_retries"] = self.retry_stats
+        if self.timing:
+            result["_nautobot_timing"] = self.timing.summary()
+            trace = self.module.params.get("timing_trace")
+            if trace:
+                try:
+                    self.timing.write_trace(trace, module=getattr(self.module, "_name", None), endpoint=self.endpoint)
+                except OSError as e:
+                    self.module.warn("Failed to write the timing trace to %s: %s" % (trace, e))
+        return result
+
+    def _exit_json(self):
+        """Exit the module with self.result, adding the retry counters and timing summary when enabled."""
+        self.result.update(self._instrumentation())
+        self.module.exit_json(**self.result)
+
+    def _get_version(self, nb, url, api_version):
+        """Return the API version of Nautobot, probing it as rarely as possible.
+
+        An explicitly set api_version is used as is. Otherwise, when `cache_ttl` is set, the version
+        reported by Nautobot is cached on disk per URL for as long, up to VERSION_CACHE_TTL seconds,
+        so consecutive tasks don't each issue their own request to the API root.
+        :returns version (str): The API version, ex. 2.4
+        :params nb (pynautobot.api): The API client
+        :params url (str): URL of the Nautobot instance
+        :params api_version (str): api_version set by the user
+        """
+        if api_version:
+            return api_version
+
+        cache_ttl = self.module.params.get("cache_ttl")
+        if not cache_ttl:
+            return nb.version
+
+        # The version doesn't depend on the permissions of the token
+        version_cache = NautobotFileCache(url, "", min(cache_ttl, VERSION_CACHE_TTL))
+        version = version_cache.get("version", url.rstrip("/"))
+        if version is None:
+            version = nb.version
+            version_cache.set("version", url.rstrip("/"), version)
+        return version
+
     def _nb_endpoint_get(self, nb_endpoint, query_params, search_item):
         try:
-            response = nb_endpoint.get(**query_params)
+            answered, response = self._snapshot_get(nb_endpoint, query_params)
+            if not answered:
+                response = self._endpoint_get(nb_endpoint, query_params)
         except pynautobot.RequestError as e:
             self._handle_errors(msg=e.error)
         except ValueError:
@@ -828,6 +1243,142 @@ class NautobotModule:
 
         return response
 
+    def _endpoint_get(self, nb_endpoint, query_params):
+        """Get the single object matching query_params, like `Endpoint.get`.
+
+        When `coalesce_requests` is set, a request sent by another task at the same time with the
+        same query params is waited for and its response is reused instead of sending this one.
+        With `lightweight_lookups`, the object is fetched without its many-to-many fields and
+        with related objects given by ID only.
+        """
+        query_params = dict(query_params, **self.lookup_filters)
+        if self.singleflight is None:
+            return nb_endpoint.get(**query_params)
+
+        def get():
+            nb_object = nb_endpoint.get(**query_params)
+            return dict(nb_object) if nb_object else None
+
+        values = self.singleflight.do((nb_endpoint.url, query_params), get)
+        if not values:
+            return None
+        return nb_endpoint.return_obj(values, nb_endpoint.api, nb_endpoint)
+
+    def _snapshot_get(self, nb_endpoint, query_params):
+        """Look up an object of the module endpoint in a snapshot of the endpoint when `snapshot_ttl` is set.
+
+        The snapshot holds every object of the endpoint sharing the related objects queried by ID,
+        e.g. every interface of the device, downloaded with a single list request and cached on
+        disk so the tasks managing the other objects don't send any request to find them.
+        :returns tuple(answered, nb_object): whether the snapshot can answer the query and the
+        object found, None if it does not exist
+        :params nb_endpoint (pynautobot endpoint object): The endpoint to query
+        :params query_params (dict): Query parameters uniquely identifying the object
+        """
+        if (
+            self.snapshot_cache is None
+            or nb_endpoint.name.replace("-", "_") != self.endpoint
+            or "id" in query_params
+            or BULK_LOOKUP_UNCOMPARABLE_PARAMS.intersection(query_params)
+        ):
+            return False, None
+
+        filters = {
+            key: value
+            for key, value in query_params.items()
+            if (isinstance(value, int) and not isinstance(value, bool)) or self.is_valid_uuid(value)
+        }
+        key = NautobotFileCache.make_key(filters)
+        if key not in self._snapshots:
+            match = NautobotBatchLookup(self).match
+            self._snapshots[key] = NautobotSnapshot.load(nb_endpoint, filters, match, self.snapshot_cache)
+
+        answered, record = self._snapshots[key].get(query_params)
+        if not record:
+            return answered, None
+        return True, nb_endpoint.return_obj(record, nb_endpoint.api, nb_endpoint)
+
+    def _id_cache_key(self, nb_endpoint, query_params):
+        """Return the namespace and key under which the ID matching query_params is cached."""
+        return "ids.%s" % nb_endpoint.name.replace("-", "_"), NautobotFileCache.make_key(nb_endpoint.url, query_params)
+
+    def _prefetch_ids(self, objects_params):
+        """Resolve the references of every item of objects in batches.
+
+        References given by name, e.g. `device: switch1` or tags, are looked up with one list
+        request per endpoint and remembered so `_find_ids` doesn't query them one at a time.
+        References that are not found are left to `_find_ids` to report.
+        :params objects_params (list): Validated parameters of each item of objects
+        """
+        # These are resolved with _build_query_params by _find_ids
+        skip_keys = ("termination_a", "termination_b", "lag", "rear_port", "rear_port_template")
+        lookup = NautobotBatchLookup(self)
+        pending = dict()
+        for params in objects_params:
+            for k, v in params.items():
+                if k not in CONVERT_TO_ID or k in skip_keys:
+                    continue
+                # Same query params as _find_ids builds for names and lists of names
+                query_type = "name" if k == "tags" else QUERY_TYPES.get(k, "q")
+                for value in v if isinstance(v, list) else [v]:
+                    if not isinstance(value, str) or self.is_valid_uuid(value):
+                        continue
+                    endpoint = CONVERT_TO_ID[k]
+                    nb_endpoint = getattr(getattr(self.nb, self._find_app(endpoint)), endpoint)
+                    query_params = {query_type: value}
+                    cache_key = self._id_cache_key(nb_endpoint, query_params)
+                    if cache_key in pending or (self.cache and self.cache.get(*cache_key) is not None):
+                        continue
+                    pending[cache_key] = lookup.add(nb_endpoint, query_params, k)
+
+        if not pending:
+            return
+
+        nb_objects = lookup.resolve()
+        for (namespace, cache_key), index in pending.items():
+            if nb_objects[index]:
+                self._resolved_ids.setdefault(namespace, dict())[cache_key] = nb_objects[index].id
+
+    def _resolve_id(self, nb_endpoint, query_params, search_item):
+        """Resolve the ID of the single object matching query_params.
+
+        Successful resolutions are kept for the lifetime of the module so items of objects
+        referencing the same object only resolve it once. When `cache_ttl` is set, the on-disk
+        ID cache is consulted before querying Nautobot and successful resolutions are stored in it.
+        :returns id (str|int|None): The ID of the object or None if it does not exist
+        :params nb_endpoint (pynautobot endpoint object): The endpoint to query
+        :params query_params (dict): Query parameters uniquely identifying the object
+        :params search_item (str): Used in the error message if more than one object matches
+        """
+        namespace, cache_key = self._id_cache_key(nb_endpoint, query_params)
+        resolved_ids = self._resolved_ids.setdefault(namespace, dict())
+        if cache_key in resolved_ids:
+            return resolved_ids[cache_key]
+
+        if self.cache:
+            cached_id = self.cache.get(namespace, cache_key)
+            if cached_id is not None:
+                resolved_ids[cache_key] = cached_id
+                return cached_id
+
+        result = self._nb_endpoint_get(nb_endpoint, query_params, search_item)
+        if not result:
+            return None
+
+        resolved_ids[cache_key] = result.id
+        if self.cache:
+            self.cache.set(namespace, cache_key, result.id)
+        return result.id
+
+    def _invalidate_id_cache(self):
+        """Drop cached ID resolutions of the module endpoint after it has been changed."""
+        if self.check_mode:
+            return
+
+        self._resolved_ids.pop("ids.%s" % self.endpoint, None)
+        if self.cache:
+            self.cache.invalidate("ids.%s" % self.endpoint)
+
     def _validate_query_params(self, query_params):
         """
         Validate query_params that are passed in by users to make sure
@@ -841,6 +1392,8 @@ class NautobotModule:
         # Fetch the OpenAPI spec to perform validation against
         base_url = self.nb.base_url
         junk, endpoint_url = nb_endpoint.url.split(base_url)
+        from ansible.module_utils.urls import open_url
+
         response = open_url(base_url + "/docs/?format=openapi")
         try:
             raw_data = to_text(response.read(), errors="surrogate_or_strict")
@@ -868,7 +1421,7 @@ class NautobotModule:
 
         :params msg (str): Message indicating why there is no change
         """
-        self.module.fail_json(msg=msg, changed=False)
+        self.module.fail_json(msg=msg, changed=False, **self._instrumentation())
 
     def _build_diff(self, before=None, after=None):
         """Builds diff of before and after changes."""
@@ -937,11 +1490,11 @@ class NautobotModule:
         nb_endpoint = getattr(nb_app, endpoint)
 
         query_params = {QUERY_TYPES.get(match): data[match]}
-        result = self._nb_endpoint_get(nb_endpoint, query_params, match)
+        result_id = self._resolve_id(nb_endpoint, query_params, match)
 
-        if result:
+        if result_id:
             # Inherited django models(admin groups) that are not overloaded are integers, force the integer to string.
-            return str(result.id)
+            return str(result_id)
         else:
             return data
 
@@ -973,9 +1526,9 @@ class NautobotModule:
             query_params = ALLOWED_QUERY_PARAMS.get(parent)
 
         if child:
-            matches = query_params.intersection(set(child.keys()))
+            matches = query_params.intersection(child)
         else:
-            matches = query_params.intersection(set(module_data.keys()))
+            matches = query_params.intersection(module_data)
 
         for match in matches:
             if match in QUERY_PARAMS_IDS and parent not in IGNORE_ADDING_IDS:
@@ -1039,30 +1592,60 @@ class NautobotModule:
         query_dict = self._convert_identical_keys(query_dict)
         return query_dict
 
-    def _fetch_choice_value(self, search, endpoint):
+    def _get_choices_index(self, endpoint):
+        """Fetch the choices of an endpoint and index them for lookups.
+
+        The index is kept for the lifetime of the module so list values and LAG lookups only
+        fetch the choices once. When `cache_ttl` is set, the raw choices are also cached on disk
+        per Nautobot version so subsequent tasks skip the OPTIONS request entirely.
+        :returns tuple(index, valid_choices): Mapping of lowercase display and value to the choice
+        value, and the list of valid choice values in the order returned by Nautobot
+        :params endpoint (str): The endpoint to fetch the choices of
+        """
+        if endpoint in self._choices_index:
+            return self._choices_index[endpoint]
+
         app = self._find_app(endpoint)
         nb_app = getattr(self.nb, app)
         nb_endpoint = getattr(nb_app, endpoint)
-        try:
-            endpoint_choices = nb_endpoint.choices()
-        except ValueError:
-            self._handle_errors(
-                msg="Failed to fetch endpoint choices to validate against. This requires a write-enabled token. Make "
-                "sure the token is write-enabled. If looking to fetch only information, use either the inventory or lookup plugin."
-            )
 
-        choices = list(chain.from_iterable(endpoint_choices.values()))
+        endpoint_choices = None
+        if self.cache:
+            cache_key = self.cache.make_key(self.version, nb_endpoint.url)
+            endpoint_choices = self.cache.get("choices", cache_key)
+
+        if endpoint_choices is None:
+            try:
+                endpoint_choices = nb_endpoint.choices()
+            except ValueError:
+                self._handle_errors(
+                    msg="Failed to fetch endpoint choices to validate against. This requires a write-enabled token. Make "
+                    "sure the token is write-enabled. If looking to fetch only information, use either the inventory or lookup plugin."
+                )
+            if self.cache:
+                self.cache.set("choices", cache_key, endpoint_choices)
+
+        index = dict()
+        valid_choices = list()
+        for item in chain.from_iterable(endpoint_choices.values()):
+            # First match wins, same as scanning the choices in order
+            index.setdefault(item["display"].lower(), item["value"])
+            index.setdefault(item["value"], item["value"])
+            valid_choices.append(item["value"])
+
+        self._choices_index[endpoint] = (index, valid_choices)
+        return self._choices_index[endpoint]
+
+    def _fetch_choice_value(self, search, endpoint):
+        index, valid_choices = self._get_choices_index(endpoint)
 
         search_term = search.lower() if isinstance(search, str) else search
-        for item in choices:
-            if item["display"].lower() == search_term:
-                return item["value"]
-            if item["value"] == search_term:
-                return item["value"]
-        valid_choices = [choice["value"] for choice in choices]
-        self._handle_errors(
-            msg=f"{search} was not found as a valid choice for {endpoint}, valid choices are: {valid_choices}"
-        )
+        try:
+            return index[search_term]
+        except (KeyError, TypeError):
+            self._handle_errors(
+                msg=f"{search} was not found as a valid choice for {endpoint}, valid choices are: {valid_choices}"
+            )
 
     def _change_choices_id(self, endpoint, data):
         """Change data that is static and under _choices for the application.
@@ -1094,10 +1677,7 @@ class NautobotModule:
         :returns nb_app (str): The application the endpoint lives under
         :params endpoint (str): The endpoint requiring resolution to application
         """
-        for k, v in API_APPS_ENDPOINTS.items():
-            if endpoint in v:
-                nb_app = k
-        return nb_app
+        return ENDPOINT_TO_APP[endpoint]
 
     def _find_ids(self, data, user_query_params):
         """Find the IDs of all user specified data if resolvable.
@@ -1105,6 +1685,65 @@ class NautobotModule:
         :returns data (dict): Returns the updated dict with the IDs of user specified data
         :params data (dict): User defined data passed into the module
         """
+        lookups = self._build_id_lookups(data, user_query_params)
+        missing = self._fetch_ids(lookups)
+
+        for k, v, queries in lookups:
+            if isinstance(v, list):
+                id_list = list()
+                for query in queries:
+                    # If user passes in an integer or UUID, it is added as is to id_list
+                    if not isinstance(query, tuple):
+                        id_list.append(query)
+                        continue
+                    nb_endpoint, query_params, list_item = query
+                    key = self._id_cache_key(nb_endpoint, query_params)
+                    if key in missing:
+                        query_id = self._report_failed_lookup(missing[key], k)
+                    else:
+                        query_id = self._resolve_id(nb_endpoint, query_params, k)
+                    if query_id:
+                        id_list.append(query_id)
+                    else:
+                        self._handle_errors(msg="%s not found" % (list_item))
+                data[k] = id_list
+            else:
+                nb_endpoint, query_params, search = queries[0]
+                key = self._id_cache_key(nb_endpoint, query_params)
+                if key in missing:
+                    query_id = self._report_failed_lookup(missing[key], k)
+                else:
+                    query_id = self._resolve_id(nb_endpoint, query_params, k)
+                if query_id:
+                    data[k] = query_id
+                else:
+                    self._handle_errors(msg="Could not resolve id of %s: %s" % (k, v))
+
+        return data
+
+    def _report_failed_lookup(self, error, search_item):
+        """Report the error of a lookup sent by `_fetch_ids` as `_nb_endpoint_get` does, without sending it again.
+
+        :returns None: When the lookup didn't fail, and so the object does not exist
+        :params error (Exception|None): The exception raised by the lookup
+        :params search_item (str): Used in the error message if more than one object matches
+        """
+        if isinstance(error, pynautobot.RequestError):
+            self._handle_errors(msg=error.error)
+        elif isinstance(error, ValueError):
+            self._handle_errors(msg="More than one result returned for %s" % (search_item))
+        elif error is not None:
+            raise error
+        return None
+
+    def _build_id_lookups(self, data, user_query_params):
+        """Build the queries resolving the IDs of user specified data, without sending them.
+
+        :returns lookups (list): (key, value, queries) of every key to resolve, where queries is a list of
+            (nb_endpoint, query_params, search) tuples, along with the IDs given as is for list values
+        :params data (dict): User defined data passed into the module
+        """
+        lookups = list()
         for k, v in data.items():
             if k in CONVERT_TO_ID:
                 # Do not attempt to resolve if already ID/UUID is provided
@@ -1127,9 +1766,9 @@ class NautobotModule:
                         nb_app = getattr(self.nb, "virtualization")
                         nb_endpoint = getattr(nb_app, endpoint)
                     query_params = self._build_query_params(k, data, child=v)
-                    query_id = self._nb_endpoint_get(nb_endpoint, query_params, k)
+                    queries = [(nb_endpoint, query_params, search)]
                 elif isinstance(v, list):
-                    id_list = list()
+                    queries = list()
                     for list_item in v:
                         if k == "tags" and isinstance(list_item, str) and not self.is_valid_uuid(list_item):
                             temp_dict = {"name": list_item}
@@ -1139,18 +1778,13 @@ class NautobotModule:
                         # If user passes in an integer, add to ID list to id_list as user
                         # should have passed in a tag ID
                         elif isinstance(list_item, int) or self.is_valid_uuid(list_item):
-                            id_list.append(list_item)
+                            queries.append(list_item)
                             continue
                         else:
                             # Reminder: this get checks the QUERY_TYPES constant above, if the item is not in the list
                             # of approved query types, then it defaults to a q search
                             temp_dict = {QUERY_TYPES.get(k, "q"): list_item}
-
-                        query_id = self._nb_endpoint_get(nb_endpoint, temp_dict, k)
-                        if query_id:
-                            id_list.append(query_id.id)
-                        else:
-                            self._handle_errors(msg="%s not found" % (list_item))
+                        queries.append((nb_endpoint, temp_dict, list_item))
                 else:
                     if k in ["lag", "rear_port", "rear_port_template"]:
                         query_params = self._build_query_params(k, data, user_query_params)
@@ -1158,16 +1792,136 @@ class NautobotModule:
                         # Reminder: this get checks the QUERY_TYPES constant above, if the item is not in the list
                         # of approved query types, then it defaults to a q search
                         query_params = {QUERY_TYPES.get(k, "q"): search}
-                    query_id = self._nb_endpoint_get(nb_endpoint, query_params, k)
+                    queries = [(nb_endpoint, query_params, search)]
 
-                if isinstance(v, list):
-                    data[k] = id_list
-                elif query_id:
-                    data[k] = query_id.id
+                lookups.append((k, v, queries))
+
+        return lookups
+
+    def _fetch_ids(self, lookups):
+        """Send the queries of lookups, at once where possible.
+
+        Items of list values, e.g. tags, are looked up together with as few list requests as
+        possible, while the other queries are sent concurrently using up to `resolve_workers`
+        threads. The IDs found are remembered for `_resolve_id`. Queries failing or not matching
+        a single object are returned, so their errors are still reported from the main thread,
+        in the order of the module data and with the same messages, without sending them again.
+        :returns missing (dict): The exception of each failed query, or None for the objects
+            known not to exist, by cache key
+        :params lookups (list): Lookups built by `_build_id_lookups`
+        """
+        workers = self.module.params.get("resolve_workers") or RESOLVE_WORKERS
+        if workers < 1:
+            self._handle_errors(msg="resolve_workers must be greater than 0")
+
+        batch_lookup = NautobotBatchLookup(self)
+        batched = dict()
+        pending = dict()
+        for k, v, queries in lookups:
+            queries = [query for query in queries if isinstance(query, tuple)]
+            for nb_endpoint, query_params, search in queries:
+                namespace, cache_key = self._id_cache_key(nb_endpoint, query_params)
+                resolved_ids = self._resolved_ids.setdefault(namespace, dict())
+                if (namespace, cache_key) in pending or (namespace, cache_key) in batched or cache_key in resolved_ids:
+                    continue
+                cached_id = self.cache.get(namespace, cache_key) if self.cache else None
+                if cached_id is not None:
+                    resolved_ids[cache_key] = cached_id
+                elif isinstance(v, list) and len(queries) > 1 and batch_lookup._is_batchable(query_params):
+                    batched[(namespace, cache_key)] = batch_lookup.add(nb_endpoint, query_params, k)
                 else:
-                    self._handle_errors(msg="Could not resolve id of %s: %s" % (k, v))
+                    pending[(namespace, cache_key)] = (nb_endpoint, query_params)
 
-        return data
+        def get(nb_endpoint, query_params):
+            try:
+                return self._endpoint_get(nb_endpoint, query_params)
+            except Exception as e:  # pylint: disable=broad-except
+                return e
+
+        found = dict()
+        missing = dict()
+        # A single query gains nothing from a thread
+        concurrent = workers > 1 and len(pending) > 1
+        if concurrent and self.module.params.get("async_client"):
+            fetched = self._fetch_async(pending, workers)
+            if fetched is not None:
+                found.update(fetched)
+                pending = dict()
+                concurrent = False
+        with ThreadPoolExecutor(max_workers=min(workers, len(pending)) if concurrent else 1) as executor:
+            futures = dict((key, executor.submit(get, *query)) for key, query in pending.items()) if concurrent else {}
+            # The list items are looked up while the other queries are in flight
+            if batched:
+                nb_objects = batch_lookup.resolve()
+                for key, index in batched.items():
+                    if nb_objects[index]:
+                        found[key] = nb_objects[index]
+                    else:
+                        missing[key] = None
+
+        for key, future in futures.items():
+            found[key] = future.result()
+
+        for (namespace, cache_key), nb_object in found.items():
+            if nb_object is None or isinstance(nb_object, Exception):
+                missing[(namespace, cache_key)] = nb_object
+                continue
+            self._resolved_ids[namespace][cache_key] = nb_object.id
+            if self.cache:
+                self.cache.set(namespace, cache_key, nb_object.id)
+
+        return missing
+
+    def _fetch_async(self, pending, workers):
+        """Send the queries of pending at once with the asyncio client, over up to `workers` connections.
+
+        :returns found (dict): The object found for each key of pending, None when it doesn't
+        exist or the exception of the query when it failed, or None when the client itself failed,
+        e.g. because of an invalid CA bundle, so the queries are sent with the threads instead
+        :params pending (dict): The endpoint and query params of each query, by cache key
+        :params workers (int): Number of connections to Nautobot
+        """
+        import asyncio
+
+        async def get(api, nb_endpoint, query_params):
+            try:
+                return await api.endpoint(nb_endpoint).get(**dict(query_params, **self.lookup_filters))
+            except Exception as e:  # pylint: disable=broad-except
+                return e
+
+        async def fetch(api):
+            nb_objects = await asyncio.gather(*[get(api, *query) for query in pending.values()])
+            return dict(zip(pending, nb_objects))
+
+        try:
+            return self._run_async(fetch, workers)
+        except Exception as e:  # pylint: disable=broad-except
+            self.module.warn("The asyncio client failed, looking up objects with threads instead: %s" % (e))
+            return None
+
+    def _run_async(self, main, workers):
+        """Run the coroutine function main with an asyncio client of Nautobot and return its result.
+
+        :params main (coroutine function): Called with the NautobotAsyncApi client
+        :params workers (int): Number of connections to Nautobot
+        """
+        import asyncio
+
+        from ansible_collections.networktocode.nautobot.plugins.module_utils.async_client import (
+            AIOHTTP_IMP_ERR,
+            HAS_AIOHTTP,
+            NautobotAsyncApi,
+        )
+
+        if not HAS_AIOHTTP:
+            self.module.fail_json(msg=missing_required_lib("aiohttp"), exception=AIOHTTP_IMP_ERR)
+
+        async def run():
+            on_response = self.timing.record if self.timing else None
+            async with NautobotAsyncApi(self.nb, pool_size=workers, on_response=on_response) as api:
+                return await main(api)
+
+        return asyncio.run(run())
 
     def _normalize_data(self, data):
         """Normalize module data to formats accepted by Nautobot searches.
@@ -1212,6 +1966,7 @@ class NautobotModule:
                     nb_obj = nb_endpoint.create(**data)
             except pynautobot.RequestError as e:
                 self._handle_errors(msg=e.error)
+            self._invalidate_id_cache()
 
         diff = self._build_diff(before={"state": "absent"}, after={"state": "present"})
         return nb_obj, diff
@@ -1226,16 +1981,20 @@ class NautobotModule:
                 self.nb_object.delete()
             except pynautobot.RequestError as e:
                 self._handle_errors(msg=e.error)
+            self._invalidate_id_cache()
 
         diff = self._build_diff(before={"state": "present"}, after={"state": "absent"})
         return diff
 
-    def _update_object(self, data):
-        """Update a Nautobot object.
-        :returns tuple(serialized_nb_obj, diff): tuple of the serialized updated
-        Nautobot object and the Ansible diff.
+    def _get_update_diff(self, nb_object, data):
+        """Compare an existing Nautobot object with the data it should be updated with.
+
+        :returns tuple(serialized_nb_obj, updated_obj, diff): the serialized existing object,
+        the serialized object once updated and the Ansible diff, which is None if nothing changes
+        :params nb_object (pynautobot Record): The existing Nautobot object
+        :params data (dict): User defined data passed into the module
         """
-        serialized_nb_obj = self.nb_object.serialize()
+        serialized_nb_obj = nb_object.serialize()
         if "custom_fields" in serialized_nb_obj:
             custom_fields = serialized_nb_obj.get("custom_fields", {})
             shared_keys = custom_fields.keys() & data.get("custom_fields", {}).keys()
@@ -1248,29 +2007,78 @@ class NautobotModule:
             serialized_nb_obj["tags"] = set(serialized_nb_obj["tags"])
             updated_obj["tags"] = set(data["tags"])
 
-        if sort_dict_with_lists(serialized_nb_obj) == sort_dict_with_lists(updated_obj):
-            return serialized_nb_obj, None
-        else:
-            data_before, data_after = {}, {}
-            for key in data:
-                try:
-                    if serialized_nb_obj[key] != updated_obj[key]:
-                        data_before[key] = serialized_nb_obj[key]
-                        data_after[key] = updated_obj[key]
-                except KeyError:
-                    if key == "form_factor":
-                        msg = "form_factor is not valid. Please use the type key instead."
-                    else:
-                        msg = "%s does not exist on existing object. Check to make sure valid field." % (key)
+        # Only the keys given by the user can change, the rest of the object isn't compared
+        data_before, data_after = {}, {}
+        for key in data:
+            if key not in serialized_nb_obj:
+                if key == "form_factor":
+                    msg = "form_factor is not valid. Please use the type key instead."
+                else:
+                    msg = "%s does not exist on existing object. Check to make sure valid field." % (key)
+
+                self._handle_errors(msg=msg)
+            elif not is_equivalent(serialized_nb_obj[key], updated_obj[key]):
+                data_before[key] = serialized_nb_obj[key]
+                data_after[key] = updated_obj[key]
+
+        if not data_after:
+            return serialized_nb_obj, updated_obj, None
+
+        return serialized_nb_obj, updated_obj, self._build_diff(before=data_before, after=data_after)
+
+    def _patch_object(self, nb_object, changes):
+        """Send the changed fields of a Nautobot object in a PATCH request.
+
+        Unlike `Record.update`, the object isn't serialized again to find what changed and the
+        object returned by Nautobot is used as its new state.
+        :returns serialized_nb_obj (dict): The serialized object returned by Nautobot
+        :params nb_object (pynautobot Record): The existing Nautobot object
+        :params changes (dict): The fields to update and their new value
+        """
+        request = pynautobot.core.query.Request(
+            key=nb_object.id,
+            base=nb_object.endpoint.url,
+            token=nb_object.api.token,
+            http_session=nb_object.api.http_session,
+            api_version=nb_object.api.api_version,
+            filters=nb_object.api.default_filters,
+        )
+        try:
+            response = request.patch(changes)
+        except pynautobot.RequestError as e:
+            self._handle_errors(msg=e.error)
+
+        return nb_object.__class__(response, nb_object.api, nb_object.endpoint).serialize()
+
+    def _fetch_full_object(self, nb_object):
+        """Fetch again an object looked up with `lightweight_lookups`, with all its fields.
+
+        :returns nb_object (pynautobot Record): The object with its many-to-many fields
+        :params nb_object (pynautobot Record): The object returned by a lightweight lookup
+        """
+        try:
+            return nb_object.endpoint.get(nb_object.id)
+        except pynautobot.RequestError as e:
+            self._handle_errors(msg=e.error)
+
+    def _update_object(self, data):
+        """Update a Nautobot object.
+        :returns tuple(serialized_nb_obj, diff): tuple of the serialized updated
+        Nautobot object and the Ansible diff.
+        """
+        if self.lookup_filters and not set(data).issubset(dict(self.nb_object)):
+            # Many-to-many fields, e.g. tags, are left out of lightweight lookups
+            self.nb_object = self._fetch_full_object(self.nb_object)
 
-                    self._handle_errors(msg=msg)
+        serialized_nb_obj, updated_obj, diff = self._get_update_diff(self.nb_object, data)
+        if diff is None:
+            return serialized_nb_obj, None
 
-            if not self.check_mode:
-                self.nb_object.update(data)
-                updated_obj = self.nb_object.serialize()
+        if not self.check_mode:
+            updated_obj = self._patch_object(self.nb_object, {key: data[key] for key in diff["after"]})
+            self._invalidate_id_cache()
 
-            diff = self._build_diff(before=data_before, after=data_after)
-            return updated_obj, diff
+        return updated_obj, diff
 
     def _ensure_object_exists(self, nb_endpoint, endpoint_name, name, data):
         """Ensure an object exists or is updated.
@@ -1314,6 +2122,200 @@ class NautobotModule:
         else:
             self.result["msg"] = "%s %s already absent" % (endpoint_name, name)
 
+    def _get_object_name(self, data):
+        """Return the name used to identify an item of objects in messages."""
+        for key in ("name", "model", "address", "prefix", "cid", "version", "username", "display", "label", "value"):
+            if data.get(key):
+                return data[key]
+        return data.get("id")
+
+    def _bulk_get_existing(self, nb_endpoint, queries, names):
+        """Find the existing object of every item of objects.
+
+        :returns nb_objects (list): The existing object of each item or None if it does not exist
+        :params nb_endpoint (pynautobot endpoint object): The endpoint to query
+        :params queries (list): Query params of each item
+        :params names (list): Name of each item, used in error messages
+        """
+        lookup = NautobotBatchLookup(self)
+        for query, name in zip(queries, names):
+            lookup.add(nb_endpoint, query, name)
+        return lookup.resolve()
+
+    def _check_existing_object(self, nb_object, data, params):
+        """Check the existing object found for data before it is updated or deleted.
+
+        Does nothing by default, endpoints needing it adjust data or fail here, in single and bulk mode.
+        :params nb_object (pynautobot Record): The existing object
+        :params data (dict): Payload of the object, may be modified
+        :params params (dict): Module parameters, or parameters of the item of objects
+        """
+
+    def _send_bulk(self, nb_endpoint, batches):
+        """Send the bulk requests of batches one after the other, stopping at the first failure.
+
+        :returns outcomes (list): The objects returned by each request sent, True for a deletion,
+        or the `pynautobot.RequestError` of the failed request
+        :params nb_endpoint (pynautobot endpoint object): The endpoint of the module
+        :params batches (list): The operation, item indexes and payload of each request
+        """
+        outcomes = list()
+        for operation, chunk, payload in batches:
+            try:
+                outcomes.append(getattr(nb_endpoint, operation)(payload))
+            except pynautobot.RequestError as e:
+                outcomes.append(e)
+                break
+        return outcomes
+
+    def _send_bulk_async(self, nb_endpoint, batches):
+        """Send the bulk requests of batches with the asyncio client, over up to `resolve_workers` connections.
+
+        The requests of an operation are sent at once, and the operations one after the other,
+        stopping at the first one with a failed request.
+        :returns outcomes (list): As `_send_bulk`, with the exception of each failed request, or
+        None when the client itself failed, so the requests are sent without it instead
+        :params nb_endpoint (pynautobot endpoint object): The endpoint of the module
+        :params batches (list): The operation, item indexes and payload of each request
+        """
+        import asyncio
+
+        async def send(api):
+            endpoint = api.endpoint(nb_endpoint)
+            outcomes = list()
+            for operation in ("create", "update", "delete"):
+                sent = [getattr(endpoint, op)(payload) for op, chunk, payload in batches if op == operation]
+                outcomes.extend(await asyncio.gather(*sent, return_exceptions=True))
+                if any(isinstance(outcome, Exception) for outcome in outcomes):
+                    break
+            return outcomes
+
+        try:
+            return self._run_async(send, max(self.module.params.get("resolve_workers") or RESOLVE_WORKERS, 1))
+        except Exception as e:  # pylint: disable=broad-except
+            self.module.warn("The asyncio client failed, sending the bulk requests without it: %s" % (e))
+            return None
+
+    def _run_bulk(self, nb_endpoint, endpoint_name):
+        """Ensure every item of objects is present or absent using the bulk API of the endpoint.
+
+        The existing objects are fetched with as few list requests as possible, then the objects to
+        create, update and delete are sent with bulk POST, PATCH and DELETE requests of at most
+        `bulk_chunk_size` items. Exits the module with the result of every item.
+        :params nb_endpoint (pynautobot endpoint object): The endpoint of the module
+        :params endpoint_name (str): Endpoint name used in messages and results. ex. interface
+        """
+        user_query_params = self.module.params.get("query_params")
+        chunk_size = self.module.params.get("bulk_chunk_size") or 100
+        if self.state not in ("present", "absent"):
+            self._handle_errors(msg="objects can only be used with state present or absent")
+        if self.endpoint == "cables" or not (user_query_params or ALLOWED_QUERY_PARAMS.get(endpoint_name)):
+            self._handle_errors(msg="objects is not supported for %s" % (endpoint_name))
+        if chunk_size < 1:
+            self._handle_errors(msg="bulk_chunk_size must be greater than 0")
+
+        names = [self._get_object_name(data) for data in self.objects_data]
+        queries = [self._build_query_params(endpoint_name, data, user_query_params) for data in self.objects_data]
+        nb_objects = self._bulk_get_existing(nb_endpoint, queries, names)
+
+        results, diffs = list(), list()
+        to_create, to_update, to_delete = list(), list(), list()
+        changes = dict()
+        for index, (data, nb_object, name) in enumerate(zip(self.objects_data, nb_objects, names)):
+            result = {"changed": False}
+            diff = None
+            if nb_object:
+                self._check_existing_object(nb_object, data, self.objects_params[index])
+            if self.state == "present" and not nb_object:
+                result["msg"] = "%s %s created" % (endpoint_name, name)
+                result[endpoint_name] = data
+                diff = self._build_diff(before={"state": "absent"}, after={"state": "present"})
+                to_create.append(index)
+            elif self.state == "present":
+                if self.endpoint == "ip_addresses":
+                    # namespace is only used for querying in ip_address endpoint, don't pass it to update methods.
+                    data.pop("namespace", None)
+                if self.lookup_filters and not set(data).issubset(dict(nb_object)):
+                    # Many-to-many fields, e.g. tags, are left out of lightweight lookups
+                    nb_object = nb_objects[index] = self._fetch_full_object(nb_object)
+                serialized_nb_obj, updated_obj, diff = self._get_update_diff(nb_object, data)
+                if diff:
+                    result["msg"] = "%s %s updated" % (endpoint_name, name)
+                    result[endpoint_name] = updated_obj
+                    # Only the changed fields are sent
+                    changes[index] = {key: data[key] for key in diff["after"]}
+                    to_update.append(index)
+                else:
+                    result["msg"] = "%s %s already exists" % (endpoint_name, name)
+                    result[endpoint_name] = serialized_nb_obj
+            elif nb_object:
+                result["msg"] = "%s %s deleted" % (endpoint_name, name)
+                result[endpoint_name] = nb_object.serialize()
+                diff = self._build_diff(before={"state": "present"}, after={"state": "absent"})
+                to_delete.append(index)
+            else:
+                result["msg"] = "%s %s already absent" % (endpoint_name, name)
+                result[endpoint_name] = None
+
+            if diff:
+                result["changed"] = True
+                diffs.append(dict(diff, before_header=str(name), after_header=str(name)))
+            results.append(result)
+
+        if not self.check_mode:
+            batches = list()
+            for operation, indexes in (("create", to_create), ("update", to_update), ("delete", to_delete)):
+                for start in range(0, len(indexes), chunk_size):
+                    chunk = indexes[start : start + chunk_size]
+                    if operation == "create":
+                        payload = [self.objects_data[index] for index in chunk]
+                    elif operation == "update":
+                        payload = [dict(changes[index], id=nb_objects[index].id) for index in chunk]
+                    else:
+                        payload = [nb_objects[index].id for index in chunk]
+                    batches.append((operation, chunk, payload))
+
+            outcomes = None
+            if self.module.params.get("async_client"):
+                outcomes = self._send_bulk_async(nb_endpoint, batches)
+            if outcomes is None:
+                outcomes = self._send_bulk(nb_endpoint, batches)
+
+            applied = sum(
+                len(chunk)
+                for (operation, chunk, payload), outcome in zip(batches, outcomes)
+                if not isinstance(outcome, Exception)
+            )
+            if applied:
+                self._invalidate_id_cache()
+            for (operation, chunk, payload), outcome in zip(batches, outcomes):
+                if isinstance(outcome, Exception):
+                    self.module.fail_json(
+                        msg="%s (%s of %s changes applied)"
+                        % (
+                            getattr(outcome, "error", None) or outcome,
+                            applied,
+                            sum(len(batch[1]) for batch in batches),
+                        ),
+                        changed=bool(applied),
+                        **self._instrumentation(),
+                    )
+                if isinstance(outcome, list):
+                    for index, nb_obj in zip(chunk, outcome):
+                        results[index][endpoint_name] = nb_obj.serialize()
+
+        unchanged = len(results) - len(to_create) - len(to_update) - len(to_delete)
+        self.result = {
+            "changed": bool(to_create or to_update or to_delete),
+            "msg": "%s: %s created, %s updated, %s deleted, %s unchanged"
+            % (endpoint_name, len(to_create), len(to_update), len(to_delete), unchanged),
+            "objects": results,
+        }
+        if diffs:
+            self.result["diff"] = diffs
+
+        self._exit_json()
+
     def run(self):
         """
         Must be implemented in subclasses.
@@ -267,6 +267,33 @@ EXAMPLES = r"""
         position: 10
         face: Front
         state: present
+
+    - name: Create or update several devices in a single task
+      networktocode.nautobot.device:
+        url: http://nautobot.local
+        token: thisIsMyToken
+        objects:
+          - name: Test Device 1
+            device_type: C9410R
+            role: Core Switch
+            location: My Location
+            status: active
+          - name: Test Device 2
+            device_type: C9410R
+            role: Core Switch
+            location: My Location
+            status: active
+            asset_tag: "1002"
+        state: present
+
+    - name: Delete several devices in a single task
+      networktocode.nautobot.device:
+        url: http://nautobot.local
+        token: thisIsMyToken
+        objects:
+          - name: Test Device 1
+          - name: Test Device 2
+        state: absent
 """
 
 RETURN = r"""
@@ -278,6 +305,24 @@ msg:
   description: Message indicating failure or info about what has been achieved
   returned: always
   type: str
+objects:
+  description: Result of every item of C(objects) in the same order, C(msg) then counts the items created, updated, deleted and unchanged
+  returned: when C(objects) is set
+  type: list
+  elements: dict
+  contains:
+    changed:
+      description: Whether the item was created, updated or deleted
+      returned: always
+      type: bool
+    msg:
+      description: Message indicating what has been achieved for the item
+      returned: always
+      type: str
+    device:
+      description: Serialized object as created, updated or already existent within Nautobot, null when absent
+      returned: always
+      type: dict
 """
 
 import uuid
@@ -174,6 +174,17 @@ EXAMPLES = r"""
         token: thisIsMyToken
         id: 00000000-0000-0000-0000-000000000000
         state: absent
+    - name: Create or update several IP addresses in a single task
+      networktocode.nautobot.ip_address:
+        url: http://nautobot.local
+        token: thisIsMyToken
+        objects:
+          - address: 192.168.1.40/24
+            status: active
+          - address: 192.168.1.41/24
+            status: active
+            namespace: Private
+        state: present
 """
 
 RETURN = r"""
@@ -185,6 +196,24 @@ msg:
   description: Message indicating failure or info about what has been achieved
   returned: always
   type: str
+objects:
+  description: Result of every item of C(objects) in the same order, C(msg) then counts the items created, updated, deleted and unchanged
+  returned: when C(objects) is set
+  type: list
+  elements: dict
+  contains:
+    changed:
+      description: Whether the item was created, updated or deleted
+      returned: always
+      type: bool
+    msg:
+      description: Message indicating what has been achieved for the item
+      returned: always
+      type: str
+    ip_address:
+      description: Serialized object as created, updated or already existent within Nautobot, null when absent
+      returned: always
+      type: dict
 """
 
 from copy import deepcopy
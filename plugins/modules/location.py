@@ -240,7 +240,7 @@ def main():
     )
 
     required_if = [
-        ("state", "absent", ["id"]),
+        ("state", "absent", ["id", "objects"], True),
     ]
 
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True, required_if=required_if)
@@ -0,0 +1,17 @@
+"""Pytest options shared by every test suite."""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", default=False, help="Run the benchmark tests")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Timings depend on the machine and its load, so benchmarks would make the suite flaky
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="Benchmark, run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
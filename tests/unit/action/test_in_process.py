@@ -0,0 +1,167 @@
+"""Tests for the Nautobot Action Plugin running modules in process."""
+
+import json
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from ansible.module_utils import basic
+from ansible.parsing.dataloader import DataLoader
+from ansible.plugins.action.normal import ActionModule as NormalActionModule
+from ansible.template import Templar
+
+try:
+    from plugins.action import in_process
+    from plugins.action.in_process import ActionModule, patch_environment, patch_module_args, run_module_in_process
+except ImportError:
+    import sys
+
+    sys.path.append("plugins/action")
+
+    import in_process
+    from in_process import ActionModule, patch_environment, patch_module_args, run_module_in_process
+
+try:
+    from ansible.template import trust_as_template as trust
+except ImportError:
+    # ansible-core < 2.19 templates every string
+    def trust(value):
+        return value
+
+
+def test_patch_module_args_restores_args():
+    saved = basic._ANSIBLE_ARGS
+    with patch_module_args({"name": "Test"}):
+        assert json.loads(basic._ANSIBLE_ARGS)["ANSIBLE_MODULE_ARGS"] == {"name": "Test"}
+    assert basic._ANSIBLE_ARGS is saved
+
+
+def test_run_module_in_process_failure():
+    res = run_module_in_process("networktocode.nautobot.tag", {"name": "Test"})
+    assert res["rc"] == 1
+    assert res["stderr"] == ""
+    result = json.loads(res["stdout"])
+    assert result["failed"] is True
+    assert result["msg"] == "missing required arguments: token, url"
+
+
+def test_run_module_in_process_exception(monkeypatch):
+    from ansible_collections.networktocode.nautobot.plugins.modules import tag
+
+    def main():
+        raise RuntimeError("Boom")
+
+    monkeypatch.setattr(tag, "main", main)
+    res = run_module_in_process("networktocode.nautobot.tag", {})
+    assert res["rc"] == 1
+    assert res["stdout"] == ""
+    assert "RuntimeError: Boom" in res["stderr"]
+
+
+def test_patch_environment_restores_environment(monkeypatch):
+    monkeypatch.setenv("NAUTOBOT_URL", "http://nautobot.local")
+    monkeypatch.delenv("NAUTOBOT_TOKEN", raising=False)
+    with patch_environment({"NAUTOBOT_URL": "http://other.local", "NAUTOBOT_TOKEN": 1234}):
+        assert os.environ["NAUTOBOT_URL"] == "http://other.local"
+        assert os.environ["NAUTOBOT_TOKEN"] == "1234"
+    assert os.environ["NAUTOBOT_URL"] == "http://nautobot.local"
+    assert "NAUTOBOT_TOKEN" not in os.environ
+
+
+def test_run_module_in_process_environment(monkeypatch):
+    monkeypatch.delenv("NAUTOBOT_URL", raising=False)
+    monkeypatch.delenv("NAUTOBOT_TOKEN", raising=False)
+    environment = {"NAUTOBOT_URL": "http://127.0.0.1:1", "NAUTOBOT_TOKEN": "0123456789"}
+    res = run_module_in_process("networktocode.nautobot.tag", {"name": "Test", "api_version": "2.4"}, environment)
+    # The url and token are taken from the environment, connecting to Nautobot fails instead
+    assert "missing required arguments" not in res["stdout"]
+    assert "port=1" in res["stdout"] + res["stderr"]
+    assert "NAUTOBOT_URL" not in os.environ
+
+
+@pytest.fixture
+def action():
+    task = MagicMock(name="Task", action="networktocode.nautobot.tag", args={"name": "Test"}, async_val=0)
+    task.environment = [{"NAUTOBOT_URL": trust("{{ url }}")}, {"NAUTOBOT_TOKEN": "0123456789"}]
+    connection = MagicMock(name="Connection", transport="local")
+    play_context = MagicMock(name="PlayContext", become=False)
+    loader = DataLoader()
+    templar = Templar(loader=loader, variables={"url": "http://nautobot.local"})
+    action = ActionModule(task, connection, play_context, loader, templar)
+    action._resolve_module_name = lambda: "networktocode.nautobot.tag"
+    return action
+
+
+@pytest.mark.parametrize(
+    "task_vars, change, expected",
+    [
+        ({"nautobot_in_process": True}, {}, True),
+        ({"nautobot_in_process": trust("{{ 'yes' }}")}, {}, True),
+        ({}, {}, False),
+        ({"nautobot_in_process": False}, {}, False),
+        ({"nautobot_in_process": "maybe"}, {}, False),
+        ({"nautobot_in_process": True}, {"transport": "ssh"}, False),
+        ({"nautobot_in_process": True}, {"async_val": 10}, False),
+        ({"nautobot_in_process": True}, {"become": True}, False),
+        ({"nautobot_in_process": True}, {"module": "ansible.builtin.ping"}, False),
+    ],
+)
+def test_run_in_process(action, monkeypatch, task_vars, change, expected):
+    monkeypatch.delenv("NAUTOBOT_IN_PROCESS", raising=False)
+    if "transport" in change:
+        action._connection.transport = change["transport"]
+    if "async_val" in change:
+        action._task.async_val = change["async_val"]
+    if "become" in change:
+        action._play_context.become = change["become"]
+    if "module" in change:
+        action._resolve_module_name = lambda: change["module"]
+
+    assert bool(action._run_in_process(task_vars)) is expected
+
+
+def test_run_in_process_environment_variable(action, monkeypatch):
+    monkeypatch.setenv("NAUTOBOT_IN_PROCESS", "true")
+    assert action._run_in_process({}) is True
+
+
+def test_execute_module_in_process(action, monkeypatch):
+    monkeypatch.delenv("NAUTOBOT_URL", raising=False)
+    seen = dict()
+
+    def run(module_name, module_args, environment):
+        seen.update(module_name=module_name, module_args=module_args, environment=environment)
+        return {"stdout": json.dumps({"changed": True}), "stderr": "", "rc": 0}
+
+    monkeypatch.setattr(in_process, "run_module_in_process", run)
+    action._update_module_args = MagicMock()
+    parent = MagicMock(name="_execute_module")
+    monkeypatch.setattr(NormalActionModule, "_execute_module", parent)
+
+    data = action._execute_module(task_vars={"nautobot_in_process": True})
+
+    parent.assert_not_called()
+    assert data["changed"] is True
+    assert seen["module_name"] == "networktocode.nautobot.tag"
+    assert seen["module_args"] == {"name": "Test"}
+    assert seen["environment"] == {"NAUTOBOT_URL": "http://nautobot.local", "NAUTOBOT_TOKEN": "0123456789"}
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"task_vars": {}},
+        {"task_vars": {"nautobot_in_process": True}, "wrap_async": True},
+        {"task_vars": {"nautobot_in_process": True}, "module_name": "ansible.legacy.stat"},
+    ],
+)
+def test_execute_module_in_new_process(action, monkeypatch, kwargs):
+    monkeypatch.delenv("NAUTOBOT_IN_PROCESS", raising=False)
+    run = MagicMock(name="run_module_in_process")
+    monkeypatch.setattr(in_process, "run_module_in_process", run)
+    parent = MagicMock(name="_execute_module", return_value={"changed": False})
+    monkeypatch.setattr(NormalActionModule, "_execute_module", parent)
+
+    assert action._execute_module(**kwargs) == {"changed": False}
+    parent.assert_called_once()
+    run.assert_not_called()
@@ -0,0 +1,105 @@
+"""Tests for the callback plugin summarizing the requests sent to Nautobot."""
+
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.callback.api_cost import CallbackModule
+    from ansible_collections.networktocode.nautobot.plugins.module_utils import timing
+except ImportError:
+    import sys
+
+    sys.path.append("plugins/callback")
+    sys.path.append("plugins/module_utils")
+    import timing
+    from api_cost import CallbackModule
+
+
+def task_result(action, result):
+    return SimpleNamespace(_task=SimpleNamespace(action=action), _result=result)
+
+
+def nautobot_timing(*endpoints):
+    """Result of a module reporting requests counts per endpoint, each request of 100 bytes taking 0.1 second."""
+    endpoints = {
+        endpoint: {"requests": requests, "bytes": 100 * requests, "elapsed": 0.1 * requests}
+        for endpoint, requests in endpoints
+    }
+    return {"changed": False, "_nautobot_timing": {"endpoints": endpoints}}
+
+
+@pytest.fixture
+def callback(tmp_path, monkeypatch):
+    monkeypatch.delenv(timing.CONTROLLER_SPOOL_ENV, raising=False)
+    monkeypatch.setattr(timing, "CONTROLLER_REQUESTS", timing.CONTROLLER_REQUESTS)
+    del timing.CONTROLLER_REQUESTS[:]
+    callback = CallbackModule()
+    callback._display = MagicMock(name="Display")
+    # The options are only defined once the plugin is loaded by Ansible
+    callback._plugin_options.update({"top": 20, "output_file": str(tmp_path / "api_cost.json")})
+    return callback
+
+
+def test_api_cost_summary(callback, tmp_path):
+    # Requests of the inventory are sent before the callback is started
+    timing.record_controller_request(
+        "inventory", "get", "http://nautobot.local/api/dcim/devices/?limit=0", 200, 1000, 0.5
+    )
+    callback.v2_playbook_on_start(MagicMock(name="Playbook"))
+    spool = os.environ[timing.CONTROLLER_SPOOL_ENV]
+    timing.record_controller_request("lookup", "GET", "http://nautobot.local/api/dcim/locations/", 200, 500, 0.25)
+
+    callback.v2_runner_on_ok(
+        task_result(
+            "networktocode.nautobot.device_interface",
+            nautobot_timing(
+                ("GET /api/dcim/devices/", 1), ("GET /api/extras/tags/", 3), ("POST /api/dcim/interfaces/", 1)
+            ),
+        )
+    )
+    # A loop reports the timing of each item
+    callback.v2_runner_on_ok(
+        task_result(
+            "networktocode.nautobot.device_interface",
+            {
+                "results": [
+                    nautobot_timing(("GET /api/dcim/devices/", 1), ("GET /api/extras/tags/", 3)),
+                    nautobot_timing(("GET /api/dcim/devices/", 1), ("GET /api/extras/tags/", 3)),
+                ]
+            },
+        )
+    )
+    callback.v2_runner_on_failed(task_result("networktocode.nautobot.device", {"msg": "Not timed"}))
+    callback.v2_playbook_on_stats(MagicMock(name="Stats"))
+
+    summary = json.loads((tmp_path / "api_cost.json").read_text())
+    assert summary["total"] == {"tasks": 5, "requests": 15, "bytes": 2800, "elapsed": pytest.approx(2.05)}
+    assert summary["modules"]["networktocode.nautobot.device_interface"]["tasks"] == 3
+    assert summary["modules"]["networktocode.nautobot.device_interface"]["requests"] == 13
+    assert summary["modules"]["inventory"]["requests"] == 1
+    assert summary["modules"]["lookup"]["requests"] == 1
+    assert summary["endpoints"]["GET /api/extras/tags/"] == {
+        "tasks": 3,
+        "requests": 9,
+        "bytes": 900,
+        "elapsed": pytest.approx(0.9),
+    }
+    assert "networktocode.nautobot.device" not in summary["modules"]
+
+    # The endpoint sending the most requests is listed first
+    tables = [call.args[0] for call in callback._display.display.call_args_list]
+    assert tables[3].splitlines()[1].startswith("GET /api/extras/tags/")
+    assert not os.path.exists(spool)
+    assert timing.CONTROLLER_SPOOL_ENV not in os.environ
+
+
+def test_api_cost_nothing_recorded(callback, tmp_path):
+    callback.v2_playbook_on_start(MagicMock(name="Playbook"))
+    callback.v2_playbook_on_stats(MagicMock(name="Stats"))
+
+    callback._display.banner.assert_not_called()
+    assert not (tmp_path / "api_cost.json").exists()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Tests for the pooled HTTP session of the inventory plugin."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from ansible.errors import AnsibleParserError
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.inventory.inventory import InventoryModule
+except ImportError:
+    import sys
+
+    sys.path.append("plugins/inventory")
+    from inventory import InventoryModule
+
+pytest.importorskip("requests")
+
+DEVICES = [{"id": "device%d" % i, "name": "device%d" % i} for i in range(6)]
+
+
+class FakeNautobot(BaseHTTPRequestHandler):
+    """Serve DEVICES 2 per page over keep-alive connections, gzipped when asked to."""
+
+    protocol_version = "HTTP/1.1"
+    encodings = []
+
+    def do_GET(self):  # noqa: N802
+        if self.path.startswith("/api/redirect/"):
+            self.send_response(302)
+            self.send_header("Location", "/api/dcim/devices/?limit=0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if not self.path.startswith("/api/dcim/devices/"):
+            body = json.dumps({"detail": "Not found."}).encode()
+            self.send_response(404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        offset = int(self.path.rpartition("offset=")[2]) if "offset=" in self.path else 0
+        next_url = None
+        if offset + 2 < len(DEVICES):
+            next_url = "http://%s:%d/api/dcim/devices/?limit=2&offset=%d" % (*self.server.server_address, offset + 2)
+        body = json.dumps({"count": len(DEVICES), "next": next_url, "results": DEVICES[offset : offset + 2]}).encode()
+
+        self.encodings.append(self.headers.get("Accept-Encoding"))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_nautobot():
+    FakeNautobot.encodings = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeNautobot)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%d" % server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def inventory():
+    inventory = InventoryModule()
+    inventory._options = {"cache": False}
+    inventory.use_cache = False
+    inventory.headers = {"Content-type": "application/json"}
+    inventory.timeout = 10
+    inventory.validate_certs = True
+    inventory.follow_redirects = "urllib2"
+    inventory.pagination_workers = 1
+    return inventory
+
+
+def test_http_session_reuses_connections(inventory, fake_nautobot):
+    inventory.http_session = inventory._new_http_session(4)
+
+    devices = inventory.get_resource_list(fake_nautobot + "/api/dcim/devices/?limit=0")
+
+    assert devices == DEVICES
+    assert inventory._connection_stats() == (3, 1)
+    assert all("gzip" in encoding for encoding in FakeNautobot.encodings)
+
+
+def test_http_session_error(inventory, fake_nautobot):
+    inventory.http_session = inventory._new_http_session(4)
+
+    with pytest.raises(AnsibleParserError, match="Not found"):
+        inventory._fetch_information(fake_nautobot + "/api/dcim/missing/")
+
+
+def test_open_url_fallback(inventory, fake_nautobot):
+    devices = inventory.get_resource_list(fake_nautobot + "/api/dcim/devices/?limit=0")
+
+    assert devices == DEVICES
+
+
+@pytest.mark.parametrize(
+    "follow_redirects, followed",
+    [("urllib2", True), ("all", True), ("yes", True), ("safe", True), ("none", False), ("no", False), (False, False)],
+)
+@pytest.mark.parametrize("session", [True, False])
+def test_follow_redirects(inventory, fake_nautobot, follow_redirects, followed, session):
+    inventory.follow_redirects = follow_redirects
+    inventory.http_session = inventory._new_http_session(4) if session else None
+
+    if followed:
+        assert inventory.get_resource_list(fake_nautobot + "/api/redirect/") == DEVICES
+    else:
+        # Both with requests and open_url
+        with pytest.raises(AnsibleParserError):
+            inventory.get_resource_list(fake_nautobot + "/api/redirect/")
+
+
+def test_pool_size(inventory):
+    inventory.interfaces = True
+    inventory.services = False
+    inventory.pagination_workers = 4
+    inventory.chunk_workers = 2
+
+    # Every chunk thread of every lookup thread fetches its pages with pagination threads
+    assert inventory._pool_size() == len(inventory.lookup_processes) * 4 * 2
+    inventory.pagination_workers = inventory.chunk_workers = 0
+    assert inventory._pool_size() == len(inventory.lookup_processes)
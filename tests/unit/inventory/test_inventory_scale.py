@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Benchmark of the time the inventory takes to build the groups of many hosts."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import time
+
+import pytest
+from ansible.inventory.data import InventoryData
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.inventory.inventory import InventoryModule
+except ImportError:
+    import sys
+
+    sys.path.append("plugins/inventory")
+    from inventory import InventoryModule
+
+# Hosts per location, the number of locations grows with the inventory like in real deployments
+HOSTS_PER_LOCATION = 4
+
+
+def location_id(index):
+    return "00000000-0000-4000-8000-%012d" % index
+
+
+def build_inventory(hosts):
+    """Return an inventory plugin holding hosts spread over nested locations, ready for main()."""
+    locations = max(hosts // HOSTS_PER_LOCATION, 10)
+    inventory = InventoryModule()
+    inventory.inventory = InventoryData()
+    inventory._options = {"strict": False, "compose": {}, "groups": {}, "keyed_groups": []}
+    inventory.query_filters = inventory.device_query_filters = inventory.vm_query_filters = []
+    inventory.api_version = None
+    inventory.headers = {}
+    inventory.refresh_lookups = lambda lookups: None
+    inventory.fetch_hosts = lambda: None
+    inventory.allow_unsafe = False
+    inventory.rename_variables = []
+    inventory.group_by = ["locations"]
+    inventory.group_names_raw = False
+    inventory.plurals = True
+    inventory.interfaces = inventory.services = inventory.dns_name = inventory.ansible_host_dns_name = False
+    inventory.config_context = inventory.virtual_chassis_name = False
+    inventory.locations_lookup = dict((location_id(i), "location%d" % i) for i in range(locations))
+    # Locations nested 10 levels deep
+    inventory.locations_parent_lookup = dict(
+        (location_id(i), location_id(i - 1) if i % 10 else None) for i in range(locations)
+    )
+    inventory.devices_list = [
+        {
+            "id": "device%d" % i,
+            "name": "device%d" % i,
+            "status": {"display": "Active"},
+            "tags": [],
+            "location": {"id": location_id(i % locations)},
+        }
+        for i in range(hosts)
+    ]
+    inventory.vms_list = []
+    return inventory
+
+
+def parse_time(hosts):
+    inventory = build_inventory(hosts)
+    started = time.perf_counter()
+    inventory.main()
+    return time.perf_counter() - started
+
+
+def test_location_groups_built_once(mocker):
+    inventory = build_inventory(40)
+    add_location_groups = mocker.spy(inventory, "_add_location_groups")
+    inventory.main()
+
+    add_location_groups.assert_called_once_with()
+    assert len(inventory.inventory.hosts) == 40
+    assert inventory.inventory.groups["location_location9"].parent_groups[0].name == "location_location8"
+    assert [host.name for host in inventory.inventory.groups["locations_location9"].hosts] == [
+        "device9",
+        "device19",
+        "device29",
+        "device39",
+    ]
+
+
+@pytest.mark.benchmark
+def test_inventory_scale_benchmark(capsys):
+    sizes = [1000, 4000]
+    timings = dict((hosts, min(parse_time(hosts) for attempt in range(3))) for hosts in sizes)
+
+    with capsys.disabled():
+        print(
+            "\nInventory groups built for: %s" % ", ".join("%d hosts %.0fms" % (n, t * 1e3) for n, t in timings.items())
+        )
+    # 4 times the hosts take about 4 times as long, well below the 16 times a quadratic growth gives
+    assert timings[4000] / timings[1000] < 8
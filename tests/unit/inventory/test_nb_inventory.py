@@ -7,8 +7,10 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import os
+import time
 from functools import partial
 from unittest.mock import Mock, call
+from urllib.parse import parse_qsl, urlsplit
 
 import pytest
 
@@ -49,6 +51,10 @@ def inventory_fixture(allowed_device_query_parameters_fixture, allowed_vm_query_
     inventory.api_version = None
     inventory.allowed_device_query_parameters = allowed_device_query_parameters_fixture
     inventory.allowed_vm_query_parameters = allowed_vm_query_parameters_fixture
+    inventory.pagination_workers = 1
+    inventory.chunk_workers = 1
+    inventory.fetch_all = False
+    inventory.fetch_all_threshold = 0
     # Inventory mock, to validate what has been set via inventory.inventory.set_variable
     inventory.inventory = MockInventory()
     inventory.allow_unsafe = False
@@ -171,16 +177,20 @@ def test_group_extractors(
         assert key not in expected
 
 
+@pytest.mark.parametrize("chunk_workers", [1, 4])
 @pytest.mark.parametrize(
     "api_url, max_uri_length, query_key, query_values, expected",
     load_relative_test_data("get_resource_list_chunked"),
 )
-def test_get_resource_list_chunked(inventory_fixture, api_url, max_uri_length, query_key, query_values, expected):
+def test_get_resource_list_chunked(
+    inventory_fixture, api_url, max_uri_length, query_key, query_values, expected, chunk_workers
+):
     mock_get_resource_list = Mock()
     mock_get_resource_list.return_value = ["resource"]
 
     inventory_fixture.get_resource_list = mock_get_resource_list
     inventory_fixture.max_uri_length = max_uri_length
+    inventory_fixture.chunk_workers = chunk_workers
 
     resources = inventory_fixture.get_resource_list_chunked(api_url, query_key, query_values)
 
@@ -189,6 +199,145 @@ def test_get_resource_list_chunked(inventory_fixture, api_url, max_uri_length, q
     assert resources == mock_get_resource_list.return_value * len(expected)
 
 
+def test_get_resource_list_chunked_order(inventory_fixture):
+    def get_resource_list(url):
+        # The first chunks complete last
+        ids = [int(value) for key, value in parse_qsl(urlsplit(url).query) if key == "device_id"]
+        time.sleep(0.01 * (10 - ids[0]) / 10)
+        return ids
+
+    inventory_fixture.get_resource_list = get_resource_list
+    inventory_fixture.max_uri_length = 80
+    inventory_fixture.chunk_workers = 4
+
+    resources = inventory_fixture.get_resource_list_chunked(
+        "https://nautobot.test.endpoint:1234/api/dcim/interfaces/?limit=0", "device_id", list(range(10))
+    )
+
+    assert resources == list(range(10))
+
+
+@pytest.mark.parametrize(
+    "fetch_all, fetch_all_threshold, expected",
+    [
+        (True, 0, True),
+        (False, 0, False),
+        (False, 3, False),
+        (False, 2, True),
+    ],
+)
+def test_use_fetch_all(inventory_fixture, fetch_all, fetch_all_threshold, expected):
+    inventory_fixture.fetch_all = fetch_all
+    inventory_fixture.fetch_all_threshold = fetch_all_threshold
+
+    assert inventory_fixture._use_fetch_all({"device1": {}, "device2": {}}, {"vm1": {}}) is expected
+
+
+def test_refresh_services_fetch_all_threshold(inventory_fixture):
+    service = {"id": "service1", "device": {"id": "device1"}, "virtual_machine": None}
+    inventory_fixture.devices_lookup = {"device%d" % i: {} for i in range(5)}
+    inventory_fixture.vms_lookup = {}
+    inventory_fixture.fetch_all_threshold = 4
+    inventory_fixture.get_resource_list = Mock(return_value=[service, {"id": "service2", "device": {"id": "other"}}])
+    inventory_fixture.get_resource_list_chunked = Mock()
+
+    inventory_fixture.refresh_services()
+
+    inventory_fixture.get_resource_list.assert_called_once_with(
+        "https://nautobot.test.endpoint:1234/api/ipam/services/?limit=0&depth=1&exclude_m2m=False"
+    )
+    inventory_fixture.get_resource_list_chunked.assert_not_called()
+    assert inventory_fixture.device_services_lookup["device1"] == {"service1": service}
+
+
+def test_refresh_interfaces_fetch_all_threshold(inventory_fixture):
+    inventory_fixture.module_interfaces = False
+    inventory_fixture.devices_lookup = {"device%d" % i: {} for i in range(5)}
+    inventory_fixture.vms_lookup = {"vm1": {}}
+    inventory_fixture.fetch_all_threshold = 4
+    inventory_fixture.get_resource_list = Mock(
+        return_value=[
+            {"id": "interface1", "device": {"id": "device1"}, "ip_address_count": 1},
+            {"id": "interface2", "device": {"id": "other"}, "ip_address_count": 1},
+        ]
+    )
+    inventory_fixture.get_resource_list_chunked = Mock(return_value=[])
+
+    inventory_fixture.refresh_interfaces()
+
+    # Only the device interfaces have more IDs than the threshold
+    inventory_fixture.get_resource_list.assert_called_once()
+    assert "/api/dcim/interfaces/" in inventory_fixture.get_resource_list.call_args.args[0]
+    inventory_fixture.get_resource_list_chunked.assert_called_once_with(
+        api_url="https://nautobot.test.endpoint:1234/api/virtualization/interfaces/?limit=0&depth=1&exclude_m2m=False",
+        query_key="virtual_machine_id",
+        query_values=inventory_fixture.vms_lookup.keys(),
+    )
+    assert list(inventory_fixture.device_interfaces_lookup) == ["device1"]
+    assert inventory_fixture.devices_with_ips == {"device1"}
+
+
+def fake_pages(objects, page_size):
+    """Return a fake _fetch_information answering limit/offset URLs with pages of objects, like Nautobot."""
+
+    def fetch(url):
+        query = dict(parse_qsl(urlsplit(url).query))
+        offset = int(query.get("offset", 0))
+        results = objects[offset : offset + page_size]
+        next_url = None
+        if offset + page_size < len(objects):
+            next_url = "https://nautobot.test.endpoint:1234/api/dcim/interfaces/?device_id=1&limit=%d&offset=%d" % (
+                page_size,
+                offset + page_size,
+            )
+        return {"count": len(objects), "next": next_url, "results": results}
+
+    return Mock(side_effect=fetch)
+
+
+@pytest.mark.parametrize("pagination_workers", [1, 4])
+def test_get_resource_list_pagination(inventory_fixture, pagination_workers):
+    objects = list(range(10))
+    inventory_fixture.pagination_workers = pagination_workers
+    inventory_fixture._fetch_information = fake_pages(objects, 3)
+
+    resources = inventory_fixture.get_resource_list(
+        "https://nautobot.test.endpoint:1234/api/dcim/interfaces/?limit=0&device_id=1"
+    )
+
+    assert resources == objects
+    offsets = sorted(
+        dict(parse_qsl(urlsplit(c.args[0]).query)).get("offset")
+        for c in inventory_fixture._fetch_information.call_args_list
+        if "offset" in c.args[0]
+    )
+    assert offsets == ["3", "6", "9"]
+    assert all(
+        "device_id=1" in c.args[0] and "limit=" in c.args[0]
+        for c in inventory_fixture._fetch_information.call_args_list
+    )
+
+
+def test_get_resource_list_pagination_objects_added(inventory_fixture):
+    objects = list(range(10))
+    inventory_fixture.pagination_workers = 4
+    fetch = fake_pages(objects, 3)
+
+    def fetch_then_add(url):
+        page = fetch(url)
+        # Objects created once the count was read are fetched by following next
+        if "offset=9" in url and len(objects) == 10:
+            objects.extend([10, 11, 12])
+            page = fetch(url)
+        return page
+
+    inventory_fixture._fetch_information = fetch_then_add
+
+    resources = inventory_fixture.get_resource_list("https://nautobot.test.endpoint:1234/api/dcim/interfaces/")
+
+    assert resources == list(range(13))
+
+
 def test_rename_variables(inventory_fixture):
     inventory_fixture.rename_variables = inventory_fixture.parse_rename_variables(
         (
@@ -0,0 +1,318 @@
+"""Tests for the asyncio client of the Nautobot REST API."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import asyncio
+import os
+import ssl
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import certifi
+import pynautobot
+import pytest
+
+web = pytest.importorskip("aiohttp.web")
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.async_client import NautobotAsyncApi, _ssl
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.dcim import NB_DEVICES, NautobotDcimModule
+except ImportError:
+    sys.path.append("plugins/module_utils")
+    from async_client import NautobotAsyncApi, _ssl
+    from dcim import NB_DEVICES, NautobotDcimModule
+
+LOCATION_ID = "9f1c7d1c-1a1d-4b3b-a5f1-e8c29e3c3b11"
+STATUS_ID = "5c3a8c0e-6a4b-4d7e-9f2e-1b2c3d4e5f60"
+PREFIX_ID = "0b6ac0a1-3b8e-4b36-a9c3-2c1b7b1f5d01"
+DEVICES = [{"id": "00000000-0000-4000-8000-%012d" % i, "name": "device%d" % i} for i in range(5)]
+TAGS = [{"id": "00000000-0000-4000-9000-%012d" % i, "name": "tag%d" % i} for i in range(3)]
+
+
+def page(request, objects):
+    """Return the page of objects asked by the limit and offset of request, 2 objects per page by default."""
+    limit = int(request.query.get("limit", 2))
+    offset = int(request.query.get("offset", 0))
+    url = "%s?limit=%d&offset=%d" % (request.url.with_query(None), limit, offset + limit)
+    return {
+        "count": len(objects),
+        "next": url if offset + limit < len(objects) else None,
+        "previous": None,
+        "results": objects[offset : offset + limit],
+    }
+
+
+class FakeNautobot:
+    """aiohttp application answering the few endpoints the tests use, recording each request."""
+
+    def __init__(self):
+        self.requests = list()
+        self.app = web.Application(middlewares=[self.record])
+        self.app.router.add_route("*", "/api/dcim/devices/", self.devices)
+        self.app.router.add_get("/api/dcim/devices/{id}/", self.device)
+        self.app.router.add_get("/api/dcim/locations/", self.locations)
+        self.app.router.add_get("/api/extras/statuses/", self.statuses)
+        self.app.router.add_get("/api/extras/tags/", self.tags)
+        self.app.router.add_route("*", "/api/ipam/prefixes/{id}/available-ips/", self.available_ips)
+
+    @web.middleware
+    async def record(self, request, handler):
+        self.requests.append((request.method, request.path, dict(request.query), dict(request.headers)))
+        return await handler(request)
+
+    async def devices(self, request):
+        if request.method == "OPTIONS":
+            return web.json_response(
+                {
+                    "actions": {
+                        "POST": {"status": {"type": "choice", "choices": [{"value": "active", "display": "Active"}]}}
+                    }
+                }
+            )
+        if request.method == "POST":
+            data = await request.json()
+            if isinstance(data, list):
+                return web.json_response([dict(item, id=DEVICES[0]["id"]) for item in data], status=201)
+            return web.json_response(dict(data, id=DEVICES[0]["id"]), status=201)
+        if request.method == "PATCH":
+            data = await request.json()
+            if any(item.get("name") == "invalid" for item in data):
+                return web.json_response({"name": ["Invalid"]}, status=400)
+            return web.json_response(data)
+        if request.method == "DELETE":
+            return web.Response(status=204)
+        objects = DEVICES
+        if "name" in request.query:
+            objects = [device for device in DEVICES if device["name"] == request.query["name"]]
+        return web.json_response(page(request, objects))
+
+    async def device(self, request):
+        for device in DEVICES:
+            if device["id"] == request.match_info["id"]:
+                return web.json_response(device)
+        return web.json_response({"detail": "Not found."}, status=404)
+
+    async def locations(self, request):
+        return web.json_response(page(request, [{"id": LOCATION_ID, "name": "Test Location"}]))
+
+    async def statuses(self, request):
+        return web.json_response(page(request, [{"id": STATUS_ID, "name": "Active"}]))
+
+    async def tags(self, request):
+        return web.json_response(
+            page(request, [tag for tag in TAGS if tag["name"] in request.query.getall("name", [])])
+        )
+
+    async def available_ips(self, request):
+        if request.method == "POST":
+            return web.json_response({"id": DEVICES[0]["id"], "address": "10.0.0.1/24"}, status=201)
+        return web.json_response([{"address": "10.0.0.1/24"}, {"address": "10.0.0.2/24"}])
+
+
+@pytest.fixture
+def fake_nautobot():
+    """Serve FakeNautobot from a thread, so the code under test can run its own event loop."""
+    fake = FakeNautobot()
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(fake.app)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    fake.url = "http://127.0.0.1:%d" % runner.addresses[0][1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield fake
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.run_until_complete(runner.cleanup())
+    loop.close()
+
+
+def run(nb, coroutine, **kwargs):
+    async def main():
+        async with NautobotAsyncApi(nb, **kwargs) as api:
+            return await coroutine(api)
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def nb(fake_nautobot):
+    return pynautobot.api(fake_nautobot.url, token="0123456789", api_version="2.4", exclude_m2m=False)
+
+
+def test_filter_fetches_pages_concurrently(fake_nautobot, nb):
+    responses = list()
+    devices = run(nb, lambda api: api.endpoint(nb.dcim.devices).filter(), on_response=lambda *r: responses.append(r))
+
+    assert [device.name for device in devices] == [device["name"] for device in DEVICES]
+    assert isinstance(devices[0], pynautobot.models.dcim.Devices)
+    assert [request[2].get("offset") for request in fake_nautobot.requests] == [None, "2", "4"]
+    method, path, query, headers = fake_nautobot.requests[0]
+    assert query == {"exclude_m2m": "False"}
+    assert headers["Authorization"] == "Token 0123456789"
+    assert headers["Accept"] == "application/json; version=2.4"
+    assert [response[2] for response in responses] == [200, 200, 200]
+
+
+def test_get(nb):
+    def endpoint(api):
+        return api.endpoint(nb.dcim.devices)
+
+    assert run(nb, lambda api: endpoint(api).get(name="device1")).id == DEVICES[1]["id"]
+    assert run(nb, lambda api: endpoint(api).get(name="missing")) is None
+    assert run(nb, lambda api: endpoint(api).get(DEVICES[2]["id"])).name == "device2"
+    assert run(nb, lambda api: endpoint(api).get(LOCATION_ID)) is None
+    with pytest.raises(ValueError, match="more than one result"):
+        run(nb, lambda api: endpoint(api).get())
+
+
+def test_write_methods(fake_nautobot, nb):
+    def endpoint(api):
+        return api.endpoint(nb.dcim.devices)
+
+    assert run(nb, lambda api: endpoint(api).create({"name": "new"})).id == DEVICES[0]["id"]
+    created = run(nb, lambda api: endpoint(api).create([{"name": "new1"}, {"name": "new2"}]))
+    assert [device.name for device in created] == ["new1", "new2"]
+    updated = run(nb, lambda api: endpoint(api).update([{"id": DEVICES[0]["id"], "name": "renamed"}]))
+    assert updated[0].name == "renamed"
+    assert run(nb, lambda api: endpoint(api).delete([DEVICES[0]["id"]])) is True
+    assert run(nb, lambda api: endpoint(api).choices()) == {"status": [{"value": "active", "display": "Active"}]}
+    assert [request[0] for request in fake_nautobot.requests] == ["POST", "POST", "PATCH", "DELETE", "OPTIONS"]
+
+
+def test_available_ips(nb):
+    prefix = nb.ipam.prefixes.return_obj({"id": PREFIX_ID, "prefix": "10.0.0.0/24"}, nb, nb.ipam.prefixes)
+
+    available = run(nb, lambda api: api.endpoint(nb.ipam.prefixes).available_ips(prefix).list())
+    assert [str(ip) for ip in available] == ["10.0.0.1/24", "10.0.0.2/24"]
+    created = run(nb, lambda api: api.endpoint(nb.ipam.prefixes).available_ips(prefix).create())
+    assert created.address == "10.0.0.1/24"
+
+
+@pytest.mark.parametrize(
+    "verify, expected",
+    [
+        (True, type(None)),
+        (False, bool),
+        (certifi.where(), ssl.SSLContext),
+        (os.path.dirname(certifi.where()), ssl.SSLContext),
+    ],
+)
+def test_ssl(verify, expected):
+    assert isinstance(_ssl(verify), expected)
+
+
+def test_ca_bundle(nb):
+    nb.http_session.verify = certifi.where()
+
+    assert run(nb, lambda api: api.endpoint(nb.dcim.devices).get(name="device1")).id == DEVICES[1]["id"]
+
+
+def test_request_error(nb):
+    with pytest.raises(pynautobot.RequestError) as e:
+        run(nb, lambda api: api.request("GET", "%s/missing/" % nb.base_url))
+    assert e.value.req.status_code == 404
+
+
+@pytest.fixture
+def fake_api(monkeypatch, fake_nautobot):
+    api = pynautobot.api
+
+    def fake(url, *args, **kwargs):
+        return api(fake_nautobot.url, *args, **kwargs)
+
+    monkeypatch.setattr(pynautobot, "api", fake)
+
+
+def test_module_async_client(fake_api, fake_nautobot):
+    module = MagicMock(name="AnsibleModule")
+    module.check_mode = False
+    module.params = {
+        "url": "http://nautobot.local/",
+        "token": "0123456789",
+        "state": "present",
+        "api_version": "2.4",
+        "validate_certs": False,
+        "resolve_workers": 4,
+        "async_client": True,
+        "lightweight_lookups": True,
+        "timing": True,
+        "name": "core1",
+        "location": "Test Location",
+        "status": "Active",
+        "tags": ["tag1", "tag2"],
+    }
+    nautobot = NautobotDcimModule(module, NB_DEVICES)
+
+    assert nautobot.data["location"] == LOCATION_ID
+    assert nautobot.data["status"] == STATUS_ID
+    assert sorted(nautobot.data["tags"]) == [TAGS[1]["id"], TAGS[2]["id"]]
+    lookups = [request[1:3] for request in fake_nautobot.requests if request[1] == "/api/dcim/locations/"]
+    assert lookups == [
+        ("/api/dcim/locations/", {"exclude_m2m": "True", "name": "Test Location", "depth": "0"}),
+    ]
+    assert "GET /api/dcim/locations/" in nautobot.timing.summary()["endpoints"]
+
+
+def test_module_async_client_failure(fake_api, fake_nautobot):
+    module = MagicMock(name="AnsibleModule")
+    module.check_mode = False
+    module.params = {
+        "url": "http://nautobot.local/",
+        "token": "0123456789",
+        "state": "present",
+        "api_version": "2.4",
+        "validate_certs": "/nonexistent/ca.pem",
+        "resolve_workers": 4,
+        "async_client": True,
+        "name": "core1",
+        "location": "Test Location",
+        "status": "Active",
+    }
+    nautobot = NautobotDcimModule(module, NB_DEVICES)
+
+    # The queries are sent with the threads instead
+    assert "asyncio client failed" in module.warn.call_args.args[0]
+    assert nautobot.data["location"] == LOCATION_ID
+    assert nautobot.data["status"] == STATUS_ID
+
+
+@pytest.mark.parametrize(
+    "name, outcomes",
+    [
+        ("renamed", [list, list, list, bool]),
+        # The deletions aren't sent once an update failed
+        ("invalid", [list, list, pynautobot.RequestError]),
+    ],
+)
+def test_module_async_client_bulk(fake_api, fake_nautobot, name, outcomes):
+    module = MagicMock(name="AnsibleModule")
+    module.check_mode = False
+    module.params = {
+        "url": "http://nautobot.local/",
+        "token": "0123456789",
+        "state": "present",
+        "api_version": "2.4",
+        "validate_certs": False,
+        "resolve_workers": 4,
+        "async_client": True,
+        "name": "core1",
+    }
+    nautobot = NautobotDcimModule(module, NB_DEVICES)
+    batches = [
+        ("create", [0], [{"name": "new1"}]),
+        ("create", [1], [{"name": "new2"}]),
+        ("update", [2], [{"id": DEVICES[2]["id"], "name": name}]),
+        ("delete", [3], [DEVICES[3]["id"]]),
+    ]
+
+    sent = nautobot._send_bulk_async(nautobot.nb.dcim.devices, batches)
+
+    assert [type(outcome) for outcome in sent] == outcomes
+    assert [outcome.name for outcome in sent[0] + sent[1]] == ["new1", "new2"]
+    writes = [request for request in fake_nautobot.requests if request[0] != "GET"]
+    assert sorted(request[0] for request in writes) == sorted(["POST", "POST", "PATCH", "DELETE"][: len(outcomes)])
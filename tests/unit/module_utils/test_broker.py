@@ -0,0 +1,192 @@
+"""Tests for the connection broker."""
+
+import json
+import os
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.broker import (
+        NautobotBroker,
+        NautobotBrokerAdapter,
+    )
+except ImportError:
+    sys.path.append("plugins/module_utils")
+    from broker import NautobotBroker, NautobotBrokerAdapter
+
+
+class NautobotHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        self._reply(200, {"path": self.path, "authorization": self.headers.get("Authorization")})
+
+    def do_POST(self):
+        self.server.connections.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self._reply(201, {"created": body})
+
+    def _reply(self, status, data):
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def nautobot_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NautobotHandler)
+    server.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%s" % server.server_address[1], server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def broker(tmp_path):
+    broker = NautobotBroker(str(tmp_path / "broker.sock"), idle_timeout=30)
+    broker.timeout = 0.1
+    thread = threading.Thread(target=broker.serve_until_idle, daemon=True)
+    thread.start()
+    yield broker
+    broker.idle_timeout = 0
+    thread.join()
+    broker.server_close()
+
+
+@pytest.fixture
+def session(broker):
+    session = requests.Session()
+    adapter = NautobotBrokerAdapter(broker.server_address, spawn=False)
+    session.mount("http://", adapter)
+    session.headers["Authorization"] = "Token 0123456789"
+    return session
+
+
+def test_broker_forwards_requests(nautobot_url, session):
+    url, server = nautobot_url
+    response = session.get("%s/api/dcim/devices/?name=Test" % url)
+    assert response.status_code == 200
+    assert response.json() == {"path": "/api/dcim/devices/?name=Test", "authorization": "Token 0123456789"}
+    assert response.headers["content-type"] == "application/json"
+
+    response = session.post("%s/api/dcim/devices/" % url, json={"name": "Test"})
+    assert response.status_code == 201
+    assert response.json() == {"created": {"name": "Test"}}
+
+
+def test_broker_reuses_connections(nautobot_url, session):
+    url, server = nautobot_url
+    for attempt in range(5):
+        session.get("%s/api/" % url)
+    # Every module process would have opened its own connection without the broker
+    other_session = requests.Session()
+    other_session.mount("http://", NautobotBrokerAdapter(session.get_adapter(url).path, spawn=False))
+    other_session.headers["Authorization"] = "Token 0123456789"
+    other_session.get("%s/api/" % url)
+    assert len(server.connections) == 1
+
+
+def test_broker_reports_connection_errors(broker, session):
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get("http://127.0.0.1:1/api/")
+
+
+def test_adapter_falls_back_without_broker(nautobot_url, tmp_path):
+    url, server = nautobot_url
+    session = requests.Session()
+    adapter = NautobotBrokerAdapter(str(tmp_path / "missing.sock"), spawn=False)
+    session.mount("http://", adapter)
+    assert session.get("%s/api/" % url).status_code == 200
+    assert adapter.disabled is True
+
+
+@pytest.mark.parametrize("running", [True, False])
+def test_adapter_starts_broker(monkeypatch, nautobot_url, broker, tmp_path, running):
+    url, server = nautobot_url
+    spawned = list()
+    monkeypatch.setattr(sys.modules[NautobotBrokerAdapter.__module__], "spawn_broker", spawned.append)
+    monkeypatch.setattr(sys.modules[NautobotBrokerAdapter.__module__], "BROKER_START_TIMEOUT", 0)
+    path = broker.server_address if running else str(tmp_path / "missing.sock")
+    adapter = NautobotBrokerAdapter(path)
+
+    adapter.start()
+
+    assert spawned == ([] if running else [path])
+    assert adapter.disabled is not running
+    # Never started again once the module may run threads
+    assert adapter.spawn is False
+    session = requests.Session()
+    session.mount("http://", adapter)
+    assert session.get("%s/api/" % url).status_code == 200
+
+
+@pytest.fixture
+def stuck_broker(tmp_path):
+    """Unix socket accepting the connections of the adapter without ever answering."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(tmp_path / "stuck.sock"))
+    server.listen()
+    yield str(tmp_path / "stuck.sock")
+    server.close()
+
+
+@pytest.mark.parametrize("method, status", [("GET", 200), ("POST", None)])
+def test_adapter_falls_back_when_broker_times_out(monkeypatch, nautobot_url, stuck_broker, method, status):
+    url, server = nautobot_url
+    monkeypatch.setattr(sys.modules[NautobotBrokerAdapter.__module__], "BROKER_TIMEOUT_MARGIN", 0)
+    session = requests.Session()
+    adapter = NautobotBrokerAdapter(stuck_broker, spawn=False)
+    session.mount("http://", adapter)
+
+    if status:
+        # Reads are sent again directly
+        assert session.request(method, "%s/api/" % url, json={}, timeout=0.1).status_code == status
+    else:
+        # Writes may have been applied by the broker already
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            session.request(method, "%s/api/" % url, json={}, timeout=0.1)
+    assert adapter.disabled is True
+
+
+def test_adapter_sends_client_certificate_requests_directly(monkeypatch, nautobot_url, broker, tmp_path):
+    url, server = nautobot_url
+    cert = tmp_path / "client.pem"
+    cert.write_text("")
+    session = requests.Session()
+    adapter = NautobotBrokerAdapter(broker.server_address, spawn=False)
+    monkeypatch.setattr(adapter, "_connect_or_spawn", pytest.fail)
+    session.mount("http://", adapter)
+
+    assert session.get("%s/api/" % url, cert=str(cert)).status_code == 200
+
+
+def test_broker_handles_pending_connections_when_idle(nautobot_url, tmp_path):
+    url, server = nautobot_url
+    path = str(tmp_path / "broker.sock")
+    broker = NautobotBroker(path, idle_timeout=0)
+    # Connected while the broker was deciding to shut down, not accepted yet
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(path)
+    message = {"method": "GET", "url": "%s/api/" % url, "headers": {}, "body": None, "verify": True}
+    client.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+    broker.serve_until_idle()
+    broker.server_close()
+
+    with client, client.makefile("rb") as reply:
+        assert json.loads(reply.readline())["status"] == 200
+    assert not os.path.exists(path)
@@ -0,0 +1,70 @@
+"""Tests for the on-disk module cache."""
+
+import os
+import time
+
+import pytest
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.cache import NautobotFileCache
+except ImportError:
+    import sys
+
+    sys.path.append("plugins/module_utils")
+    from cache import NautobotFileCache
+
+
+@pytest.fixture
+def file_cache(tmp_path):
+    return NautobotFileCache("https://nautobot.example.com/", "abc123", 60, cache_dir=str(tmp_path))
+
+
+def test_cache_miss_returns_none(file_cache):
+    assert file_cache.get("ids.devices", "missing") is None
+
+
+def test_cache_set_and_get(file_cache):
+    file_cache.set("ids.devices", "key", "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11")
+    assert file_cache.get("ids.devices", "key") == "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11"
+
+
+def test_cache_is_shared_between_instances(file_cache, tmp_path):
+    file_cache.set("ids.devices", "key", "value")
+    other = NautobotFileCache("https://nautobot.example.com", "abc123", 60, cache_dir=str(tmp_path))
+    assert other.get("ids.devices", "key") == "value"
+
+
+def test_cache_is_isolated_per_url_and_token(file_cache, tmp_path):
+    file_cache.set("ids.devices", "key", "value")
+    other_url = NautobotFileCache("https://other.example.com", "abc123", 60, cache_dir=str(tmp_path))
+    other_token = NautobotFileCache("https://nautobot.example.com", "def456", 60, cache_dir=str(tmp_path))
+    assert other_url.get("ids.devices", "key") is None
+    assert other_token.get("ids.devices", "key") is None
+
+
+def test_cache_entry_expires(file_cache, monkeypatch):
+    file_cache.set("ids.devices", "key", "value")
+    future = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: future)
+    assert file_cache.get("ids.devices", "key") is None
+
+
+def test_cache_invalidate(file_cache, tmp_path):
+    file_cache.set("ids.devices", "key", "value")
+    file_cache.set("ids.locations", "key", "value")
+    file_cache.invalidate("ids.devices")
+    other = NautobotFileCache("https://nautobot.example.com", "abc123", 60, cache_dir=str(tmp_path))
+    assert other.get("ids.devices", "key") is None
+    assert other.get("ids.locations", "key") == "value"
+
+
+def test_cache_corrupt_file_is_a_miss(file_cache):
+    file_cache.set("ids.devices", "key", "value")
+    with open(os.path.join(file_cache.path, "ids.devices.json"), "w", encoding="utf-8") as f:
+        f.write("{not json")
+    other = NautobotFileCache("https://nautobot.example.com", "abc123", 60, cache_dir=os.path.dirname(file_cache.path))
+    assert other.get("ids.devices", "key") is None
+
+
+def test_make_key_is_order_independent():
+    assert NautobotFileCache.make_key("url", {"a": 1, "b": 2}) == NautobotFileCache.make_key("url", {"b": 2, "a": 1})
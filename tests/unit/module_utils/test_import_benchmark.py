@@ -0,0 +1,56 @@
+"""Benchmarks of the start time of modules, run in a fresh interpreter like Ansible does."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import subprocess
+import sys
+import timeit
+
+import pytest
+
+pytest.importorskip("ansible_collections.networktocode.nautobot.plugins.module_utils.utils")
+
+MODULES = ["device", "ip_address", "tag"]
+
+# Only needed once the module talks to Nautobot
+HEAVY_IMPORTS = ["requests", "urllib3", "pynautobot.core", "ansible.module_utils.urls"]
+
+
+def run_python(*args):
+    return subprocess.run([sys.executable] + list(args), capture_output=True, text=True, check=False)
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_module_import_defers_heavy_imports(module):
+    process = run_python(
+        "-c",
+        "import json, sys; import ansible_collections.networktocode.nautobot.plugins.modules.%s; "
+        "print(json.dumps([name for name in %r if name in sys.modules]))" % (module, HEAVY_IMPORTS),
+    )
+    assert process.returncode == 0, process.stderr
+    assert json.loads(process.stdout) == []
+
+
+@pytest.mark.benchmark
+def test_module_cold_start_benchmark(tmp_path, capsys):
+    # Missing url and token, the module exits once its arguments are validated
+    args = tmp_path / "args.json"
+    args.write_text(json.dumps({"ANSIBLE_MODULE_ARGS": {"name": "Test"}}))
+
+    timings = dict()
+    for module in MODULES:
+        command = "ansible_collections.networktocode.nautobot.plugins.modules.%s" % module
+        process = run_python("-m", command, str(args))
+        assert json.loads(process.stdout)["msg"] == "missing required arguments: token, url"
+        timings[module] = min(timeit.repeat(lambda: run_python("-m", command, str(args)), number=1, repeat=3))
+
+    with capsys.disabled():
+        print(
+            "\nCold start until argument validation: %s"
+            % ", ".join("%s %.0fms" % (m, t * 1e3) for m, t in timings.items())
+        )
+    # Generous bound, only meant to catch an import becoming pathologically slow
+    assert max(timings.values()) < 5
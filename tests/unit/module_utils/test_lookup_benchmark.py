@@ -0,0 +1,132 @@
+"""Microbenchmarks of the lookup tables used to normalize module data, run with --benchmark."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+import timeit
+from unittest.mock import MagicMock
+
+import pytest
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.dcim import NB_DEVICES
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.utils import (
+        API_APPS_ENDPOINTS,
+        ENDPOINT_TO_APP,
+        NautobotModule,
+    )
+except ImportError:
+    sys.path.append("plugins/module_utils")
+    from dcim import NB_DEVICES
+    from utils import API_APPS_ENDPOINTS, ENDPOINT_TO_APP, NautobotModule
+
+
+class FakeRecord(dict):
+    def __init__(self, query_params):
+        super().__init__(query_params)
+        self.id = "%s-id" % "-".join(str(value) for value in query_params.values())
+
+
+class FakeEndpoint:
+    def __init__(self, app, name):
+        self.name = name
+        self.url = "http://nautobot.local/api/%s/%s" % (app, name)
+
+    def get(self, **query_params):
+        return FakeRecord(query_params)
+
+    def filter(self, **query_params):
+        return [FakeRecord({"name": name}) for name in query_params["name"]]
+
+
+class FakeApp:
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, endpoint):
+        return FakeEndpoint(self.name, endpoint)
+
+
+class FakeApi:
+    """Client answering every lookup without any mock bookkeeping, so only the module code is measured."""
+
+    version = "2.4"
+
+    def __getattr__(self, app):
+        return FakeApp(app)
+
+
+def find_app_scan(endpoint):
+    """The linear scan ENDPOINT_TO_APP replaced."""
+    for k, v in API_APPS_ENDPOINTS.items():
+        if endpoint in v:
+            nb_app = k
+    return nb_app
+
+
+def device_module():
+    module = MagicMock(name="AnsibleModule")
+    module.check_mode = False
+    module.params = {
+        "url": "http://nautobot.local/",
+        "token": "0123456789",
+        "state": "present",
+        "api_version": "2.4",
+        "validate_certs": False,
+        "resolve_workers": 1,
+        "name": "Test Device1",
+        "role": "Core Switch",
+        "device_type": "Cisco Switch",
+        "location": "Test Location",
+        "platform": "Cisco IOS",
+        "tenant": "Test Tenant",
+        "rack": "Test Rack",
+        "status": "Active",
+        "tags": ["Tag%s" % (index) for index in range(10)],
+        "asset_tag": "1001",
+    }
+    return module
+
+
+def test_endpoint_to_app_matches_scan():
+    endpoints = set(endpoint for endpoints in API_APPS_ENDPOINTS.values() for endpoint in endpoints)
+    assert endpoints == set(ENDPOINT_TO_APP)
+    for endpoint in endpoints:
+        assert ENDPOINT_TO_APP[endpoint] == find_app_scan(endpoint), endpoint
+
+
+@pytest.mark.benchmark
+def test_find_app_benchmark(capsys):
+    module = NautobotModule(device_module(), NB_DEVICES, client=FakeApi())
+    endpoints = list(ENDPOINT_TO_APP)
+
+    indexed = min(timeit.repeat(lambda: [module._find_app(e) for e in endpoints], number=100, repeat=3))
+    scanned = min(timeit.repeat(lambda: [find_app_scan(e) for e in endpoints], number=100, repeat=3))
+    with capsys.disabled():
+        print(
+            "\n_find_app over %s endpoints: %.1fus indexed, %.1fus scanned"
+            % (len(endpoints), indexed * 1e6 / 100, scanned * 1e6 / 100)
+        )
+    assert indexed < scanned
+
+
+def test_module_init_fake_api():
+    module = NautobotModule(device_module(), NB_DEVICES, client=FakeApi())
+    assert module.data["location"] == "Test Location-id"
+    assert module.data["tags"] == ["Tag%s-id" % (index) for index in range(10)]
+
+
+@pytest.mark.benchmark
+def test_module_init_benchmark(capsys):
+    client = FakeApi()
+    # Every run resolves the 16 references of the device, nothing is cached across runs
+    number = 200
+    elapsed = min(
+        timeit.repeat(lambda: NautobotModule(device_module(), NB_DEVICES, client=client), number=number, repeat=3)
+    )
+    with capsys.disabled():
+        print("\nNautobotModule.__init__ normalization pipeline: %.1fus per device" % (elapsed * 1e6 / number))
+    # Generous bound, only meant to catch lookups becoming pathologically slow
+    assert elapsed / number < 0.01
@@ -7,31 +7,52 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import json
 import os
+import sys
+import threading
 from functools import partial
 from unittest.mock import MagicMock, patch
+from urllib.parse import urlencode
 
+import pynautobot
 import pytest
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
+from pynautobot.models.dcim import Devices
 
 try:
-    from ansible_collections.networktocode.nautobot.plugins.module_utils.dcim import NB_DEVICES
-    from ansible_collections.networktocode.nautobot.plugins.module_utils.utils import NautobotApiBase, NautobotModule
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.cache import NautobotFileCache
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.dcim import (
+        NB_DEVICES,
+        NB_INTERFACES,
+        NautobotDcimModule,
+    )
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.extras import NB_TAGS, NautobotExtrasModule
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.ipam import (
+        NB_IP_ADDRESSES,
+        NautobotIpamModule,
+    )
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.utils import (
+        NautobotApiBase,
+        NautobotBatchLookup,
+        NautobotModule,
+    )
     from ansible_collections.networktocode.nautobot.tests.test_data import load_test_data
 
     MOCKER_PATCH_PATH = "ansible_collections.networktocode.nautobot.plugins.module_utils.utils.NautobotModule"
 except ImportError:
-    import sys
-
     # Not installed as a collection
     # Try importing relative to root directory of this ansible_modules project
 
     sys.path.append("plugins/module_utils")
     sys.path.append("tests")
-    from dcim import NB_DEVICES
+    from cache import NautobotFileCache
+    from dcim import NB_DEVICES, NB_INTERFACES, NautobotDcimModule
+    from extras import NB_TAGS, NautobotExtrasModule
+    from ipam import NB_IP_ADDRESSES, NautobotIpamModule
     from test_data import load_test_data
-    from utils import NautobotApiBase, NautobotModule
+    from utils import NautobotApiBase, NautobotBatchLookup, NautobotModule
 
     MOCKER_PATCH_PATH = "utils.NautobotModule"
 
@@ -148,6 +169,23 @@ def test_init(mock_module, find_ids_return):
     assert mock_module.data == find_ids_return
 
 
+def test_init_broken_pynautobot(mock_ansible_module, monkeypatch, tmp_path):
+    # Installed, but failing once imported
+    (tmp_path / "broken_pynautobot.py").write_text("import missing_dependency_of_pynautobot\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "broken_pynautobot", raising=False)
+    utils = sys.modules[NautobotModule.__module__]
+    monkeypatch.setattr(utils, "pynautobot", utils.lazy_import("broken_pynautobot"))
+    mock_ansible_module.fail_json.side_effect = SystemExit
+
+    with pytest.raises(SystemExit):
+        NautobotModule(mock_ansible_module, NB_DEVICES)
+
+    kwargs = mock_ansible_module.fail_json.call_args.kwargs
+    assert "pynautobot" in kwargs["msg"]
+    assert "missing_dependency_of_pynautobot" in kwargs["exception"]
+
+
 @pytest.mark.parametrize("before, after", load_relative_test_data("normalize_data"))
 def test_normalize_data_returns_correct_data(mock_module, before, after):
     norm_data = mock_module._normalize_data(before)
@@ -267,14 +305,117 @@ def test_update_object_no_changes(mock_module, obj_mock):
     assert diff is None
 
 
-def test_update_object_with_changes_check_mode_false(mock_module, obj_mock, changed_serialized_obj, on_update_diff):
+def test_update_object_with_changes_check_mode_false(
+    mocker, mock_module, obj_mock, changed_serialized_obj, on_update_diff
+):
     mock_module.nb_object = obj_mock
+    patch_object = mocker.patch.object(mock_module, "_patch_object", return_value=changed_serialized_obj)
     serialized_obj, diff = mock_module._update_object(changed_serialized_obj)
-    obj_mock.update.assert_called_once_with(changed_serialized_obj)
-    assert serialized_obj == obj_mock.serialize()
+    # Only the changed fields are sent
+    patch_object.assert_called_once_with(obj_mock, {"name": "Test Device1 (modified)"})
+    obj_mock.update.assert_not_called()
+    assert serialized_obj == changed_serialized_obj
     assert diff == on_update_diff
 
 
+def test_update_object_patches_changed_fields():
+    api = pynautobot.api("http://nautobot.local", token="0123456789", api_version="2.4")
+    api.http_session = MagicMock(name="http_session")
+    response = api.http_session.patch.return_value
+    response.status_code = 200
+    response.json.return_value = {
+        "id": "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11",
+        "name": "Test Device1",
+        "asset_tag": "2002",
+        "serial": "Set by Nautobot",
+        "location": {
+            "id": LOCATION_ID,
+            "object_type": "dcim.location",
+            "url": "http://nautobot.local/api/dcim/locations/%s/" % LOCATION_ID,
+        },
+        "tags": [],
+    }
+    nb_object = Devices(dict(response.json.return_value, asset_tag="1001", serial=""), api, api.dcim.devices)
+    module = MagicMock(name="AnsibleModule")
+    module.check_mode = False
+    module.params = {
+        "url": "http://nautobot.local/",
+        "token": "0123456789",
+        "state": "present",
+        "api_version": "2.4",
+        "validate_certs": False,
+    }
+    nautobot = NautobotModule(module, NB_DEVICES, client=api)
+    nautobot.nb_object = nb_object
+
+    serialized_obj, diff = nautobot._update_object(
+        {"name": "Test Device1", "asset_tag": "2002", "location": LOCATION_ID}
+    )
+
+    assert api.http_session.patch.call_count == 1
+    args, kwargs = api.http_session.patch.call_args
+    assert args == ("http://nautobot.local/api/dcim/devices/a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11/",)
+    assert kwargs["json"] == {"asset_tag": "2002"}
+    # The object returned by Nautobot is the new state
+    assert serialized_obj["serial"] == "Set by Nautobot"
+    assert serialized_obj["location"] == LOCATION_ID
+    assert diff == {"before": {"asset_tag": "1001"}, "after": {"asset_tag": "2002"}}
+
+
+def test_update_object_lightweight_fetches_full_object():
+    api = pynautobot.api("http://nautobot.local", token="0123456789", api_version="2.4")
+    api.http_session = MagicMock(name="http_session")
+    tag = {
+        "id": TAG_ID,
+        "object_type": "extras.tag",
+        "url": "http://nautobot.local/api/extras/tags/%s/" % TAG_ID,
+    }
+    response = api.http_session.get.return_value
+    response.ok = True
+    response.json.return_value = {
+        "id": "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11",
+        "name": "Test Device1",
+        "asset_tag": "1001",
+        "tags": [tag],
+    }
+    # Looked up with depth=0 and exclude_m2m=True, without its tags
+    nb_object = Devices(
+        {"id": "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11", "name": "Test Device1", "asset_tag": "1001"},
+        api,
+        api.dcim.devices,
+    )
+    module = MagicMock(name="AnsibleModule")
+    module.check_mode = False
+    module.params = {
+        "url": "http://nautobot.local/",
+        "token": "0123456789",
+        "state": "present",
+        "api_version": "2.4",
+        "validate_certs": False,
+        "lightweight_lookups": True,
+    }
+    nautobot = NautobotModule(module, NB_DEVICES, client=api)
+
+    nautobot.nb_object = nb_object
+    assert nautobot._update_object({"name": "Test Device1", "asset_tag": "1001"}) == (nb_object.serialize(), None)
+    api.http_session.get.assert_not_called()
+
+    serialized_obj, diff = nautobot._update_object({"name": "Test Device1", "tags": [TAG_ID]})
+    assert api.http_session.get.call_count == 1
+    args, kwargs = api.http_session.get.call_args
+    assert args == ("http://nautobot.local/api/dcim/devices/a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11/",)
+    assert serialized_obj["tags"] == {TAG_ID}
+    assert diff is None
+
+
+def test_nb_endpoint_get_lightweight(mock_module, endpoint_mock, obj_mock):
+    mock_module.lookup_filters = {"depth": 0, "exclude_m2m": True}
+    endpoint_mock.get.return_value = obj_mock
+
+    assert mock_module._nb_endpoint_get(endpoint_mock, {"name": "Test Device1"}, "Test Device1") == obj_mock
+    endpoint_mock.get.assert_called_once_with(name="Test Device1", depth=0, exclude_m2m=True)
+
+
 def test_update_object_with_changes_check_mode_true(mock_module, obj_mock, changed_serialized_obj, on_update_diff):
     mock_module.nb_object = obj_mock
     mock_module.check_mode = True
@@ -311,6 +452,93 @@ def test_version_check_greater_equal_to_false(mock_module, obj_mock, version):
     assert not mock_module._version_check_greater(version, "2.7", greater_or_equal=True)
 
 
+def test_resolve_id_without_cache(mock_module, endpoint_mock, obj_mock):
+    endpoint_mock.name = "devices"
+    obj_mock.id = "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11"
+    endpoint_mock.get.return_value = obj_mock
+    assert mock_module._resolve_id(endpoint_mock, {"name": "Test"}, "test") == obj_mock.id
+    assert mock_module._resolve_id(endpoint_mock, {"name": "Test"}, "test") == obj_mock.id
+    endpoint_mock.get.assert_called_once_with(name="Test")
+
+    # Resolutions are kept in memory until an object of the endpoint is changed
+    mock_module._invalidate_id_cache()
+    assert mock_module._resolve_id(endpoint_mock, {"name": "Test"}, "test") == obj_mock.id
+    assert endpoint_mock.get.call_count == 2
+
+
+def test_resolve_id_not_found(mock_module, endpoint_mock):
+    endpoint_mock.get.return_value = None
+    assert mock_module._resolve_id(endpoint_mock, {"name": "Test"}, "test") is None
+
+
+def test_resolve_id_uses_cache(mock_module, endpoint_mock, obj_mock, tmp_path):
+    mock_module.cache = NautobotFileCache("http://nautobot.local/", "0123456789", 60, cache_dir=str(tmp_path))
+    endpoint_mock.name = "devices"
+    endpoint_mock.url = "http://nautobot.local/api/dcim/devices"
+    obj_mock.id = "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11"
+    endpoint_mock.get.return_value = obj_mock
+
+    assert mock_module._resolve_id(endpoint_mock, {"name": "Test"}, "test") == obj_mock.id
+    assert mock_module._resolve_id(endpoint_mock, {"name": "Test"}, "test") == obj_mock.id
+    endpoint_mock.get.assert_called_once_with(name="Test")
+
+    # Changing an object of the endpoint invalidates its cached resolutions
+    mock_module._invalidate_id_cache()
+    assert mock_module._resolve_id(endpoint_mock, {"name": "Test"}, "test") == obj_mock.id
+    assert endpoint_mock.get.call_count == 2
+
+
+@pytest.fixture
+def interface_choices():
+    fixture = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "choices", "interfaces.json")
+    with open(fixture, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize(
+    "search, expected",
+    [
+        ("Link Aggregation Group (LAG)", "lag"),
+        ("link aggregation group (lag)", "lag"),
+        ("lag", "lag"),
+        ("1000BASE-T (1GE)", "1000base-t"),
+        ("Virtual", "virtual"),
+    ],
+)
+def test_fetch_choice_value(mock_module, interface_choices, search, expected):
+    mock_module.nb.dcim.interfaces.choices.return_value = interface_choices
+    assert mock_module._fetch_choice_value(search, "interfaces") == expected
+
+
+def test_fetch_choice_value_fetches_choices_once(mock_module, interface_choices):
+    mock_module.nb.dcim.interfaces.choices.return_value = interface_choices
+    mock_module._change_choices_id("interfaces", {"type": "Virtual", "mode": ["Access", "Tagged"]})
+    mock_module._fetch_choice_value("Link Aggregation Group (LAG)", "interfaces")
+    mock_module.nb.dcim.interfaces.choices.assert_called_once()
+
+
+def test_fetch_choice_value_invalid(mock_module, interface_choices):
+    mock_module.nb.dcim.interfaces.choices.return_value = interface_choices
+    mock_module._fetch_choice_value("Not a type", "interfaces")
+    msg = mock_module.module.fail_json.call_args.kwargs["msg"]
+    assert msg.startswith(
+        "Not a type was not found as a valid choice for interfaces, valid choices are: ['virtual', 'lag'"
+    )
+
+
+def test_fetch_choice_value_uses_cache(mock_module, interface_choices, tmp_path):
+    mock_module.cache = NautobotFileCache("http://nautobot.local/", "0123456789", 60, cache_dir=str(tmp_path))
+    mock_module.nb.dcim.interfaces.url = "http://nautobot.local/api/dcim/interfaces"
+    mock_module.nb.dcim.interfaces.choices.return_value = interface_choices
+    assert mock_module._fetch_choice_value("Virtual", "interfaces") == "virtual"
+
+    # A new task only has the on-disk cache to go on
+    mock_module._choices_index = {}
+    mock_module.nb.dcim.interfaces.choices.return_value = {}
+    assert mock_module._fetch_choice_value("Virtual", "interfaces") == "virtual"
+    mock_module.nb.dcim.interfaces.choices.assert_called_once()
+
+
 @given(st.uuids(version=4))
 @settings(suppress_health_check=[HealthCheck(9)])
 def test_get_query_param_id_return_uuid(mock_module, value):
@@ -326,6 +554,584 @@ def test_get_query_param_id_return_int(mock_module, value):
     assert data == value
 
 
+LOCATION_ID = "0e5e6c9b-5c3a-4e2f-9a7c-1e8e9d2a0b11"
+TAG_ID = "5b3c1d2e-8f7a-4c6b-9d0e-1f2a3b4c5d6e"
+MASTER_ID = "7a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d"
+MEMBER_ID = "8b2c3d4e-5f6a-4b7c-9d8e-0f1a2b3c4d5e"
+INTERFACE_ID = "9c3d4e5f-6a7b-4c8d-8e9f-1a2b3c4d5e6f"
+
+
+class FakeRecord(dict):
+    """Minimal stand-in for a pynautobot Record returned by list requests."""
+
+    @property
+    def id(self):
+        return self["id"]
+
+    def __getattr__(self, name):
+        try:
+            value = self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return FakeRecord(value) if isinstance(value, dict) else value
+
+    def serialize(self):
+        return {k: v["id"] if isinstance(v, dict) and "id" in v else v for k, v in self.items()}
+
+
+def fake_device(name, uuid, **kwargs):
+    return FakeRecord(id=uuid, name=name, location={"id": LOCATION_ID, "object_type": "dcim.location"}, **kwargs)
+
+
+def test_validate_object(mock_module):
+    mock_module.module.argument_spec = {
+        "url": {"type": "str"},
+        "state": {"type": "str"},
+        "name": {"type": "str"},
+        "id": {"type": "str"},
+        "enabled": {"type": "bool", "default": True},
+    }
+    mock_module.module.required_if = [("state", "absent", ["id", "objects"], True)]
+
+    assert mock_module._validate_object(0, {"name": "Test"}) == {"name": "Test", "id": None, "enabled": True}
+    mock_module.module.fail_json.assert_not_called()
+
+    mock_module._validate_object(1, {"name": "Test", "url": "http://nautobot.local/"})
+    assert mock_module.module.fail_json.call_args.kwargs["msg"].startswith("objects[1]: ")
+
+    mock_module.state = "absent"
+    mock_module._validate_object(2, {"name": "Test"})
+    assert "id" in mock_module.module.fail_json.call_args.kwargs["msg"]
+
+
+@pytest.mark.parametrize(
+    "query_params, expected",
+    [
+        ({"name": "Test Device1", "location": LOCATION_ID}, True),
+        ({"name": "Test Device2", "location": LOCATION_ID}, False),
+        ({"name": "Test Device1", "location_id": LOCATION_ID}, True),
+        ({"name": "Test Device1", "status": "active"}, True),
+        ({"name": "Test Device1", "location": "Test Location"}, None),
+        ({"name": "Test Device1", "tenant": "Test Tenant"}, None),
+        ({"address": "10.0.0.1/24"}, None),
+    ],
+)
+def test_batch_lookup_match(mock_module, query_params, expected):
+    nb_object = fake_device("Test Device1", "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11", status={"value": "active"})
+    assert NautobotBatchLookup(mock_module).match(nb_object, query_params) is expected
+
+
+def test_batch_lookup_groups_per_endpoint_and_query_params(mock_module, mocker):
+    devices = mocker.Mock(url="http://nautobot.local/api/dcim/devices")
+    devices.filter.return_value = [fake_device("Test Device1", "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11")]
+    tags = mocker.Mock(url="http://nautobot.local/api/extras/tags")
+    tags.filter.return_value = [FakeRecord(id="c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e", name="Foo")]
+
+    lookup = NautobotBatchLookup(mock_module)
+    assert lookup.add(tags, {"name": "Foo"}, "tags") == 0
+    lookup.add(devices, {"name": "Test Device1"}, "device")
+    lookup.add(tags, {"name": "Bar"}, "tags")
+    lookup.add(devices, {"name": "Test Device2"}, "device")
+    lookup.add(devices, {"name": "Test Device1", "location": LOCATION_ID}, "device")
+
+    assert lookup.resolve() == [
+        tags.filter.return_value[0],
+        devices.filter.return_value[0],
+        None,
+        None,
+        devices.filter.return_value[0],
+    ]
+    tags.filter.assert_called_once_with(name=["Bar", "Foo"])
+    assert devices.filter.call_args_list == [
+        ((), {"name": ["Test Device1", "Test Device2"]}),
+        ((), {"location": [LOCATION_ID], "name": ["Test Device1"]}),
+    ]
+
+
+def test_batch_lookup_lightweight(mock_module, mocker):
+    mock_module.lookup_filters = {"depth": 0, "exclude_m2m": True}
+    tags = mocker.Mock(url="http://nautobot.local/api/extras/tags")
+    tags.filter.return_value = [FakeRecord(id="c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e", name="Foo")]
+
+    lookup = NautobotBatchLookup(mock_module)
+    lookup.add(tags, {"name": "Foo"}, "tags")
+    lookup.add(tags, {"name": "Bar"}, "tags")
+
+    assert lookup.resolve() == [tags.filter.return_value[0], None]
+    tags.filter.assert_called_once_with(name=["Bar", "Foo"], depth=0, exclude_m2m=True)
+
+
+def test_batch_lookup_unexplained_object(mock_module, mocker):
+    interfaces = mocker.Mock(url="http://nautobot.local/api/dcim/interfaces")
+    # Ethernet2 belongs to another member of the virtual chassis of the device queried
+    interfaces.filter.return_value = [
+        FakeRecord(id="a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11", name="Ethernet1", device={"id": MASTER_ID}),
+        FakeRecord(id=INTERFACE_ID, name="Ethernet2", device={"id": MEMBER_ID}),
+    ]
+    mock_module._nb_endpoint_get = MagicMock(return_value=interfaces.filter.return_value[1])
+
+    lookup = NautobotBatchLookup(mock_module)
+    lookup.add(interfaces, {"device": MASTER_ID, "name": "Ethernet1"}, "Ethernet1")
+    lookup.add(interfaces, {"device": MASTER_ID, "name": "Ethernet2"}, "Ethernet2")
+
+    assert lookup.resolve() == interfaces.filter.return_value
+    mock_module._nb_endpoint_get.assert_called_once_with(
+        interfaces, {"device": MASTER_ID, "name": "Ethernet2"}, "Ethernet2"
+    )
+
+
+def test_prefetch_ids(mock_module, obj_mock):
+    devices = mock_module.nb.dcim.devices
+    devices.name = "devices"
+    devices.url = "http://nautobot.local/api/dcim/devices"
+    devices.filter.return_value = [fake_device("Test Device1", "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11")]
+    tags = mock_module.nb.extras.tags
+    tags.name = "tags"
+    tags.url = "http://nautobot.local/api/extras/tags"
+    tags.filter.return_value = [
+        FakeRecord(id="c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e", name="Foo"),
+        FakeRecord(id="3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f", name="Bar"),
+    ]
+
+    mock_module._prefetch_ids(
+        [
+            {"name": "Ethernet1", "device": "Test Device1", "tags": ["Foo", "Bar"]},
+            {"name": "Ethernet2", "device": "Test Device1", "tags": ["Foo", LOCATION_ID]},
+        ]
+    )
+
+    devices.filter.assert_called_once_with(name=["Test Device1"])
+    tags.filter.assert_called_once_with(name=["Bar", "Foo"])
+    assert (
+        mock_module._resolve_id(devices, {"name": "Test Device1"}, "device") == "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11"
+    )
+    assert mock_module._resolve_id(tags, {"name": "Bar"}, "tags") == "3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f"
+    devices.get.assert_not_called()
+    tags.get.assert_not_called()
+
+
+def mock_endpoints(mock_module, **names):
+    """Give the mocked endpoints of mock_module a name and URL, as they are used as cache keys."""
+    endpoints = dict()
+    for name, app in names.items():
+        endpoint = getattr(getattr(mock_module.nb, app), name)
+        endpoint.name = name
+        endpoint.url = "http://nautobot.local/api/%s/%s" % (app, name)
+        endpoints[name] = endpoint
+    return endpoints
+
+
+def test_find_ids_resolves_concurrently(mocker, mock_module):
+    # Restore the _find_ids mocked by the mock_module fixture
+    mocker.stopall()
+    endpoints = mock_endpoints(mock_module, locations="dcim", platforms="dcim", tenants="tenancy")
+    mock_module.module.params["resolve_workers"] = 4
+    # Every lookup waits for the others, so this only passes if they run at the same time
+    barrier = threading.Barrier(len(endpoints), timeout=5)
+
+    def get(name):
+        barrier.wait()
+        return FakeRecord(id="%s-id" % name, name=name)
+
+    for endpoint in endpoints.values():
+        endpoint.get.side_effect = get
+    data = mock_module._find_ids(
+        {"name": "Test", "location": "Location", "platform": "Platform", "tenant": "Tenant", "rack": LOCATION_ID},
+        None,
+    )
+
+    assert data == {
+        "name": "Test",
+        "location": "Location-id",
+        "platform": "Platform-id",
+        "tenant": "Tenant-id",
+        "rack": LOCATION_ID,
+    }
+    mock_module.module.fail_json.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "get, msg",
+    [
+        ({"return_value": None}, "Could not resolve id of tenant: Tenant"),
+        (
+            {"side_effect": ValueError("get() returned more than a single result")},
+            "More than one result returned for tenant",
+        ),
+        (
+            {"side_effect": pynautobot.RequestError(MagicMock(status_code=403, text='{"detail": "Forbidden"}'))},
+            '{"detail": "Forbidden"}',
+        ),
+    ],
+)
+def test_find_ids_concurrent_errors(mocker, mock_module, get, msg):
+    mocker.stopall()
+    mock_module.module.params["resolve_workers"] = 4
+    endpoints = mock_endpoints(mock_module, locations="dcim", tenants="tenancy")
+    endpoints["locations"].get.return_value = FakeRecord(id=LOCATION_ID, name="Location")
+    endpoints["tenants"].get.configure_mock(**get)
+    mock_module.module.fail_json.side_effect = SystemExit
+    with pytest.raises(SystemExit):
+        mock_module._find_ids({"name": "Test", "location": "Location", "tenant": "Tenant"}, None)
+
+    # Errors are reported from the main thread with the usual message, without sending the lookup again
+    mock_module.module.fail_json.assert_called_once_with(msg=msg, changed=False)
+    endpoints["tenants"].get.assert_called_once()
+
+
+def test_find_ids_resolves_lists_with_one_request(mocker, mock_module):
+    mocker.stopall()
+    tags = mock_endpoints(mock_module, tags="extras")["tags"]
+    tags.filter.return_value = [
+        FakeRecord(id="c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e", name="Foo"),
+        FakeRecord(id="3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f", name="Bar"),
+    ]
+    data = mock_module._find_ids({"name": "Test", "tags": ["Foo", LOCATION_ID, "Bar", "Foo"]}, None)
+
+    assert data["tags"] == [
+        "c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e",
+        LOCATION_ID,
+        "3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f",
+        "c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e",
+    ]
+    tags.filter.assert_called_once_with(name=["Bar", "Foo"])
+    tags.get.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "candidates, msg",
+    [
+        ([FakeRecord(id="c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e", name="Foo")], "Bar not found"),
+        (
+            [
+                FakeRecord(id="c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e", name="Foo"),
+                FakeRecord(id="3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f", name="Bar"),
+                FakeRecord(id="a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11", name="Bar"),
+            ],
+            "More than one result returned for tags",
+        ),
+    ],
+)
+def test_find_ids_list_errors(mocker, mock_module, candidates, msg):
+    mocker.stopall()
+    tags = mock_endpoints(mock_module, tags="extras")["tags"]
+    tags.filter.return_value = candidates
+    mock_module.module.fail_json.side_effect = SystemExit
+    with pytest.raises(SystemExit):
+        mock_module._find_ids({"name": "Test", "tags": ["Foo", "Bar"]}, None)
+
+    # Missing and ambiguous items are detected from the list response
+    mock_module.module.fail_json.assert_called_once_with(msg=msg, changed=False)
+    tags.get.assert_not_called()
+
+
+def test_batch_lookup_chunks_by_query_length(mock_module, endpoint_mock):
+    names = ["Test Device with a rather long name %s" % (index) for index in range(200)]
+    endpoint_mock.filter.side_effect = lambda name: [fake_device(value, "%s-id" % value) for value in name]
+    lookup = NautobotBatchLookup(mock_module)
+    for name in names:
+        lookup.add(endpoint_mock, {"name": name}, "device")
+
+    assert [nb_object.id for nb_object in lookup.resolve()] == ["%s-id" % name for name in names]
+    # 50 of these names don't fit in a single query string
+    assert endpoint_mock.filter.call_count > 200 / 50
+    for call in endpoint_mock.filter.call_args_list:
+        assert len(urlencode(call.kwargs, doseq=True)) <= 2000
+
+
+def test_bulk_get_existing_uses_a_single_list_request(mock_module, endpoint_mock):
+    device1 = fake_device("Test Device1", "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11")
+    device2 = fake_device("Test Device2", "c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e")
+    endpoint_mock.filter.return_value = [device2, device1]
+    queries = [{"name": name, "location": LOCATION_ID} for name in ("Test Device1", "Test Device2", "Test Device3")]
+
+    nb_objects = mock_module._bulk_get_existing(
+        endpoint_mock, queries, ["Test Device1", "Test Device2", "Test Device3"]
+    )
+
+    assert nb_objects == [device1, device2, None]
+    endpoint_mock.filter.assert_called_once_with(
+        name=["Test Device1", "Test Device2", "Test Device3"], location=[LOCATION_ID]
+    )
+    endpoint_mock.get.assert_not_called()
+
+
+def test_bulk_get_existing_falls_back_to_get(mock_module, endpoint_mock, obj_mock):
+    endpoint_mock.filter.return_value = [fake_device("Test Device1", "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11")]
+    endpoint_mock.get.return_value = obj_mock
+
+    nb_objects = mock_module._bulk_get_existing(
+        endpoint_mock, [{"name": "Test Device1", "location": "Test Location"}, {"q": "Test"}], ["Test Device1", "Test"]
+    )
+
+    assert nb_objects == [obj_mock, obj_mock]
+    assert endpoint_mock.get.call_count == 2
+
+
+def test_bulk_get_existing_more_than_one_result(mock_module, endpoint_mock):
+    endpoint_mock.filter.return_value = [
+        fake_device("Test Device1", "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11"),
+        fake_device("Test Device1", "c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e"),
+    ]
+    mock_module._bulk_get_existing(endpoint_mock, [{"name": "Test Device1"}], ["Test Device1"])
+    mock_module.module.fail_json.assert_called_once_with(
+        msg="More than one result returned for Test Device1", changed=False
+    )
+
+
+def test_run_bulk_present(mock_module, endpoint_mock):
+    device1 = fake_device("Test Device1", "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11", asset_tag="1001")
+    device2 = fake_device("Test Device2", "c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e", asset_tag="1002")
+    endpoint_mock.filter.return_value = [device1, device2]
+    endpoint_mock.update.return_value = [fake_device("Test Device2", device2.id, asset_tag="2002")]
+    endpoint_mock.create.return_value = [fake_device("Test Device3", "3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f")]
+    mock_module.objects_data = [
+        {"name": "Test Device1", "location": LOCATION_ID, "asset_tag": "1001"},
+        {"name": "Test Device2", "location": LOCATION_ID, "asset_tag": "2002"},
+        {"name": "Test Device3", "location": LOCATION_ID},
+    ]
+    mock_module.objects_params = [dict() for data in mock_module.objects_data]
+
+    mock_module._run_bulk(endpoint_mock, "device")
+
+    endpoint_mock.filter.assert_called_once()
+    endpoint_mock.create.assert_called_once_with([mock_module.objects_data[2]])
+    endpoint_mock.update.assert_called_once_with([{"asset_tag": "2002", "id": device2.id}])
+    endpoint_mock.delete.assert_not_called()
+    result = mock_module.module.exit_json.call_args.kwargs
+    assert result["changed"] is True
+    assert result["msg"] == "device: 1 created, 1 updated, 0 deleted, 1 unchanged"
+    assert [item["changed"] for item in result["objects"]] == [False, True, True]
+    assert result["objects"][1]["device"]["asset_tag"] == "2002"
+    assert result["objects"][2]["device"]["id"] == "3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f"
+    assert result["diff"][0] == {
+        "before": {"asset_tag": "1002"},
+        "after": {"asset_tag": "2002"},
+        "before_header": "Test Device2",
+        "after_header": "Test Device2",
+    }
+
+
+def test_run_bulk_lightweight_fetches_full_objects(mock_module, endpoint_mock):
+    mock_module.lookup_filters = {"depth": 0, "exclude_m2m": True}
+    # Looked up without their tags
+    device1 = fake_device("Test Device1", "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11", asset_tag="1001")
+    device2 = fake_device("Test Device2", "c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e", asset_tag="1002")
+    endpoint_mock.filter.return_value = [device1, device2]
+    full_devices = {
+        device1.id: fake_device("Test Device1", device1.id, asset_tag="1001", tags=[TAG_ID]),
+        device2.id: fake_device("Test Device2", device2.id, asset_tag="1002", tags=[]),
+    }
+    mock_module._fetch_full_object = MagicMock(side_effect=lambda nb_object: full_devices[nb_object.id])
+    endpoint_mock.update.return_value = [fake_device("Test Device2", device2.id, asset_tag="1002", tags=[TAG_ID])]
+    mock_module.objects_data = [
+        {"name": "Test Device1", "location": LOCATION_ID, "tags": [TAG_ID]},
+        {"name": "Test Device2", "location": LOCATION_ID, "tags": [TAG_ID]},
+    ]
+    mock_module.objects_params = [dict() for data in mock_module.objects_data]
+
+    mock_module._run_bulk(endpoint_mock, "device")
+
+    assert mock_module._fetch_full_object.call_count == 2
+    endpoint_mock.update.assert_called_once_with([{"tags": [TAG_ID], "id": device2.id}])
+    result = mock_module.module.exit_json.call_args.kwargs
+    assert result["msg"] == "device: 0 created, 1 updated, 0 deleted, 1 unchanged"
+
+
+def test_run_bulk_absent_in_chunks(mock_module, endpoint_mock):
+    devices = [
+        fake_device("Test Device%s" % index, uuid)
+        for index, uuid in enumerate(
+            [
+                "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11",
+                "c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e",
+                "3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f",
+            ]
+        )
+    ]
+    endpoint_mock.filter.return_value = devices
+    mock_module.state = "absent"
+    mock_module.module.params["bulk_chunk_size"] = 2
+    mock_module.objects_data = [{"name": device["name"], "location": LOCATION_ID} for device in devices]
+    mock_module.objects_data.append({"name": "Test Device9", "location": LOCATION_ID})
+    mock_module.objects_params = [dict() for data in mock_module.objects_data]
+
+    mock_module._run_bulk(endpoint_mock, "device")
+
+    assert endpoint_mock.delete.call_args_list == [
+        ((["a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11", "c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e"],),),
+        ((["3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f"],),),
+    ]
+    result = mock_module.module.exit_json.call_args.kwargs
+    assert result["msg"] == "device: 0 created, 0 updated, 3 deleted, 1 unchanged"
+    assert result["objects"][3] == {"changed": False, "msg": "device Test Device9 already absent", "device": None}
+
+
+def test_run_bulk_check_mode(mock_module, endpoint_mock):
+    endpoint_mock.filter.return_value = []
+    mock_module.check_mode = True
+    mock_module.objects_data = [{"name": "Test Device1", "location": LOCATION_ID}]
+
+    mock_module._run_bulk(endpoint_mock, "device")
+
+    endpoint_mock.create.assert_not_called()
+    result = mock_module.module.exit_json.call_args.kwargs
+    assert result["changed"] is True
+    assert result["objects"][0]["device"] == mock_module.objects_data[0]
+
+
+def test_run_bulk_failure(mock_module, endpoint_mock):
+    mock_module.retry_stats = {"retries": 1}
+    endpoint_mock.filter.return_value = []
+    response = MagicMock(status_code=400, reason="Bad Request", text='{"name": ["Invalid"]}')
+    endpoint_mock.create.side_effect = pynautobot.RequestError(response)
+    mock_module.objects_data = [{"name": "Test Device1", "location": LOCATION_ID}]
+    mock_module.module.fail_json.side_effect = SystemExit
+
+    with pytest.raises(SystemExit):
+        mock_module._run_bulk(endpoint_mock, "device")
+
+    mock_module.module.fail_json.assert_called_once_with(
+        msg='{"name": ["Invalid"]} (0 of 1 changes applied)', changed=False, nautobot_retries={"retries": 1}
+    )
+
+
+@pytest.mark.parametrize("client_failed", [False, True])
+def test_run_bulk_async_client(mock_module, endpoint_mock, client_failed):
+    created = [fake_device("Test Device1", "3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f")]
+    endpoint_mock.filter.return_value = []
+    endpoint_mock.create.return_value = created
+    mock_module.module.params["async_client"] = True
+    # None when the asyncio client itself failed
+    mock_module._send_bulk_async = MagicMock(return_value=None if client_failed else [created])
+    mock_module.objects_data = [{"name": "Test Device1", "location": LOCATION_ID}]
+    mock_module.objects_params = [dict()]
+
+    mock_module._run_bulk(endpoint_mock, "device")
+
+    mock_module._send_bulk_async.assert_called_once_with(endpoint_mock, [("create", [0], mock_module.objects_data)])
+    assert endpoint_mock.create.called is client_failed
+    result = mock_module.module.exit_json.call_args.kwargs
+    assert result["objects"][0]["device"]["id"] == "3d9c1f0e-7a2b-4c8d-9e1f-0a2b3c4d5e6f"
+
+
+@pytest.mark.parametrize("update_vc_child", [True, False])
+def test_run_bulk_virtual_chassis_interface(mocker, mock_ansible_module, endpoint_mock, update_vc_child):
+    mocker.patch("%s%s" % (MOCKER_PATCH_PATH, "._find_ids"))
+    client = mocker.Mock(name="pynautobot.api")
+    client.version = "2.10"
+    client.dcim.devices.get.return_value = {"virtual_chassis": {"id": "c5d6e7f8-a9b0-4c1d-9e2f-3a4b5c6d7e8f"}}
+    nautobot = NautobotDcimModule(mock_ansible_module, NB_INTERFACES, client=client)
+    # The interface is found on another member of the virtual chassis of the device
+    endpoint_mock.filter.return_value = [
+        FakeRecord(id=INTERFACE_ID, name="Ethernet1", device={"id": MEMBER_ID}, description="")
+    ]
+    endpoint_mock.update.return_value = []
+    nautobot.objects_data = [{"device": MASTER_ID, "name": "Ethernet1", "description": "Uplink"}]
+    nautobot.objects_params = [{"module": None, "update_vc_child": update_vc_child}]
+    nautobot._nb_endpoint_get = MagicMock(return_value=endpoint_mock.filter.return_value[0])
+
+    nautobot._run_bulk(endpoint_mock, "interface")
+
+    client.dcim.devices.get.assert_called_once_with(MEMBER_ID)
+    if update_vc_child:
+        endpoint_mock.update.assert_called_once_with([{"description": "Uplink", "id": INTERFACE_ID}])
+    else:
+        nautobot.module.fail_json.assert_any_call(
+            msg="Must set update_vc_child to True to allow child device interface modification", changed=False
+        )
+
+
+def test_bulk_color_lowercase(mocker, mock_ansible_module):
+    mocker.patch("%s%s" % (MOCKER_PATCH_PATH, "._find_ids"))
+    client = mocker.Mock(name="pynautobot.api")
+    client.version = "2.10"
+    mock_ansible_module.params["objects"] = [{"name": "Foo", "color": "FF0000"}]
+    nautobot = NautobotExtrasModule(mock_ansible_module, NB_TAGS, client=client)
+    nautobot.objects_data = [{"name": "Foo", "color": "FF0000"}, {"name": "Bar"}]
+    nautobot._run_bulk = MagicMock()
+
+    nautobot.run()
+
+    nautobot._run_bulk.assert_called_once()
+    assert nautobot.objects_data == [{"name": "Foo", "color": "ff0000"}, {"name": "Bar"}]
+
+
+@pytest.mark.parametrize(
+    "state, item, msg",
+    [
+        ("new", {"address": "10.0.0.1/24"}, "state new can't be used with objects, use state present"),
+        (
+            "present",
+            {"address": "10.0.0.1/24", "parent": "10.0.0.0/24"},
+            "parent can't be used with objects, set the address of every item instead",
+        ),
+    ],
+)
+def test_bulk_ip_address_unsupported(mocker, mock_ansible_module, state, item, msg):
+    mocker.patch("%s%s" % (MOCKER_PATCH_PATH, "._find_ids"))
+    client = mocker.Mock(name="pynautobot.api")
+    client.version = "2.10"
+    mock_ansible_module.params["objects"] = [item]
+    nautobot = NautobotIpamModule(mock_ansible_module, NB_IP_ADDRESSES, client=client)
+    mock_ansible_module.fail_json = MagicMock(side_effect=SystemExit)
+    nautobot.state = state
+    nautobot.objects_data = [dict(item)]
+    nautobot.objects_params = [dict(item)]
+    nautobot._run_bulk = MagicMock()
+
+    with pytest.raises(SystemExit):
+        nautobot.run()
+
+    mock_ansible_module.fail_json.assert_called_once_with(msg=msg, changed=False)
+    nautobot._run_bulk.assert_not_called()
+
+
+@pytest.fixture
+def version_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys.modules[NautobotFileCache.__module__], "CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_connect_api_skips_version_probe_with_api_version(mock_module, mocker, version_cache_dir):
+    api = mocker.patch("%s.pynautobot.api" % MOCKER_PATCH_PATH.rsplit(".", 1)[0])
+    version = mocker.PropertyMock(return_value="2.4")
+    type(api.return_value).version = version
+
+    mock_module._connect_api("http://nautobot.local/", "0123456789", False, "2.1")
+
+    assert mock_module.version == "2.1"
+    version.assert_not_called()
+
+
+def test_connect_api_caches_version(mock_module, mocker, version_cache_dir):
+    api = mocker.patch("%s.pynautobot.api" % MOCKER_PATCH_PATH.rsplit(".", 1)[0])
+    version = mocker.PropertyMock(return_value="2.4")
+    type(api.return_value).version = version
+    mock_module.module.params["cache_ttl"] = 60
+
+    mock_module._connect_api("http://nautobot.local/", "0123456789", False, None)
+    mock_module.version = None
+    # The version is shared by every token talking to the same Nautobot instance
+    mock_module._connect_api("http://nautobot.local", "9876543210", False, None)
+
+    assert mock_module.version == "2.4"
+    version.assert_called_once()
+
+
+def test_connect_api_version_cache_disabled(mock_module, mocker, version_cache_dir):
+    api = mocker.patch("%s.pynautobot.api" % MOCKER_PATCH_PATH.rsplit(".", 1)[0])
+    version = mocker.PropertyMock(return_value="2.4")
+    type(api.return_value).version = version
+
+    mock_module._connect_api("http://nautobot.local/", "0123456789", False, None)
+    mock_module._connect_api("http://nautobot.local/", "0123456789", False, None)
+
+    assert mock_module.version == "2.4"
+    assert version.call_count == 2
+    assert list(version_cache_dir.iterdir()) == []
+
+
 @patch.dict(os.environ, {})
 def test_validate_certs_defaults_true():
     """Test that the default SSL verify is set as true and no environment variable is set."""
@@ -0,0 +1,280 @@
+"""Tests for the retries and rate limiting of the requests sent to Nautobot."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.module_utils import retry
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.broker import NautobotBroker, use_broker
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.dcim import NB_DEVICES, NautobotDcimModule
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.retry import (
+        NautobotRateLimiter,
+        NautobotRetryAdapter,
+        use_retries,
+    )
+except ImportError:
+    sys.path.append("plugins/module_utils")
+    import retry
+    from broker import NautobotBroker, use_broker
+    from dcim import NB_DEVICES, NautobotDcimModule
+    from retry import NautobotRateLimiter, NautobotRetryAdapter, use_retries
+
+
+class FakeAdapter(BaseAdapter):
+    """Adapter answering requests with the statuses, or raising the exceptions, it is given in order."""
+
+    def __init__(self, *answers):
+        super(FakeAdapter, self).__init__()
+        self.answers = list(answers)
+        self.requests = list()
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        status, headers = answer if isinstance(answer, tuple) else (answer, {})
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = b"{}"
+        response._content_consumed = True
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = list()
+    monkeypatch.setattr(retry.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def send(adapter, method="GET"):
+    request = requests.Request(method, "http://nautobot.local/api/dcim/devices/").prepare()
+    return adapter.send(request, timeout=None)
+
+
+def test_retry_until_success(sleeps):
+    adapter = NautobotRetryAdapter(FakeAdapter(503, 429, 200), retries=3, backoff=0.5)
+
+    assert send(adapter).status_code == 200
+    assert adapter.stats["retries"] == 2
+    assert len(sleeps) == 2
+    # Full jitter, the second retry waits up to twice the backoff
+    assert 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+
+
+def test_retry_gives_up(sleeps):
+    adapter = NautobotRetryAdapter(FakeAdapter(502, 502, 502), retries=2, backoff=0.5)
+
+    assert send(adapter).status_code == 502
+    assert adapter.stats["retries"] == 2
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"Retry-After": "3"}, 3),
+        ({"Retry-After": "3600"}, retry.RETRY_MAX_BACKOFF),
+        ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0),
+    ],
+)
+def test_retry_after(sleeps, headers, expected):
+    adapter = NautobotRetryAdapter(FakeAdapter((429, headers), 200), retries=1, backoff=0.5)
+
+    assert send(adapter).status_code == 200
+    assert sleeps == [expected]
+    assert adapter.stats["retry_wait"] == expected
+
+
+@pytest.mark.parametrize("method", ["POST", "PATCH", "PUT", "DELETE"])
+@pytest.mark.parametrize("status, retried", [(429, True), (503, True), (502, False), (504, False)])
+def test_retry_writes(sleeps, method, status, retried):
+    fake = FakeAdapter(status, 201)
+    adapter = NautobotRetryAdapter(fake, retries=1, backoff=0)
+
+    assert send(adapter, method).status_code == (201 if retried else status)
+    assert len(fake.requests) == (2 if retried else 1)
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD", "OPTIONS"])
+def test_retry_reads_on_gateway_errors(sleeps, method):
+    fake = FakeAdapter(502, 504, 200)
+    adapter = NautobotRetryAdapter(fake, retries=2, backoff=0)
+
+    assert send(adapter, method).status_code == 200
+    assert len(fake.requests) == 3
+
+
+def test_retried_delete_already_applied(sleeps):
+    # The first attempt was applied, but answered with an error
+    adapter = NautobotRetryAdapter(FakeAdapter(503, 404), retries=1, backoff=0)
+    assert send(adapter, "DELETE").status_code == 204
+
+    adapter = NautobotRetryAdapter(FakeAdapter(404), retries=1, backoff=0)
+    assert send(adapter, "DELETE").status_code == 404
+
+
+def test_retry_connection_errors_of_get_only(sleeps):
+    adapter = NautobotRetryAdapter(FakeAdapter(requests.exceptions.ConnectionError(), 200), retries=1, backoff=0)
+    assert send(adapter).status_code == 200
+
+    adapter = NautobotRetryAdapter(FakeAdapter(requests.exceptions.ConnectionError(), 200), retries=1, backoff=0)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        send(adapter, "PATCH")
+
+
+def test_rate_limiter_shared_between_tasks(tmp_path):
+    # Each task has its own limiter, they only share the bucket file
+    tasks = [NautobotRateLimiter("http://nautobot.local/", rate=10, path=str(tmp_path)) for index in range(3)]
+    waits = [task.reserve() for task in tasks]
+
+    assert waits[0] == 0
+    assert waits[1] == pytest.approx(0.1, abs=0.01)
+    assert waits[2] == pytest.approx(0.2, abs=0.01)
+    other = NautobotRateLimiter("http://other.local/", rate=10, path=str(tmp_path))
+    assert other.reserve() == 0
+
+
+def test_use_retries_wraps_mounted_adapters(sleeps, tmp_path):
+    session = requests.Session()
+    fake = FakeAdapter(503, 200, 503, 200)
+    session.mount("http://", fake)
+    session.mount("https://", fake)
+    limiter = NautobotRateLimiter("http://nautobot.local/", rate=1000, path=str(tmp_path))
+
+    stats = use_retries(session, 1, 0, limiter)
+    session.get("http://nautobot.local/api/")
+    session.get("https://nautobot.local/api/")
+
+    assert stats["retries"] == 2
+    assert len(fake.requests) == 4
+
+
+def device_module(**params):
+    module = MagicMock(name="AnsibleModule")
+    module.check_mode = False
+    module.params = {
+        "url": "http://nautobot.local/",
+        "token": "0123456789",
+        "state": "present",
+        "api_version": "2.4",
+        "validate_certs": False,
+        "name": "core1",
+    }
+    module.params.update(params)
+    return module
+
+
+def test_module_result_has_retries(sleeps):
+    client = MagicMock(name="pynautobot.api")
+    client.version = "2.4"
+    nautobot = NautobotDcimModule(device_module(max_retries=2), NB_DEVICES, client=client)
+    session = requests.Session()
+    session.mount("http://", FakeAdapter(503, 200))
+    nautobot._use_retries(session, "http://nautobot.local/")
+    session.get("http://nautobot.local/api/dcim/devices/")
+
+    nautobot.result = {"changed": False}
+    nautobot._exit_json()
+    nautobot.module.exit_json.assert_called_once_with(
+        changed=False, nautobot_retries={"retries": 1, "retry_wait": sleeps[0], "rate_limit_wait": 0.0}
+    )
+
+    nautobot._handle_errors("Request failed")
+    nautobot.module.fail_json.assert_called_once_with(
+        msg="Request failed", changed=False, nautobot_retries=nautobot.retry_stats
+    )
+
+
+def test_module_retries_disabled_by_default():
+    client = MagicMock(name="pynautobot.api")
+    client.version = "2.4"
+    nautobot = NautobotDcimModule(device_module(), NB_DEVICES, client=client)
+    session = requests.Session()
+    nautobot._use_retries(session, "http://nautobot.local/")
+
+    assert nautobot.retry_stats is None
+    assert not isinstance(session.get_adapter("http://"), NautobotRetryAdapter)
+    nautobot.result = {"changed": False}
+    nautobot._exit_json()
+    nautobot.module.exit_json.assert_called_once_with(changed=False)
+
+
+@pytest.mark.parametrize(
+    "params, msg",
+    [
+        ({"max_retries": -1}, "max_retries must be greater than or equal to 0"),
+        ({"retry_backoff": -1.0}, "retry_backoff must be greater than or equal to 0"),
+        ({"rate_limit": 0.0}, "rate_limit must be greater than 0"),
+    ],
+)
+def test_module_retries_invalid_options(params, msg):
+    client = MagicMock(name="pynautobot.api")
+    client.version = "2.4"
+    nautobot = NautobotDcimModule(device_module(**params), NB_DEVICES, client=client)
+    nautobot.module.fail_json.side_effect = SystemExit
+
+    with pytest.raises(SystemExit):
+        nautobot._use_retries(requests.Session(), "http://nautobot.local/")
+    nautobot.module.fail_json.assert_called_once_with(msg=msg, changed=False)
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Answer 503 to the first request, then 200."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        self.server.requests += 1
+        status = 503 if self.server.requests == 1 else 200
+        payload = json.dumps({"attempt": self.server.requests}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_retry_through_broker(tmp_path, sleeps):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    broker = NautobotBroker(str(tmp_path / "broker.sock"), idle_timeout=30)
+    broker.timeout = 0.1
+    broker_thread = threading.Thread(target=broker.serve_until_idle, daemon=True)
+    broker_thread.start()
+    try:
+        session = requests.Session()
+        use_broker(session, broker.server_address)
+        stats = use_retries(session, retries=2, backoff=0.5)
+
+        response = session.get("http://127.0.0.1:%s/api/" % server.server_address[1])
+
+        assert response.status_code == 200
+        assert response.json() == {"attempt": 2}
+        assert stats["retries"] == 1
+    finally:
+        broker.idle_timeout = 0
+        broker_thread.join()
+        broker.server_close()
+        server.shutdown()
+        server.server_close()
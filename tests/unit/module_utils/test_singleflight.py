@@ -0,0 +1,122 @@
+"""Tests for the coalescing of identical concurrent calls."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.singleflight import NautobotSingleFlight
+except ImportError:
+    import sys
+
+    sys.path.append("plugins/module_utils")
+    from singleflight import NautobotSingleFlight
+
+
+@pytest.fixture
+def singleflight(tmp_path):
+    return NautobotSingleFlight("http://nautobot.local/", "0123456789", path=str(tmp_path))
+
+
+def test_singleflight_coalesces_concurrent_calls(singleflight):
+    calls = list()
+
+    def get():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"id": "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11", "name": "core1"}
+
+    # flock locks conflict between file descriptions, so threads behave like forks here
+    results = [None] * 5
+
+    def run(index):
+        results[index] = singleflight.do(("http://nautobot.local/api/dcim/devices/", {"name": "core1"}), get)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"id": "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11", "name": "core1"}] * 5
+
+
+def test_singleflight_separates_keys_and_tokens(singleflight, tmp_path):
+    assert singleflight.do(("devices", {"name": "core1"}), lambda: 1) == 1
+    assert singleflight.do(("devices", {"name": "core2"}), lambda: 2) == 2
+    other_token = NautobotSingleFlight("http://nautobot.local/", "9876543210", path=str(tmp_path))
+    assert other_token.do(("devices", {"name": "core1"}), lambda: 3) == 3
+
+
+def test_singleflight_completed_call_not_reused(singleflight):
+    # Calls made once an identical call completed, e.g. after the object was created, are sent
+    assert singleflight.do("key", lambda: None) is None
+    assert singleflight.do("key", lambda: 2) == 2
+
+
+def test_singleflight_failed_call_not_shared(singleflight):
+    def fail():
+        raise ValueError("get() returned more than a single result")
+
+    with pytest.raises(ValueError):
+        singleflight.do("key", fail)
+    assert singleflight.do("key", lambda: None) is None
+
+
+def test_singleflight_sweeps_old_results(singleflight, tmp_path):
+    old = tmp_path / "old.json"
+    old.write_text("{}")
+    os.utime(str(old), (0, 0))
+    singleflight.do("key", lambda: 1)
+    assert not old.exists()
+    assert len(os.listdir(str(tmp_path))) == 1
+
+
+def test_module_endpoint_get_coalesced(tmp_path):
+    try:
+        from ansible_collections.networktocode.nautobot.plugins.module_utils.dcim import NB_DEVICES
+        from ansible_collections.networktocode.nautobot.plugins.module_utils.utils import NautobotModule
+    except ImportError:
+        from dcim import NB_DEVICES
+        from utils import NautobotModule
+
+    module = MagicMock(name="AnsibleModule")
+    module.check_mode = False
+    module.params = {
+        "url": "http://nautobot.local/",
+        "token": "0123456789",
+        "state": "present",
+        "api_version": "2.4",
+        "validate_certs": False,
+        "coalesce_requests": True,
+        "name": "core1",
+    }
+    client = MagicMock(name="pynautobot.api")
+    client.version = "2.4"
+    nautobot = NautobotModule(module, NB_DEVICES, client=client)
+    nautobot.singleflight.path = str(tmp_path)
+
+    endpoint = MagicMock(name="devices")
+    endpoint.url = "http://nautobot.local/api/dcim/devices"
+    endpoint.get.return_value = {"id": "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11", "name": "core1"}
+    endpoint.return_obj = lambda record, api, endpoint: SimpleNamespace(**record)
+
+    nb_object = nautobot._nb_endpoint_get(endpoint, {"name": "core1"}, "core1")
+    assert nb_object.id == "a5f1e8c2-1a1d-4b3b-9f1c-7d1c9e3c3b11"
+    endpoint.get.assert_called_once_with(name="core1")
+
+    endpoint.get.return_value = None
+    assert nautobot._nb_endpoint_get(endpoint, {"name": "core2"}, "core2") is None
+
+    # Once created by this task, or another one, the next lookup finds the object
+    endpoint.get.return_value = {"id": "b6e2f9d3-2b2e-4c4c-8a2d-8e2d0f4d4c22", "name": "core2"}
+    assert nautobot._nb_endpoint_get(endpoint, {"name": "core2"}, "core2").name == "core2"
@@ -0,0 +1,130 @@
+"""Tests for the snapshots of endpoints used in check mode."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.cache import NautobotFileCache
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.dcim import NB_INTERFACES
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.snapshot import NautobotSnapshot
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.utils import NautobotModule
+except ImportError:
+    sys.path.append("plugins/module_utils")
+    from cache import NautobotFileCache
+    from dcim import NB_INTERFACES
+    from snapshot import NautobotSnapshot
+    from utils import NautobotModule
+
+DEVICE_ID = "0e5e6c9b-5c3a-4e2f-9a7c-1e8e9d2a0b11"
+OTHER_DEVICE_ID = "c1d0e2b4-3f5a-4b6c-8d7e-9f0a1b2c3d4e"
+
+
+def interface(name, device_id=DEVICE_ID, **kwargs):
+    record = {
+        "id": "%s-id" % name,
+        "name": name,
+        "device": {"id": device_id, "object_type": "dcim.device", "url": "http://nautobot.local/api/dcim/devices/"},
+        "type": {"value": "1000base-t", "label": "1000BASE-T"},
+    }
+    record.update(kwargs)
+    return record
+
+
+def match(record, query_params):
+    """Simplified NautobotBatchLookup.match, comparing names and device IDs only."""
+    for key, value in query_params.items():
+        if key == "device_id":
+            current = record["device"]["id"]
+        elif key == "name":
+            current = record["name"]
+        else:
+            return None
+        if current != value:
+            return False
+    return True
+
+
+@pytest.fixture
+def snapshot():
+    return NautobotSnapshot([interface("Ethernet%s" % (index)) for index in range(100)], MagicMock(side_effect=match))
+
+
+def test_snapshot_get_uses_index(snapshot):
+    assert snapshot.get({"name": "Ethernet42", "device_id": DEVICE_ID}) == (True, snapshot.records[42])
+    # Only the record with the same name is compared
+    assert snapshot.match.call_count == 1
+    assert snapshot.get({"name": "Ethernet100", "device_id": DEVICE_ID}) == (True, None)
+
+
+def test_snapshot_get_unanswerable(snapshot):
+    assert snapshot.get({"name": "Ethernet1", "module": "Module1"}) == (False, None)
+    assert snapshot.get({"name": ["Ethernet1"]}) == (False, None)
+
+
+def test_snapshot_get_ambiguous(snapshot):
+    snapshot.records.append(interface("Ethernet1"))
+    with pytest.raises(ValueError):
+        snapshot.get({"name": "Ethernet1", "device_id": DEVICE_ID})
+
+
+def test_snapshot_does_not_index_missing_fields(snapshot):
+    assert snapshot._index("device_id") is None
+    assert snapshot._index("type") is None
+    assert snapshot.get({"device_id": OTHER_DEVICE_ID}) == (True, None)
+
+
+@pytest.fixture
+def interfaces_endpoint():
+    endpoint = MagicMock(name="interfaces")
+    endpoint.name = "interfaces"
+    endpoint.url = "http://nautobot.local/api/dcim/interfaces"
+    endpoint.filter.return_value = [interface("Ethernet1"), interface("Ethernet2", description="Uplink")]
+    endpoint.return_obj = lambda record, api, endpoint: SimpleNamespace(**record)
+    return endpoint
+
+
+def interface_module(cache_dir, check_mode=True):
+    module = MagicMock(name="AnsibleModule")
+    module.check_mode = check_mode
+    module.params = {
+        "url": "http://nautobot.local/",
+        "token": "0123456789",
+        "state": "present",
+        "api_version": "2.4",
+        "validate_certs": False,
+        "snapshot_ttl": 60,
+        "name": "Ethernet1",
+        "device": DEVICE_ID,
+    }
+    client = MagicMock(name="pynautobot.api")
+    client.version = "2.4"
+    nautobot = NautobotModule(module, NB_INTERFACES, client=client)
+    if nautobot.snapshot_cache:
+        nautobot.snapshot_cache = NautobotFileCache("http://nautobot.local/", "0123456789", 60, cache_dir=cache_dir)
+    return nautobot
+
+
+def test_module_snapshot_shared_between_tasks(interfaces_endpoint, tmp_path):
+    for name in ("Ethernet1", "Ethernet2", "Ethernet3"):
+        nautobot = interface_module(str(tmp_path))
+        nb_object = nautobot._nb_endpoint_get(interfaces_endpoint, {"name": name, "device_id": DEVICE_ID}, name)
+        assert (nb_object.id if nb_object else None) == ("%s-id" % name if name != "Ethernet3" else None)
+
+    # The interfaces of the device are downloaded by the first task only
+    interfaces_endpoint.filter.assert_called_once_with(depth=0, device_id=DEVICE_ID)
+    interfaces_endpoint.get.assert_not_called()
+
+
+def test_module_snapshot_only_in_check_mode(interfaces_endpoint, tmp_path):
+    nautobot = interface_module(str(tmp_path), check_mode=False)
+    nautobot._nb_endpoint_get(interfaces_endpoint, {"name": "Ethernet1", "device_id": DEVICE_ID}, "Ethernet1")
+
+    interfaces_endpoint.filter.assert_not_called()
+    interfaces_endpoint.get.assert_called_once_with(name="Ethernet1", device_id=DEVICE_ID)
@@ -0,0 +1,160 @@
+"""Tests for the timing of the requests sent by modules."""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import sys
+from unittest.mock import MagicMock
+
+import pynautobot
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+try:
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.dcim import NB_DEVICES, NautobotDcimModule
+    from ansible_collections.networktocode.nautobot.plugins.module_utils.timing import NautobotTiming, endpoint_path
+except ImportError:
+    sys.path.append("plugins/module_utils")
+    from dcim import NB_DEVICES, NautobotDcimModule
+    from timing import NautobotTiming, endpoint_path
+
+LOCATION_ID = "9f1c7d1c-1a1d-4b3b-a5f1-e8c29e3c3b11"
+
+
+class FakeNautobot(BaseAdapter):
+    """Adapter answering requests with the JSON body routes holds for their path."""
+
+    def __init__(self, routes):
+        super(FakeNautobot, self).__init__()
+        self.routes = routes
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(self.routes[endpoint_path(request.url)]).encode("utf-8")
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+ROUTES = {
+    "/api/dcim/locations/": {
+        "count": 1,
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                "id": LOCATION_ID,
+                "name": "Test Location",
+                "url": "http://nautobot.local/api/dcim/locations/%s/" % LOCATION_ID,
+            }
+        ],
+    },
+    "/api/dcim/devices/": {"count": 0, "next": None, "previous": None, "results": []},
+    "/api/dcim/devices/{id}/": {"detail": "Not found."},
+}
+
+
+@pytest.mark.parametrize(
+    "url, path",
+    [
+        ("http://nautobot.local/api/dcim/devices/?name=core1", "/api/dcim/devices/"),
+        ("http://nautobot.local/api/dcim/devices/%s/" % LOCATION_ID, "/api/dcim/devices/{id}/"),
+        ("http://nautobot.local/api/dcim/device-types/42/", "/api/dcim/device-types/{id}/"),
+        ("http://nautobot.local/api/plugins/bgp/routing-instances/", "/api/plugins/bgp/routing-instances/"),
+    ],
+)
+def test_endpoint_path(url, path):
+    assert endpoint_path(url) == path
+
+
+def test_timing_summary():
+    timing = NautobotTiming()
+    session = requests.Session()
+    session.mount("http://", FakeNautobot(ROUTES))
+    timing.use(session)
+
+    session.get("http://nautobot.local/api/dcim/locations/?name=Test+Location")
+    timing.phase = "run"
+    session.get("http://nautobot.local/api/dcim/devices/?name=core1")
+    session.patch("http://nautobot.local/api/dcim/devices/%s/" % LOCATION_ID, json={})
+
+    summary = timing.summary()
+    assert summary["requests"] == 3
+    assert summary["bytes"] == sum(len(json.dumps(body)) for body in ROUTES.values())
+    assert {phase: totals["requests"] for phase, totals in summary["phases"].items()} == {"init": 1, "run": 2}
+    assert sorted(summary["endpoints"]) == [
+        "GET /api/dcim/devices/",
+        "GET /api/dcim/locations/",
+        "PATCH /api/dcim/devices/{id}/",
+    ]
+    assert timing.requests[0]["status"] == 200
+
+
+def device_module(**params):
+    module = MagicMock(name="AnsibleModule")
+    module.check_mode = False
+    module._name = "networktocode.nautobot.device"
+    module.params = {
+        "url": "http://nautobot.local/",
+        "token": "0123456789",
+        "state": "present",
+        "api_version": "2.4",
+        "validate_certs": False,
+        "resolve_workers": 1,
+        "name": "core1",
+        "location": "Test Location",
+    }
+    module.params.update(params)
+    return module
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    api = pynautobot.api
+
+    def fake(*args, **kwargs):
+        nb = api(*args, **kwargs)
+        nb.http_session.mount("http://", FakeNautobot(ROUTES))
+        return nb
+
+    monkeypatch.setattr(pynautobot, "api", fake)
+
+
+def test_module_timing(fake_api, tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    module = device_module(timing_trace=str(trace))
+    nautobot = NautobotDcimModule(module, NB_DEVICES)
+    assert nautobot.data["location"] == LOCATION_ID
+
+    assert nautobot._nb_endpoint_get(nautobot.nb.dcim.devices, {"name": "core1"}, "core1") is None
+    nautobot.result = {"changed": False}
+    nautobot._exit_json()
+
+    summary = module.exit_json.call_args.kwargs["_nautobot_timing"]
+    assert summary["phases"]["init"]["requests"] == 1
+    assert summary["phases"]["run"]["requests"] == 1
+    assert set(summary["endpoints"]) == {"GET /api/dcim/locations/", "GET /api/dcim/devices/"}
+
+    lines = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert [(line["module"], line["endpoint"], line["phase"]) for line in lines] == [
+        ("networktocode.nautobot.device", "devices", "init"),
+        ("networktocode.nautobot.device", "devices", "run"),
+    ]
+
+
+def test_module_timing_disabled(fake_api):
+    module = device_module()
+    nautobot = NautobotDcimModule(module, NB_DEVICES)
+    nautobot.result = {"changed": False}
+    nautobot._exit_json()
+
+    assert nautobot.timing is None
+    module.exit_json.assert_called_once_with(changed=False)
@@ -1,20 +1,24 @@
 """Tests for module_utils functions."""
 
 import json
+import random
+import timeit
 from typing import Any
 
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
 from plugins.module_utils.utils import sort_dict_with_lists
 
 try:
-    from plugins.module_utils.utils import is_truthy, mark_trusted
+    from plugins.module_utils.utils import is_equivalent, is_truthy, mark_trusted
 except ImportError:
     import sys
 
     sys.path.append("plugins/module_utils")
     sys.path.append("tests")
-    from utils import is_truthy, mark_trusted
+    from utils import is_equivalent, is_truthy, mark_trusted
 
 
 @pytest.mark.parametrize(
@@ -258,3 +262,89 @@ def test_mark_trusted_with_trust_func(data, expected):
     """Test mark_trusted marks strings and leaves everything else untouched."""
     result = mark_trusted(data, _mock_trust_as_template)
     assert result == expected
+
+
+@pytest.mark.parametrize(
+    "before, after, expected",
+    [
+        ({"a": [1, 2, 3]}, {"a": [3, 1, 2]}, True),
+        ({"a": [1, 1, 2]}, {"a": [1, 2, 2]}, False),
+        ({"a": [{"b": [1, 2]}, {"c": 3}]}, {"a": [{"c": 3}, {"b": [2, 1]}]}, True),
+        ({"a": 1}, {"a": 1, "b": None}, False),
+        ({"a": {"b": 1}}, {"a": [("b", 1)]}, False),
+        ({"a": []}, {"a": {}}, False),
+        ([[0], [], []], [[0], [], {}], False),
+        ({"tags": set(["a", "b"])}, {"tags": set(["b", "a"])}, True),
+        ([set(["a"]), set(["b"])], [set(["b"]), set(["a"])], True),
+        ("test", "test", True),
+        (None, {}, False),
+    ],
+)
+def test_is_equivalent(before: Any, after: Any, expected: bool) -> None:
+    """Test is_equivalent ignores the order of lists only."""
+    assert is_equivalent(before, after) is expected
+    assert is_equivalent(after, before) is expected
+
+
+json_data = st.recursive(
+    st.none() | st.integers(min_value=0, max_value=3) | st.sampled_from(["a", "b"]),
+    lambda children: st.lists(children, max_size=4) | st.dictionaries(st.sampled_from(["x", "y"]), children),
+    max_leaves=12,
+)
+
+
+@given(json_data, json_data)
+def test_is_equivalent_matches_sort_dict_with_lists(before: Any, after: Any) -> None:
+    """Test is_equivalent gives the same result as comparing with sort_dict_with_lists."""
+    assert is_equivalent(before, after) is (sort_dict_with_lists(before) == sort_dict_with_lists(after))
+
+
+def config_context(seed: int) -> dict:
+    """A config context as large as the ones of devices with many interfaces."""
+    rng = random.Random(seed)
+    interfaces = [
+        {
+            "name": "Ethernet%s/%s" % (slot, port),
+            "vlans": rng.sample(range(1, 4095), 20),
+            "acl": {"in": ["permit %s" % (rule) for rule in range(10)], "out": []},
+        }
+        for slot in range(1, 9)
+        for port in range(1, 49)
+    ]
+    return {"interfaces": interfaces, "ntp": ["10.0.0.%s" % (server) for server in range(4)], "snmp": {"ro": "public"}}
+
+
+def config_context_variants() -> tuple:
+    """A config context and unchanged, reordered and changed copies of it."""
+    before = config_context(0)
+    reordered = json.loads(json.dumps(before))
+    for interface in reordered["interfaces"]:
+        interface["vlans"].reverse()
+    changed = json.loads(json.dumps(before))
+    changed["interfaces"][0]["vlans"][0] = 4095
+    return before, (("unchanged", json.loads(json.dumps(before))), ("reordered", reordered), ("changed", changed))
+
+
+def test_is_equivalent_config_context() -> None:
+    """Test is_equivalent gives the same result as sort_dict_with_lists on a large config context."""
+    before, variants = config_context_variants()
+    for variant, after in variants:
+        assert is_equivalent(before, after) is (sort_dict_with_lists(before) == sort_dict_with_lists(after))
+
+
+@pytest.mark.benchmark
+def test_is_equivalent_benchmark(capsys) -> None:
+    """Compare is_equivalent and sort_dict_with_lists on unchanged, reordered and changed payloads."""
+    before, variants = config_context_variants()
+    for name, after in variants:
+        equivalent = min(timeit.repeat(lambda: is_equivalent(before, after), number=5, repeat=3)) / 5
+        sorted_copies = (
+            min(timeit.repeat(lambda: sort_dict_with_lists(before) == sort_dict_with_lists(after), number=5, repeat=3))
+            / 5
+        )
+        with capsys.disabled():
+            print(
+                "\n%s config context: is_equivalent %.2fms, sort_dict_with_lists %.2fms"
+                % (name, equivalent * 1e3, sorted_copies * 1e3)
+            )
+        assert equivalent < sorted_copies